@@ -4,6 +4,8 @@ Canoe_PY - A custom library for interacting with Vector CANoe
 
 from .core import MyCANoe
 from .exceptions import MyCANoeException
+from .executor import ComExecutor, SharedCANoe
+from .sampler import SignalSampler
 
 __version__ = "0.1.1"
 __author__ = "Subhashsingh Rajpurohit"
@@ -0,0 +1,168 @@
+"""
+asyncio interface for the MyCANoe library
+"""
+
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from .backends import get_backend
+from .core import MyCANoe, _as_predicate
+from .executor import ComExecutor
+from .utils import ConditionResult, Deadline
+
+class AsyncCANoe:
+    """asyncio facade for MyCANoe
+
+    The MyCANoe instance is created on and only used from the thread of a
+    ComExecutor that owns the COM apartment. Every coroutine queues its call for
+    that thread and awaits the result, so COM round-trips and the waits inside
+    MyCANoe never block the event loop.
+
+    Calls are serialized: they run one at a time in the order they were made.
+    Cancelling a coroutine (e.g. through asyncio.wait_for) withdraws its call only
+    if it has not started yet; a call already running on the COM thread runs to
+    completion, and the calls queued after it wait for it. Bound long-running
+    operations with their own timeout argument rather than by cancellation.
+    wait_for_signal(), wait_for_system_variable() and wait_for_values() are the
+    exception: they wait on the event loop and only queue short reads.
+
+    Coroutines mirror the MyCANoe methods of the same name, e.g.
+    ``await canoe.start_measurement()``.
+    """
+
+    def __init__(self, executor: Optional[ComExecutor] = None, **kwargs):
+        """Initialize the facade
+
+        Args:
+            executor: Executor owning the instance; a new one is started if None
+            kwargs: Arguments passed to the MyCANoe constructor
+        """
+        kwargs["backend"] = get_backend(kwargs.get("backend"))
+        self._owns_executor = executor is None
+        self.executor = executor or ComExecutor(kwargs["backend"], name="AsyncCANoe")
+        try:
+            self.canoe = self.executor.call(MyCANoe, **kwargs)
+        except Exception:
+            if self._owns_executor:
+                self.executor.shutdown()
+            raise
+
+    async def __aenter__(self) -> "AsyncCANoe":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a function on the COM thread and await its result
+
+        Cancelling the coroutine before the function started removes it from the
+        queue; once it is running it cannot be interrupted and finishes in the
+        background before later calls run.
+
+        Args:
+            fn: Function to run; it may use the MyCANoe instance
+            args: Positional arguments of the function
+            kwargs: Keyword arguments of the function
+
+        Returns:
+            The return value of the function
+        """
+        return await asyncio.wrap_future(self.executor.submit(fn, *args, **kwargs))
+
+    async def connect(self) -> None:
+        """Connect to the CANoe application"""
+        await self.run(self.canoe.connect)
+
+    async def wait_for_values(self, predicate: Callable[[Dict[Any, Any]], bool],
+                              signals: Sequence[Tuple[str, int, str, str]] = (), system_variables: Sequence[str] = (),
+                              timeout: Optional[float] = 5.0, raw_value=False, interval: float = 0.001) -> ConditionResult:
+        """Wait until a condition over several signals and system variables is met
+
+        Unlike the other coroutines this does not run MyCANoe.wait_for_values on the
+        COM thread, which would hold it for the whole wait. Handles are resolved once,
+        then every check queues a single read of all values and the wait between
+        checks happens on the event loop, so calls made meanwhile (e.g. a stimulus)
+        run between two checks.
+
+        Args:
+            predicate: Function called with a dictionary mapping each signal spec and
+                system variable name to its value; returns True when the condition is met
+            signals: List of (bus, channel, message, signal) tuples
+            system_variables: List of full system variable names
+            timeout: Maximum time to wait in seconds
+            raw_value: Whether to read raw signal values (True) or physical values (False)
+            interval: Time between two reads in seconds
+
+        Returns:
+            ConditionResult like MyCANoe.wait_for_values()
+        """
+        signals = [tuple(spec) for spec in signals]
+        deadline = Deadline(timeout)
+        polls = 0
+        try:
+            readers = await self.run(self.canoe._get_value_readers, signals, system_variables, raw_value)
+            while True:
+                values = await self.run(MyCANoe._read_values, readers)
+                timestamp = time.time()
+                polls += 1
+                if predicate(values):
+                    return ConditionResult(True, polls, deadline.elapsed(), values, timestamp)
+                remaining = deadline.remaining()
+                if remaining <= 0:
+                    return ConditionResult(False, polls, deadline.elapsed(), values, None)
+                await asyncio.sleep(min(remaining, interval))
+        except Exception as e:
+            raise await self.run(self.canoe._condition_error, signals, system_variables, e)
+
+    async def wait_for_signal(self, spec: Tuple[str, int, str, str], predicate: Any, timeout: Optional[float] = 5.0,
+                              raw_value=False, interval: float = 0.001) -> ConditionResult:
+        """Wait until the value of a signal satisfies a condition, see wait_for_values()"""
+        spec = tuple(spec)
+        predicate = _as_predicate(predicate)
+        return await self.wait_for_values(lambda values: predicate(values[spec]), signals=[spec], timeout=timeout,
+                                          raw_value=raw_value, interval=interval)
+
+    async def wait_for_system_variable(self, sys_var_name: str, predicate: Any, timeout: Optional[float] = 5.0,
+                                       interval: float = 0.001) -> ConditionResult:
+        """Wait until the value of a system variable satisfies a condition, see wait_for_values()"""
+        predicate = _as_predicate(predicate)
+        return await self.wait_for_values(lambda values: predicate(values[sys_var_name]),
+                                          system_variables=[sys_var_name], timeout=timeout, interval=interval)
+
+    async def close(self) -> None:
+        """Clean up the MyCANoe instance and stop the executor if this facade started it"""
+        await self.run(self.canoe.close)
+        if self._owns_executor:
+            self.executor.shutdown()
+
+def _async_method(name: str) -> Callable:
+    method = getattr(MyCANoe, name)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self.run(getattr(self.canoe, name), *args, **kwargs)
+
+    return wrapper
+
+# MyCANoe methods exposed as coroutines on AsyncCANoe
+ASYNC_METHODS = (
+    "open", "new", "quit", "get_version", "get_status", "get_configuration_path",
+    "is_measurement_running", "start_measurement", "stop_measurement", "reset_measurement",
+    "get_signal_value", "set_signal_value", "get_signal_values", "set_signal_values",
+    "get_signal_full_name", "check_signal_online",
+    "get_system_variable_value", "set_system_variable_value",
+    "set_system_variable_array_values", "get_system_variable_array",
+    "get_environment_variable_value", "set_environment_variable_value",
+    "get_environment_variable_values", "set_environment_variable_values",
+    "subscribe_signal", "subscribe_system_variable",
+    "compile_all_capl_nodes", "call_capl_function", "call_capl_function_result", "call_capl_functions",
+    "add_database", "remove_database", "list_databases", "find_database",
+    "load_signal_database", "get_signal_info", "validate_signal",
+    "invalidate_caches", "refresh_schema", "get_cache_stats", "get_timing_stats",
+)
+
+for _name in ASYNC_METHODS:
+    setattr(AsyncCANoe, _name, _async_method(_name))
@@ -0,0 +1,27 @@
+"""
+Backends connecting MyCANoe to a CANoe application
+"""
+
+from typing import Optional, Union
+
+from .base import CANoeBackend
+from .fake import FakeBackend
+from ..exceptions import MyCANoeException
+
+def get_backend(backend: Optional[Union[str, CANoeBackend]] = None) -> CANoeBackend:
+    """Get a backend instance
+
+    Args:
+        backend: Backend instance, backend name ("com" or "fake"), or None for COM
+
+    Returns:
+        The backend instance
+    """
+    if isinstance(backend, CANoeBackend):
+        return backend
+    if backend is None or backend == "com":
+        from .com import ComBackend
+        return ComBackend()
+    if backend == "fake":
+        return FakeBackend()
+    raise MyCANoeException(f"Unknown backend: {backend}")
@@ -0,0 +1,60 @@
+"""
+Backend interface for the MyCANoe library
+"""
+
+from typing import Any, Callable
+
+from ..events import MeasurementEventSource
+
+class CANoeBackend:
+    """Interface between MyCANoe and a CANoe application object model
+
+    A backend hands out the application object, whose object model (Measurement,
+    Bus/GetSignal, System.Namespaces, Environment, CAPL, Configuration) mirrors the
+    CANoe COM API, and creates the measurement event source for it.
+    """
+
+    name = "base"
+
+    def initialize(self) -> None:
+        """Prepare the calling thread for talking to CANoe"""
+        pass
+
+    def uninitialize(self) -> None:
+        """Release what initialize() set up for the calling thread"""
+        pass
+
+    def pump(self) -> None:
+        """Deliver pending COM events to the calling thread; does nothing before initialize()"""
+        pass
+
+    def dispatch(self) -> Any:
+        """Get the running CANoe application object or start a new instance
+
+        Returns:
+            The CANoe application object
+        """
+        raise NotImplementedError
+
+    def measurement_events(self, measurement: Any) -> MeasurementEventSource:
+        """Subscribe to the start/stop events of a Measurement object
+
+        Args:
+            measurement: The Measurement object of the application
+
+        Returns:
+            Event source notified of measurement transitions
+        """
+        raise NotImplementedError
+
+    def variable_events(self, variable: Any, callback: Callable[[Any], None]) -> Any:
+        """Subscribe to the value changes of a system variable
+
+        Args:
+            variable: The Variable object
+            callback: Function called with the new value on every change
+
+        Returns:
+            Subscription object whose close() method ends the subscription
+        """
+        raise NotImplementedError
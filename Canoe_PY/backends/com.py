@@ -0,0 +1,136 @@
+"""
+COM backend talking to a running Vector CANoe through pywin32
+"""
+
+import threading
+from typing import Any, Callable, Optional
+
+from .base import CANoeBackend
+from ..events import MeasurementEventSource
+
+def _import_pywin32():
+    """Import the pywin32 COM modules on first connection rather than with the library"""
+    import pythoncom
+    import win32com.client
+    return pythoncom, win32com.client
+
+class _MeasurementEventSink:
+    """COM event handler for the CANoe Measurement object"""
+
+    source = None
+
+    def OnInit(self):
+        if self.source is not None:
+            self.source.notify_init()
+
+    def OnStart(self):
+        if self.source is not None:
+            self.source.notify_started()
+
+    def OnStop(self):
+        pass
+
+    def OnExit(self):
+        if self.source is not None:
+            self.source.notify_stopped()
+
+class ComMeasurementEventSource(MeasurementEventSource):
+    """Measurement event source subscribed to the CANoe Measurement COM events
+
+    COM delivers the events through the message loop of the subscribing thread,
+    so waiting pumps waiting messages in short slices.
+    """
+
+    pump_interval = 0.002
+
+    def __init__(self, measurement: Any):
+        super().__init__()
+        self._pythoncom, client = _import_pywin32()
+        self._sink = client.WithEvents(measurement, _MeasurementEventSink)
+        self._sink.source = self
+
+    def pump(self) -> None:
+        self._pythoncom.PumpWaitingMessages()
+
+    def close(self) -> None:
+        if self._sink is not None:
+            self._sink.source = None
+            close = getattr(self._sink, "close", None)
+            if close is not None:
+                close()
+            self._sink = None
+
+class _VariableEventSink:
+    """COM event handler for a CANoe Variable object"""
+
+    callback = None
+
+    def OnChange(self, value):
+        if self.callback is not None:
+            self.callback(value)
+
+class ComVariableEvents:
+    """Subscription to the OnChange event of a CANoe Variable object
+
+    Like the measurement events, changes are delivered through the message loop
+    of the subscribing thread.
+    """
+
+    def __init__(self, variable: Any, callback: Callable[[Any], None]):
+        _, client = _import_pywin32()
+        self._sink = client.WithEvents(variable, _VariableEventSink)
+        self._sink.callback = callback
+
+    def close(self) -> None:
+        if self._sink is not None:
+            self._sink.callback = None
+            close = getattr(self._sink, "close", None)
+            if close is not None:
+                close()
+            self._sink = None
+
+class ComBackend(CANoeBackend):
+    """Backend for a real CANoe instance reached through COM"""
+
+    name = "com"
+
+    def __init__(self, prog_id: str = "CANoe.Application", machine: Optional[str] = None):
+        """Initialize the backend
+
+        Args:
+            prog_id: COM ProgID of the CANoe application
+            machine: Host running the CANoe instance, reached through DCOM, or None for
+                the instance running on this machine
+        """
+        self.prog_id = prog_id
+        self.machine = machine
+        self._threads = threading.local()
+
+    def initialize(self) -> None:
+        pythoncom, _ = _import_pywin32()
+        pythoncom.CoInitialize()
+        self._threads.initialized = True
+
+    def uninitialize(self) -> None:
+        pythoncom, _ = _import_pywin32()
+        pythoncom.CoUninitialize()
+        self._threads.initialized = False
+
+    def pump(self) -> None:
+        # Nothing to deliver before the thread is initialized, and pywin32 stays unloaded until then
+        if not getattr(self._threads, "initialized", False):
+            return
+        pythoncom, _ = _import_pywin32()
+        pythoncom.PumpWaitingMessages()
+
+    def dispatch(self) -> Any:
+        _, client = _import_pywin32()
+        if self.machine is not None:
+            return client.DispatchEx(self.prog_id, self.machine)
+        return client.Dispatch(self.prog_id)
+
+    def measurement_events(self, measurement: Any) -> MeasurementEventSource:
+        return ComMeasurementEventSource(measurement)
+
+    def variable_events(self, variable: Any, callback: Callable[[Any], None]) -> ComVariableEvents:
+        return ComVariableEvents(variable, callback)
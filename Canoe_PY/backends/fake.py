@@ -0,0 +1,650 @@
+"""
+Simulated in-memory CANoe backend for offline tests and benchmarks
+"""
+
+import threading
+import time
+from typing import Any, Callable, Tuple
+
+from .base import CANoeBackend
+from ..events import MeasurementEventSource
+from ..schema import infer_type
+
+class FakeComError(Exception):
+    """Raised by the simulated object model where CANoe would raise a COM error"""
+    pass
+
+class _FakeComObject:
+    """Base class that counts every public attribute access as one COM round-trip"""
+
+    def __init__(self, backend: "FakeBackend"):
+        object.__setattr__(self, "_backend", backend)
+
+    def __getattribute__(self, name):
+        if not name.startswith("_"):
+            object.__getattribute__(self, "_backend")._simulate_call()
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self._backend._simulate_call()
+        object.__setattr__(self, name, value)
+
+class FakeVersion(_FakeComObject):
+    """Simulated CANoe Version object"""
+
+    def __init__(self, backend, major: int, minor: int, build: int):
+        super().__init__(backend)
+        self._version = (major, minor, build)
+
+    @property
+    def major(self):
+        return self._version[0]
+
+    @property
+    def minor(self):
+        return self._version[1]
+
+    @property
+    def Build(self):
+        return self._version[2]
+
+    @property
+    def FullName(self):
+        return "Vector CANoe (simulated) %d.%d.%d" % self._version
+
+    def __str__(self):
+        return "%d.%d.%d" % self._version
+
+class FakeSignal(_FakeComObject):
+    """Simulated signal with physical/raw conversion through factor and offset"""
+
+    def __init__(self, backend, full_name: str, value: Any, factor: float, offset: float):
+        super().__init__(backend)
+        self._full_name = full_name
+        self._value = value
+        self._factor = factor
+        self._offset = offset
+        self._released = False
+
+    def _check_released(self) -> None:
+        if self._released:
+            raise FakeComError(f"Signal handle is no longer valid: {self._full_name}")
+
+    def _renew(self) -> "FakeSignal":
+        """Release this handle and return a new one with the same state"""
+        self._released = True
+        return FakeSignal(self._backend, self._full_name, self._value, self._factor, self._offset)
+
+    @property
+    def Value(self):
+        self._check_released()
+        return self._value
+
+    @Value.setter
+    def Value(self, value):
+        self._check_released()
+        self._value = value
+
+    @property
+    def RawValue(self):
+        self._check_released()
+        return int(round((self._value - self._offset) / self._factor))
+
+    @RawValue.setter
+    def RawValue(self, value):
+        self._check_released()
+        self._value = value * self._factor + self._offset
+
+    @property
+    def FullName(self):
+        return self._full_name
+
+    @property
+    def IsOnline(self):
+        return self._backend._running
+
+class FakeBus(_FakeComObject):
+    """Simulated Bus object"""
+
+    def __init__(self, backend, bus: str):
+        super().__init__(backend)
+        self._bus = bus
+
+    def GetSignal(self, channel: int, message: str, signal: str) -> FakeSignal:
+        try:
+            return self._backend._signals[(self._bus, channel, message, signal)]
+        except KeyError:
+            raise FakeComError(f"Signal not found: {self._bus}{channel}::{message}::{signal}")
+
+class FakeVariable(_FakeComObject):
+    """Simulated system or environment variable"""
+
+    def __init__(self, backend, full_name: str, value: Any):
+        super().__init__(backend)
+        self._full_name = full_name
+        self._value = value
+        self._listeners = []
+
+    def _change(self, value: Any) -> None:
+        changed = value != self._value
+        self._value = value
+        if changed:
+            for listener in list(self._listeners):
+                listener(value)
+
+    @property
+    def Value(self):
+        return self._value
+
+    @Value.setter
+    def Value(self, value):
+        self._change(value)
+
+    @property
+    def FullName(self):
+        return self._full_name
+
+    @property
+    def Type(self):
+        type_code = infer_type(self._value)
+        if type_code is None:
+            raise FakeComError(f"Unsupported variable type: {type(self._value).__name__}")
+        return type_code
+
+class FakeNamespace(_FakeComObject):
+    """Simulated system variable namespace"""
+
+    def __init__(self, backend, name: str):
+        super().__init__(backend)
+        self._name = name
+
+    def Variables(self, name: str) -> FakeVariable:
+        try:
+            return self._backend._system_variables[f"{self._name}::{name}"]
+        except KeyError:
+            raise FakeComError(f"System variable not found: {self._name}::{name}")
+
+class FakeSystem(_FakeComObject):
+    """Simulated System object"""
+
+    def Namespaces(self, name: str) -> FakeNamespace:
+        prefix = name + "::"
+        if not any(key.startswith(prefix) for key in self._backend._system_variables):
+            raise FakeComError(f"Namespace not found: {name}")
+        return FakeNamespace(self._backend, name)
+
+class FakeEnvironment(_FakeComObject):
+    """Simulated Environment object"""
+
+    def GetVariable(self, name: str) -> FakeVariable:
+        try:
+            return self._backend._environment_variables[name]
+        except KeyError:
+            raise FakeComError(f"Environment variable not found: {name}")
+
+class FakeCaplFunction(_FakeComObject):
+    """Simulated CAPL function backed by a Python callable"""
+
+    def __init__(self, backend, function: Callable):
+        super().__init__(backend)
+        self._function = function
+
+    @property
+    def ParameterCount(self):
+        import inspect
+        return len(inspect.signature(self._function).parameters)
+
+    def Call(self, *arguments):
+        return self._function(*arguments)
+
+class FakeCompileResult(_FakeComObject):
+    """Simulated result of the last CAPL compilation"""
+
+    def __init__(self, backend, result: int = 0, error_message: str = "", node_name: str = "",
+                 source_file: str = ""):
+        super().__init__(backend)
+        self._values = (result, error_message, node_name, source_file)
+
+    @property
+    def result(self):
+        return self._values[0]
+
+    @property
+    def errorMessage(self):
+        return self._values[1]
+
+    @property
+    def nodeName(self):
+        return self._values[2]
+
+    @property
+    def sourceFile(self):
+        return self._values[3]
+
+class FakeCapl(_FakeComObject):
+    """Simulated CAPL object"""
+
+    def Compile(self):
+        self._backend.compile_count += 1
+
+    @property
+    def CompileResult(self):
+        return FakeCompileResult(self._backend, *self._backend.compile_error)
+
+    def GetFunction(self, name: str) -> FakeCaplFunction:
+        self._backend.get_function_count += 1
+        if self._backend.get_function_in_init_only and self._backend._running:
+            raise FakeComError("GetFunction only allowed in OnInit")
+        try:
+            return FakeCaplFunction(self._backend, self._backend._capl_functions[name])
+        except KeyError:
+            raise FakeComError(f"CAPL function not found: {name}")
+
+class FakeMeasurement(_FakeComObject):
+    """Simulated Measurement object
+
+    Transitions complete after the backend's measurement_delay, on a timer thread
+    when the delay is not zero, and notify the subscribed event sources.
+    """
+
+    @property
+    def Running(self):
+        return self._backend._running
+
+    def Start(self):
+        self._backend._transition(True)
+
+    def Stop(self):
+        self._backend._transition(False)
+
+class FakeDatabase(_FakeComObject):
+    """Simulated database entry of the configuration"""
+
+    def __init__(self, backend, full_name: str, bus: str, channel: int):
+        super().__init__(backend)
+        self._full_name = full_name
+        self._bus = bus
+        self._channel = channel
+
+    @property
+    def FullName(self):
+        return self._full_name
+
+    @property
+    def Channel(self):
+        return self._channel
+
+class FakeDatabases(_FakeComObject):
+    """Simulated Databases collection (1-based like COM)"""
+
+    @property
+    def Count(self):
+        return len(self._backend._databases)
+
+    def Item(self, index: int) -> FakeDatabase:
+        return self._backend._databases[index - 1]
+
+    def Add(self, full_name: str, bus: str, channel: int) -> FakeDatabase:
+        database = FakeDatabase(self._backend, full_name, bus, channel)
+        self._backend._databases.append(database)
+        return database
+
+    def Remove(self, index: int) -> None:
+        del self._backend._databases[index - 1]
+
+class FakeDatabaseSetup(_FakeComObject):
+    """Simulated DatabaseSetup object"""
+
+    @property
+    def Databases(self):
+        return FakeDatabases(self._backend)
+
+class FakeGeneralSetup(_FakeComObject):
+    """Simulated GeneralSetup object"""
+
+    @property
+    def DatabaseSetup(self):
+        return FakeDatabaseSetup(self._backend)
+
+class FakeNode(_FakeComObject):
+    """Simulated simulation node with its CAPL file"""
+
+    def __init__(self, backend, full_name: str):
+        super().__init__(backend)
+        self._full_name = full_name
+
+    @property
+    def FullName(self):
+        return self._full_name
+
+class FakeNodes(_FakeComObject):
+    """Simulated Nodes collection (1-based like COM)"""
+
+    @property
+    def Count(self):
+        return len(self._backend._nodes)
+
+    def Item(self, index: int) -> FakeNode:
+        return FakeNode(self._backend, self._backend._nodes[index - 1])
+
+class FakeSimulationSetup(_FakeComObject):
+    """Simulated SimulationSetup object"""
+
+    @property
+    def Nodes(self):
+        return FakeNodes(self._backend)
+
+class FakeCollection(_FakeComObject):
+    """Simulated read-only COM collection of file items (1-based like COM)"""
+
+    def __init__(self, backend, full_names):
+        super().__init__(backend)
+        self._full_names = list(full_names)
+
+    @property
+    def Count(self):
+        return len(self._full_names)
+
+    def Item(self, index: int) -> FakeNode:
+        return FakeNode(self._backend, self._full_names[index - 1])
+
+class FakeTestEnvironment(_FakeComObject):
+    """Simulated test environment with its test modules and no folders"""
+
+    def __init__(self, backend, name: str):
+        super().__init__(backend)
+        self._name = name
+
+    @property
+    def TestModules(self):
+        return FakeCollection(self._backend, self._backend._test_modules[self._name])
+
+    @property
+    def Folders(self):
+        return FakeCollection(self._backend, [])
+
+class FakeTestEnvironments(_FakeComObject):
+    """Simulated TestEnvironments collection (1-based like COM)"""
+
+    @property
+    def Count(self):
+        return len(self._backend._test_modules)
+
+    def Item(self, index: int) -> FakeTestEnvironment:
+        return FakeTestEnvironment(self._backend, list(self._backend._test_modules)[index - 1])
+
+class FakeTestSetup(_FakeComObject):
+    """Simulated TestSetup object"""
+
+    @property
+    def TestEnvironments(self):
+        return FakeTestEnvironments(self._backend)
+
+class FakeConfiguration(_FakeComObject):
+    """Simulated Configuration object"""
+
+    @property
+    def FullName(self):
+        return self._backend._config_path
+
+    @property
+    def GeneralSetup(self):
+        return FakeGeneralSetup(self._backend)
+
+    @property
+    def SimulationSetup(self):
+        return FakeSimulationSetup(self._backend)
+
+    @property
+    def TestSetup(self):
+        return FakeTestSetup(self._backend)
+
+class FakeApplication(_FakeComObject):
+    """Simulated CANoe Application object
+
+    Once Quit() has been called every further access raises, like a released COM server.
+    """
+
+    def __init__(self, backend):
+        super().__init__(backend)
+        object.__setattr__(self, "_released", False)
+        object.__setattr__(self, "Visible", True)
+
+    def __getattribute__(self, name):
+        if not name.startswith("_") and object.__getattribute__(self, "_released"):
+            raise FakeComError("The RPC server is unavailable")
+        return super().__getattribute__(name)
+
+    @property
+    def Version(self):
+        return FakeVersion(self._backend, *self._backend.version)
+
+    @property
+    def Measurement(self):
+        return FakeMeasurement(self._backend)
+
+    @property
+    def System(self):
+        return FakeSystem(self._backend)
+
+    @property
+    def Environment(self):
+        return FakeEnvironment(self._backend)
+
+    @property
+    def Bus(self):
+        return FakeBus(self._backend, "CAN")
+
+    @property
+    def CAPL(self):
+        return FakeCapl(self._backend)
+
+    @property
+    def UI(self):
+        return None
+
+    @property
+    def Configuration(self):
+        return FakeConfiguration(self._backend)
+
+    def GetBus(self, bus: str) -> FakeBus:
+        return FakeBus(self._backend, bus)
+
+    def Open(self, path: str, auto_save: bool = False, prompt_user: bool = False) -> None:
+        self._backend.open_count += 1
+        self._backend._config_path = path
+
+    def New(self, auto_save: bool = False, prompt_user: bool = False) -> None:
+        self._backend._config_path = ""
+
+    def Quit(self) -> None:
+        self._backend._running = False
+        self._backend._app = None
+        object.__setattr__(self, "_released", True)
+
+class _FakeMeasurementEventSource(MeasurementEventSource):
+    """Event source fed directly by the simulated measurement"""
+
+    def __init__(self, backend: "FakeBackend"):
+        super().__init__()
+        self._backend = backend
+        backend._event_sources.append(self)
+
+    def close(self) -> None:
+        if self in self._backend._event_sources:
+            self._backend._event_sources.remove(self)
+
+class _FakeVariableEvents:
+    """Change subscription fed directly by a simulated variable"""
+
+    def __init__(self, variable: FakeVariable, callback: Callable[[Any], None]):
+        self._variable = variable
+        self._callback = callback
+        variable._listeners.append(callback)
+
+    def close(self) -> None:
+        if self._callback in self._variable._listeners:
+            self._variable._listeners.remove(self._callback)
+
+class FakeBackend(CANoeBackend):
+    """Pure-Python simulated CANoe for running the library without Windows
+
+    Every public attribute access on the simulated object model counts as one COM
+    round-trip in call_count and sleeps for latency seconds, so the overhead of the
+    library itself can be measured.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, measurement_delay: float = 0.0, events: bool = True,
+                 version: Tuple[int, int, int] = (15, 0, 0)):
+        """Initialize the simulated CANoe
+
+        Args:
+            latency: Simulated time in seconds spent per COM round-trip
+            measurement_delay: Time in seconds a measurement start or stop takes to complete
+            events: Whether measurement and variable change events are available (False forces polling)
+            version: Simulated CANoe version as (major, minor, build)
+        """
+        self.latency = latency
+        self.measurement_delay = measurement_delay
+        self.events = events
+        self.version = version
+        self.call_count = 0
+        self.compile_count = 0
+        self.open_count = 0
+        self.get_function_count = 0
+        # (result, errorMessage, nodeName, sourceFile) reported by CAPL.CompileResult; empty for success
+        self.compile_error = ()
+        # Whether signal handles become invalid on a measurement start or stop, like in CANoe
+        self.expire_signal_handles = False
+        # Whether CAPL.GetFunction fails while the measurement runs, like in CANoe outside OnInit
+        self.get_function_in_init_only = False
+
+        self._app = None
+        self._running = False
+        self._config_path = ""
+        self._event_sources = []
+        self._signals = {}
+        self._system_variables = {}
+        self._environment_variables = {}
+        self._capl_functions = {}
+        self._databases = []
+        self._nodes = []
+        self._test_modules = {}
+
+    def _simulate_call(self) -> None:
+        self.call_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _transition(self, running: bool) -> None:
+        def complete():
+            if self.expire_signal_handles:
+                self._signals = {key: signal._renew() for key, signal in self._signals.items()}
+            if running:
+                for source in list(self._event_sources):
+                    source.notify_init()
+            self._running = running
+            for source in list(self._event_sources):
+                if running:
+                    source.notify_started()
+                else:
+                    source.notify_stopped()
+
+        if self.measurement_delay:
+            timer = threading.Timer(self.measurement_delay, complete)
+            timer.daemon = True
+            timer.start()
+        else:
+            complete()
+
+    def add_signal(self, bus: str, channel: int, message: str, signal: str, value: Any = 0,
+                   factor: float = 1.0, offset: float = 0.0) -> None:
+        """Define a signal of the simulated configuration
+
+        Args:
+            bus: The bus (CAN, LIN, FlexRay, etc.)
+            channel: The channel number
+            message: The message name
+            signal: The signal name
+            value: Initial physical value
+            factor: Factor for the raw to physical conversion
+            offset: Offset for the raw to physical conversion
+        """
+        full_name = f"{bus}{channel}::{message}::{signal}"
+        self._signals[(bus, channel, message, signal)] = FakeSignal(self, full_name, value, factor, offset)
+
+    def add_system_variable(self, name: str, value: Any) -> None:
+        """Define a system variable of the simulated configuration
+
+        Args:
+            name: Full name of the system variable including namespace
+            value: Initial value
+        """
+        self._system_variables[name] = FakeVariable(self, name, value)
+
+    def add_environment_variable(self, name: str, value: Any) -> None:
+        """Define an environment variable of the simulated configuration
+
+        Args:
+            name: Name of the environment variable
+            value: Initial value
+        """
+        self._environment_variables[name] = FakeVariable(self, name, value)
+
+    def add_capl_function(self, name: str, function: Callable) -> None:
+        """Define a CAPL function of the simulated configuration
+
+        Args:
+            name: The name of the CAPL function
+            function: Python callable executed when the function is called
+        """
+        self._capl_functions[name] = function
+
+    def add_node(self, capl_file: str) -> None:
+        """Define a simulation node of the simulated configuration
+
+        Args:
+            capl_file: Path of the node's CAPL file
+        """
+        self._nodes.append(capl_file)
+
+    def add_test_module(self, capl_file: str, environment: str = "TestEnvironment") -> None:
+        """Define a test module of the simulated test setup
+
+        Args:
+            capl_file: Path of the test module's CAPL file
+            environment: Name of the test environment holding the module
+        """
+        self._test_modules.setdefault(environment, []).append(capl_file)
+
+    def _variable(self, name: str) -> FakeVariable:
+        variable = self._system_variables.get(name) or self._environment_variables.get(name)
+        if variable is None:
+            raise KeyError(name)
+        return variable
+
+    def get_value(self, name: str) -> Any:
+        """Read a simulated system or environment variable without counting a COM call"""
+        return self._variable(name)._value
+
+    def set_value(self, name: str, value: Any) -> None:
+        """Change a simulated system or environment variable as if the simulation had written it"""
+        self._variable(name)._change(value)
+
+    def dispatch(self) -> FakeApplication:
+        if self._app is None:
+            self._app = FakeApplication(self)
+        return self._app
+
+    def measurement_events(self, measurement: Any) -> MeasurementEventSource:
+        if not self.events:
+            raise NotImplementedError("Measurement events disabled in the simulated backend")
+        return _FakeMeasurementEventSource(self)
+
+    def variable_events(self, variable: Any, callback: Callable[[Any], None]) -> _FakeVariableEvents:
+        if not self.events:
+            raise NotImplementedError("Variable events disabled in the simulated backend")
+        return _FakeVariableEvents(variable, callback)
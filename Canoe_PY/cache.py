@@ -0,0 +1,91 @@
+"""
+Handle caching for the MyCANoe library
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class HandleCache:
+    """LRU cache of resolved CANoe COM objects with hit/miss/eviction counters"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        """Initialize the cache
+
+        Args:
+            max_size: Maximum number of cached handles, or None for no limit
+        """
+        self.max_size = max_size
+        self._handles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._handles
+
+    def get(self, key: Hashable, resolver: Callable[[], Any]) -> Any:
+        """Get a cached handle, resolving and storing it on a miss
+
+        Args:
+            key: Cache key identifying the handle
+            resolver: Function that resolves the handle through COM
+
+        Returns:
+            The cached or freshly resolved handle
+        """
+        try:
+            handle = self._handles[key]
+        except KeyError:
+            self.misses += 1
+            handle = resolver()
+            self.put(key, handle)
+            return handle
+
+        self.hits += 1
+        if self.max_size is not None:
+            self._handles.move_to_end(key)
+        return handle
+
+    def put(self, key: Hashable, handle: Any) -> None:
+        """Store a handle, evicting the least recently used one if the cache is full
+
+        Args:
+            key: Cache key identifying the handle
+            handle: The resolved handle
+        """
+        self._handles[key] = handle
+        if self.max_size is not None:
+            self._handles.move_to_end(key)
+            while len(self._handles) > self.max_size:
+                self._handles.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Drop a single handle, e.g. after a COM call on it failed
+
+        Args:
+            key: Cache key identifying the handle
+        """
+        if self._handles.pop(key, None) is not None:
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached handles"""
+        self.evictions += len(self._handles)
+        self._handles.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache counters
+
+        Returns:
+            Dictionary with size, hits, misses and evictions
+        """
+        return {
+            "size": len(self._handles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
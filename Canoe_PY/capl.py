@@ -0,0 +1,197 @@
+"""
+CAPL source tracking and compile results for the MyCANoe library
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from .utils import normalize_path, file_fingerprint, file_digest
+
+# #include "file.cin" inside the includes section of a CAPL file
+_INCLUDE_PATTERN = re.compile(r'^\s*#include\s+"([^"]+)"', re.MULTILINE)
+
+# Quoted .can/.cin path in a configuration file, e.g. a measurement setup CAPL node
+_CONFIGURATION_SOURCE_PATTERN = re.compile(r'"([^"\r\n]+\.(?:can|cin))"', re.IGNORECASE)
+
+# Line number in compiler messages such as "node.can (42,7): ..." or "line 42"
+_LINE_PATTERN = re.compile(r"\((\d+)(?:\s*,\s*\d+)?\)|\bline\s+(\d+)", re.IGNORECASE)
+
+def find_capl_sources(node_files: Iterable[str]) -> List[str]:
+    """Collect the CAPL files of the nodes and every file they include, recursively
+
+    Include paths are resolved relative to the including file. Files that do not
+    exist are kept in the list so that a missing include is noticed as a change.
+
+    Args:
+        node_files: Paths of the .can files of the nodes
+
+    Returns:
+        Sorted list of normalized paths of all .can and .cin files
+    """
+    sources = set()
+    pending = [normalize_path(path) for path in node_files if path]
+    while pending:
+        path = pending.pop()
+        if path in sources:
+            continue
+        sources.add(path)
+        try:
+            with open(path, "r", encoding="latin-1") as f:
+                content = f.read()
+        except OSError:
+            continue
+        directory = os.path.dirname(path)
+        for include in _INCLUDE_PATTERN.findall(content):
+            pending.append(normalize_path(os.path.join(directory, include)))
+    return sorted(sources)
+
+def find_configuration_capl_files(configuration: str) -> List[str]:
+    """Collect the CAPL files referenced anywhere in a configuration file
+
+    The COM object model does not list every CAPL program of a configuration, e.g.
+    the CAPL nodes of the measurement setup, but the configuration file names them
+    all. Relative paths are resolved relative to the configuration.
+
+    Args:
+        configuration: Full path of the configuration
+
+    Returns:
+        Paths of the referenced .can and .cin files
+
+    Raises:
+        OSError: If the configuration file cannot be read
+    """
+    with open(configuration, "r", encoding="latin-1") as f:
+        content = f.read()
+    directory = os.path.dirname(configuration)
+    return [os.path.join(directory, path) for path in _CONFIGURATION_SOURCE_PATTERN.findall(content)]
+
+def parse_compile_result(compile_result: Any) -> Dict[str, Any]:
+    """Convert the CAPL CompileResult object into the result dictionary
+
+    The COM object reports the first error only and no warnings, so errors is
+    0 or 1 and warnings is always 0.
+
+    Args:
+        compile_result: The CompileResult object of the CAPL object
+
+    Returns:
+        Dictionary with result, errors, warnings, node, source, line and message
+    """
+    code = compile_result.result
+    if code == 0:
+        return {"result": True, "errors": 0, "warnings": 0, "node": None, "source": None, "line": None,
+                "message": ""}
+
+    message = compile_result.errorMessage or ""
+    match = _LINE_PATTERN.search(message)
+    line = int(match.group(1) or match.group(2)) if match else None
+    return {
+        "result": False,
+        "errors": 1,
+        "warnings": 0,
+        "node": compile_result.nodeName or None,
+        "source": compile_result.sourceFile or None,
+        "line": line,
+        "message": message
+    }
+
+def manifest_path(directory: str, configuration: str) -> str:
+    """Get the manifest file of a configuration in a cache directory
+
+    Args:
+        directory: Cache directory
+        configuration: Full path of the configuration
+
+    Returns:
+        Path of the JSON manifest file
+    """
+    import hashlib
+
+    key = hashlib.sha1(normalize_path(configuration).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"capl_{key}.json")
+
+class CompileManifest:
+    """Content hashes of the CAPL sources at the last successful compile, stored as JSON
+
+    Files whose modification time and size are unchanged are not hashed again.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the manifest
+
+        Args:
+            path: Path of the JSON file holding the manifest
+        """
+        self.path = path
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _entry(path: str, previous: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        try:
+            _, mtime, size = file_fingerprint(path)
+        except OSError:
+            return None
+        if previous is not None and previous.get("mtime") == mtime and previous.get("size") == size:
+            return previous
+        return {"mtime": mtime, "size": size, "digest": file_digest(path)}
+
+    def is_current(self, configuration: str, sources: List[str]) -> bool:
+        """Whether the sources are unchanged since the last successful compile
+
+        Args:
+            configuration: Full path of the configuration
+            sources: Paths returned by find_capl_sources()
+
+        Returns:
+            True if the manifest covers exactly these sources with the same content
+        """
+        manifest = self._load()
+        if manifest is None or manifest.get("configuration") != normalize_path(configuration):
+            return False
+        recorded = manifest.get("sources", {})
+        if set(recorded) != set(sources):
+            return False
+        for path in sources:
+            entry = self._entry(path, recorded[path])
+            if entry is None or entry["digest"] != recorded[path]["digest"]:
+                return False
+        return True
+
+    def update(self, configuration: str, sources: List[str]) -> None:
+        """Record the current content of the sources after a successful compile
+
+        Args:
+            configuration: Full path of the configuration
+            sources: Paths returned by find_capl_sources()
+        """
+        recorded = (self._load() or {}).get("sources", {})
+        entries = {}
+        for path in sources:
+            entry = self._entry(path, recorded.get(path))
+            if entry is None:
+                # A missing source can never be current, so do not record a manifest
+                self.clear()
+                return
+            entries[path] = entry
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump({"configuration": normalize_path(configuration), "sources": entries}, f, indent=1)
+        os.replace(temporary_path, self.path)
+
+    def clear(self) -> None:
+        """Forget the recorded sources so the next compile is not skipped"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -6,32 +6,86 @@ import os
 import sys
 import time
 import logging
-import pythoncom
-import win32com.client
-from typing import Optional, Dict, List, Any, Union, Tuple
+import threading
+from collections import deque
+from functools import lru_cache, wraps
+from typing import Optional, Dict, List, Any, Union, Tuple, Callable, Sequence
 
-from .utils import setup_logger, wait_until, validate_file_path, wait
+from .cache import HandleCache
+from .capl import (CompileManifest, find_capl_sources, find_configuration_capl_files, manifest_path,
+                   parse_compile_result)
+from .dbc import SignalIndex, SignalInfo
+from .schema import SchemaCache, ARRAY_DTYPES, as_sequence
+from .utils import (setup_logger, wait_until, validate_file_path, import_numpy, Deadline, ConditionResult,
+                    TimingStats, normalize_path, file_fingerprint, file_digest, cache_dir, ConfigurationRecord)
+from .backends import CANoeBackend, get_backend
+from .events import MeasurementEventSource
 from .exceptions import MyCANoeException, ConnectionError, ConfigurationError, MeasurementError, SignalError
 
+@lru_cache(maxsize=4096)
+def _split_system_variable_name(sys_var_name: str) -> Tuple[str, str]:
+    """Split 'namespace::variable' into the namespace and the variable name"""
+    parts = sys_var_name.split('::')
+    return '::'.join(parts[:-1]), parts[-1]
+
+def _as_predicate(expected: Any) -> Callable[[Any], bool]:
+    """Use a callable as it is, or compare against any other expected value"""
+    if callable(expected):
+        return expected
+    return lambda value: value == expected
+
+def _timed(operation: str) -> Callable:
+    """Record the duration of every call of a method in the instance's timings"""
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.timings.record(operation, time.perf_counter() - start_time)
+        return wrapper
+    return decorator
+
 class MyCANoe:
     """Main class for interacting with Vector CANoe"""
     
-    def __init__(self, log_level=logging.INFO, user_capl_functions=None):
+    def __init__(self, log_level=logging.INFO, user_capl_functions=None, signal_cache_size=4096,
+                 measurement_events=None, backend: Optional[Union[str, CANoeBackend]] = None,
+                 async_logging=False):
         """Initialize the MyCANoe instance
         
         Args:
             log_level: Logging level
-            user_capl_functions: Tuple of user-defined CAPL function names
+            user_capl_functions: Names of user-defined CAPL functions, resolved when the measurement initializes
+            signal_cache_size: Maximum number of resolved signal objects to cache, or None for no limit
+            measurement_events: Optional factory called with the Measurement object that returns a
+                MeasurementEventSource; defaults to the backend's measurement events
+            backend: Backend instance or name ("com" or "fake"); defaults to COM
+            async_logging: Whether to write log output from a background thread
         """
         # Setup logging
-        self.logger = setup_logger("MyCANoe", log_level)
+        self.logger = setup_logger("MyCANoe", log_level, async_logging)
         self.logger.info("Initializing MyCANoe library")
         
         # Store user CAPL functions
-        self.user_capl_functions = user_capl_functions or tuple()
+        self.user_capl_functions = set(user_capl_functions or ())
         
-        # Initialize COM
-        pythoncom.CoInitialize()
+        # Resolved CAPL functions: name -> (function object, parameter count, measurement generation)
+        self._capl_functions = {}
+        self._measurement_generation = 0
+        
+        # Incremented whenever signal handles become invalid, so other threads holding
+        # their own handles (subscriptions, samplers) know to resolve them again
+        self._handle_generation = 0
+        
+        # Select the backend; COM (and pywin32) is only initialized on first connection
+        try:
+            self.backend = get_backend(backend)
+        except Exception as e:
+            self.logger.error(f"Failed to initialize CANoe backend: {str(e)}")
+            raise ConnectionError(f"Failed to initialize CANoe backend: {str(e)}")
+        self._backend_initialized = False
         
         # CANoe application object
         self.app = None
@@ -44,19 +98,76 @@ class MyCANoe:
         self.capl = None
         self.ui = None
         
+        # Measurement start/stop notifications, None when falling back to polling
+        self._measurement_events_factory = measurement_events
+        self.measurement_events = None
+        
+        # Resolved signal objects keyed by (bus, channel, message, signal)
+        self._signal_cache = HandleCache(signal_cache_size)
+        
+        # Resolved system variable namespaces and variables, keyed by name
+        self._namespace_cache = HandleCache()
+        self._sysvar_cache = HandleCache()
+        
+        # Resolved environment variables, keyed by name
+        self._envvar_cache = HandleCache()
+        
+        # Databases of the configuration in setup order, keyed by (normalized path, channel)
+        self._database_index = None
+        
+        # Signal metadata of the DBC files added through this instance, keyed by (bus, channel)
+        self.signal_index = SignalIndex()
+        
+        # Learned system variable types used to coerce written values
+        self._sysvar_schema = SchemaCache()
+        
+        # Fingerprint and content digest of the configuration opened through this instance
+        self._loaded_configuration = None
+        
+        # Directory for the CAPL compile manifests and parsed databases; defaults to utils.cache_dir()
+        self.cache_dir = None
+        
+        # Value change subscriptions, created on first subscribe
+        self.subscriptions = None
+        self.subscription_poll_interval = 0.01  # seconds
+        
         # Timeouts
         self.measurement_timeout = 60  # seconds
         self.application_timeout = 30  # seconds
+        self.configuration_timeout = 60  # seconds
+        
+        # Durations of configuration, application, measurement and compile operations
+        self.timings = TimingStats()
+    
+    def connect(self) -> None:
+        """Connect to the CANoe application
+        
+        Attaches to the running CANoe instance, or starts one, through the backend.
+        
+        Raises:
+            MyCANoeException: If the connection fails
+        """
+        self._connect_to_canoe()
     
     def _connect_to_canoe(self) -> None:
         """Connect to CANoe application"""
         try:
+            # Initialize COM for this thread on first connection
+            if not self._backend_initialized:
+                self.backend.initialize()
+                self._backend_initialized = True
+            
             # Get the running CANoe application or create a new instance
-            self.app = win32com.client.Dispatch("CANoe.Application")
-            self.logger.info(f"Connected to CANoe version {self.app.Version}")
+            self.app = self.backend.dispatch()
+            self.version = self.app.Version
+            self.logger.info(f"Connected to CANoe version {self.get_version()}")
+            
+            # Get the configuration interface
+            self.configuration = self.app.Configuration
             
             # Get the measurement interface
             self.measurement = self.app.Measurement
+            self.measurement_events = self._create_measurement_events()
             
             # Get the system interface
             self.system = self.app.System
@@ -67,9 +178,18 @@ class MyCANoe:
             self.logger.error(f"Failed to connect to CANoe: {str(e)}")
             raise MyCANoeException(f"Failed to connect to CANoe: {str(e)}")
     
+    def _uninitialize_backend(self) -> None:
+        """Release COM for this thread if the first connection initialized it"""
+        if self._backend_initialized:
+            self._backend_initialized = False
+            self.backend.uninitialize()
+    
     def _initialize_objects(self):
         """Initialize all CANoe objects after opening a configuration"""
         try:
+            # Initialize configuration
+            self.configuration = self.app.Configuration
+            
             # Initialize environment
             self.environment = self.app.Environment
             
@@ -90,6 +210,115 @@ class MyCANoe:
             self.logger.error(f"Failed to initialize CANoe objects: {str(e)}")
             raise MyCANoeException(f"Failed to initialize CANoe objects: {str(e)}")
     
+    def _signal_index_covers(self, bus: str, channel: int) -> bool:
+        """Whether every database the configuration assigns to the channel is in the signal index"""
+        if not self.signal_index.indexed(bus, channel):
+            return False
+        try:
+            paths = [key[0] for key, entry in self._get_database_index().items()
+                     if key[1] == channel and entry["bus"] in (None, bus)]
+        except Exception:
+            return False
+        return self.signal_index.covers(bus, channel, paths)
+    
+    def _check_signal_spec(self, bus: str, channel: int, message: str, signal: str) -> None:
+        """Raise SignalError if the indexed databases of the channel do not define the signal"""
+        if self.signal_index.get_signal(bus, channel, message, signal) is None and self._signal_index_covers(bus, channel):
+            raise SignalError(f"Signal {bus}{channel}::{message}::{signal} is not defined in the databases")
+    
+    def _get_signal_object(self, bus: str, channel: int, message: str, signal: str) -> Any:
+        """Get the COM signal object, resolving it through GetBus/GetSignal only on a cache miss"""
+        def resolve():
+            self._check_signal_spec(bus, channel, message, signal)
+            return self.app.GetBus(bus).GetSignal(channel, message, signal)
+        
+        return self._signal_cache.get((bus, channel, message, signal), resolve)
+    
+    def _get_signal_objects(self, specs: List[Tuple[str, int, str, str]], errors: Optional[Dict] = None) -> Dict[Tuple, Any]:
+        """Get the COM signal objects for several specs, fetching each bus object at most once
+        
+        Args:
+            specs: List of (bus, channel, message, signal) tuples
+            errors: Optional dict that collects per-spec failures instead of raising
+            
+        Returns:
+            Dictionary mapping each resolvable spec to its signal object
+        """
+        buses = {}
+        
+        def resolve(bus, channel, message, signal):
+            self._check_signal_spec(bus, channel, message, signal)
+            bus_obj = buses.get(bus)
+            if bus_obj is None:
+                bus_obj = buses[bus] = self.app.GetBus(bus)
+            return bus_obj.GetSignal(channel, message, signal)
+        
+        signal_objs = {}
+        for spec in sorted(set(specs), key=lambda item: (item[0], item[1])):
+            try:
+                signal_objs[spec] = self._signal_cache.get(spec, lambda: resolve(*spec))
+            except Exception as e:
+                if errors is None:
+                    raise SignalError(f"{spec}: {str(e)}")
+                errors[spec] = str(e)
+        return signal_objs
+    
+    def _get_system_variable_object(self, sys_var_name: str) -> Any:
+        """Get the COM variable object, resolving namespace and variable only on a cache miss"""
+        def resolve():
+            namespace, variable_name = _split_system_variable_name(sys_var_name)
+            namespace_obj = self._namespace_cache.get(namespace, lambda: self.system.Namespaces(namespace))
+            return namespace_obj.Variables(variable_name)
+        
+        return self._sysvar_cache.get(sys_var_name, resolve)
+    
+    def _get_environment_variable_object(self, var_name: str) -> Any:
+        """Get the COM environment variable object, resolving it through GetVariable only on a cache miss"""
+        return self._envvar_cache.get(var_name, lambda: self.environment.GetVariable(var_name))
+    
+    def invalidate_caches(self) -> None:
+        """Drop all cached COM handles
+        
+        Called automatically when the configuration changes.
+        """
+        self._signal_cache.clear()
+        self._namespace_cache.clear()
+        self._sysvar_cache.clear()
+        self._envvar_cache.clear()
+        self._sysvar_schema.refresh()
+        self._database_index = None
+        self.signal_index.clear()
+    
+    def refresh_schema(self, sys_var_name: Optional[str] = None) -> None:
+        """Forget the learned type of system variables so it is learned again on the next write
+        
+        Args:
+            sys_var_name: Full name of a single system variable, or None for all
+        """
+        self._sysvar_schema.refresh(sys_var_name)
+    
+    def _invalidate_measurement_caches(self) -> None:
+        """Drop the COM handles that do not survive a measurement start or stop"""
+        self._signal_cache.clear()
+        self._handle_generation += 1
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hit/miss/eviction counters of the handle caches"""
+        return {
+            "signals": self._signal_cache.stats(),
+            "namespaces": self._namespace_cache.stats(),
+            "system_variables": self._sysvar_cache.stats(),
+            "environment_variables": self._envvar_cache.stats()
+        }
+    
+    def get_timing_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get how long open, new, quit, compile and measurement operations took
+        
+        Returns:
+            Dictionary keyed by operation with count, total, average, last and max in seconds
+        """
+        return self.timings.stats()
+    
     def get_version(self) -> str:
         """Get CANoe version as a string"""
         return f"{self.version.major}.{self.version.minor}.{self.version.Build}"
@@ -102,15 +331,33 @@ class MyCANoe:
         """Get the path of the current configuration"""
         return self.configuration.FullName
     
-    def open(self, config_path: str, visible=True, auto_save=True, prompt_user=False, auto_stop=True) -> None:
+    @_timed("open")
+    def open(self, config_path: str, visible=True, auto_save=True, prompt_user=False, auto_stop=True,
+             force=False, timeout=None) -> bool:
         """Open a CANoe configuration
         
+        If CANoe already has this configuration loaded and the file is unchanged
+        since it was opened through the library (same modification time and size, or
+        same content), the configuration is not reloaded. The fingerprint is kept in
+        the cache directory, so this also works for a new process.
+        
+        After Open() the configuration counts as loaded once CANoe reports its path.
+        When the configuration being opened is the one already loaded (force=True or
+        a modified file), the path matches from the start, so this only waits as
+        long as Open() itself blocks; CANoe's Open() returns after the load, but
+        there is no separate completion signal to confirm it.
+        
         Args:
             config_path: Path to the CANoe configuration file
             visible: Whether to make CANoe visible
             auto_save: Whether to automatically save the current configuration if changed
             prompt_user: Whether to prompt the user in error situations
             auto_stop: Whether to stop the measurement before opening the configuration
+            force: Whether to reload the configuration even if it is already loaded
+            timeout: Timeout in seconds to wait for the configuration to load
+            
+        Returns:
+            True if the configuration was loaded, False if the loaded one was kept
         """
         if not validate_file_path(config_path, '.cfg'):
             raise ConfigurationError(f"Invalid configuration file: {config_path}")
@@ -123,6 +370,13 @@ class MyCANoe:
             # Set visibility
             self.app.Visible = visible
             
+            fingerprint = file_fingerprint(config_path)
+            if not force and self._is_configuration_loaded(fingerprint):
+                self.logger.info("Configuration already loaded and unchanged, not reloading: %s", config_path)
+                # A new instance has not initialized the objects of the loaded configuration yet
+                self._initialize_objects()
+                return False
+            
             # Check if measurement is running
             if self.measurement.Running and not auto_stop:
                 raise MeasurementError("Measurement is running. Stop the measurement or set auto_stop=True")
@@ -132,36 +386,113 @@ class MyCANoe:
             
             # Open the configuration
             self.logger.info(f"Opening configuration: {config_path}")
+            record = self._configuration_record(config_path)
+            self._loaded_configuration = None
+            record.clear()
             self.app.Open(config_path, auto_save, prompt_user)
+            self.invalidate_caches()
             
-            # Wait for configuration to open
-            wait(1.0)
+            # Wait until CANoe reports the configuration as loaded; met at once on a reload
+            timeout = timeout or self.configuration_timeout
+            path = fingerprint[0]
+            if not self._wait_for_configuration(lambda full_name: normalize_path(full_name) == path, timeout):
+                raise ConfigurationError(f"Timeout waiting for configuration to load (timeout={timeout}s)")
             
             # Initialize all objects
             self._initialize_objects()
+            self._loaded_configuration = (fingerprint, file_digest(config_path))
+            self._save_configuration_record(record)
             
             self.logger.info(f"Successfully opened CANoe configuration: {config_path}")
+            return True
         except Exception as e:
             self.logger.error(f"Failed to open configuration: {str(e)}")
             raise ConfigurationError(f"Failed to open configuration: {str(e)}")
     
-    def new(self, auto_save=False, prompt_user=False) -> None:
+    def _configuration_record(self, config_path: str) -> ConfigurationRecord:
+        """Get the persisted record of a configuration in the cache directory"""
+        return ConfigurationRecord(self.cache_dir or cache_dir(), config_path)
+    
+    def _save_configuration_record(self, record: ConfigurationRecord) -> None:
+        try:
+            record.save(*self._loaded_configuration)
+        except OSError as e:
+            self.logger.debug("Could not record the loaded configuration: %s", e)
+    
+    def _is_configuration_loaded(self, fingerprint: Tuple[str, int, int]) -> bool:
+        """Whether CANoe has the configuration loaded and its file is unchanged since it was opened"""
+        path, mtime, size = fingerprint
+        if normalize_path(self.app.Configuration.FullName) != path:
+            return False
+        
+        # Opened by this instance, or by another process as recorded in the cache directory
+        record = self._configuration_record(path)
+        loaded = self._loaded_configuration
+        if loaded is None or loaded[0][0] != path:
+            loaded = record.load()
+            if loaded is None:
+                return False
+        loaded_fingerprint, loaded_digest = loaded
+        if fingerprint == loaded_fingerprint:
+            self._loaded_configuration = loaded
+            return True
+        # Touched but possibly not modified, e.g. by a version control checkout
+        if size == loaded_fingerprint[2] and file_digest(path) == loaded_digest:
+            self._loaded_configuration = (fingerprint, loaded_digest)
+            self._save_configuration_record(record)
+            return True
+        return False
+    
+    def _wait_for_configuration(self, condition: Callable[[str], bool], timeout: float) -> bool:
+        """Wait until the configuration object is available and its full name satisfies a condition"""
+        def probe():
+            try:
+                return condition(self.app.Configuration.FullName)
+            except Exception:
+                return False
+        
+        result = wait_until(probe, timeout, interval=0.005, max_interval=0.2, backoff=2.0)
+        self.logger.debug("Polled configuration %d times in %.3fs", result.polls, result.elapsed)
+        return result.met
+    
+    def _wait_for_application_release(self, timeout: float) -> bool:
+        """Wait until the application object stops answering after Quit"""
+        def probe():
+            try:
+                self.app.Version
+                return False
+            except Exception:
+                return True
+        
+        result = wait_until(probe, timeout, interval=0.005, max_interval=0.2, backoff=2.0)
+        self.logger.debug("Polled application %d times in %.3fs", result.polls, result.elapsed)
+        return result.met
+    
+    @_timed("new")
+    def new(self, auto_save=False, prompt_user=False, timeout=None) -> None:
         """Create a new CANoe configuration
         
         Args:
             auto_save: Whether to automatically save the current configuration if changed
             prompt_user: Whether to prompt the user in error situations
+            timeout: Timeout in seconds to wait for the new configuration
         """
+        timeout = timeout or self.configuration_timeout
+        
         try:
             # Connect to CANoe if not already connected
             if self.app is None:
                 self._connect_to_canoe()
             
             # Create new configuration
+            previous = self.app.Configuration.FullName
+            self._loaded_configuration = None
             self.app.New(auto_save, prompt_user)
+            self.invalidate_caches()
             
-            # Wait for configuration to be created
-            wait(1.0)
+            # Wait for the configuration object to be replaced
+            if not self._wait_for_configuration(lambda full_name: not previous or full_name != previous, timeout):
+                raise ConfigurationError(f"Timeout waiting for new configuration (timeout={timeout}s)")
             
             # Initialize all objects
             self._initialize_objects()
@@ -171,20 +502,99 @@ class MyCANoe:
             self.logger.error(f"Failed to create new configuration: {str(e)}")
             raise ConfigurationError(f"Failed to create new configuration: {str(e)}")
     
-    def quit(self) -> None:
-        """Quit CANoe without saving changes in the configuration"""
+    @_timed("quit")
+    def quit(self, timeout=None) -> None:
+        """Quit CANoe without saving changes in the configuration
+        
+        Args:
+            timeout: Timeout in seconds to wait for the application to exit
+        """
+        timeout = timeout or self.application_timeout
+        
         try:
             if self.app is not None:
                 self.logger.info("Quitting CANoe application")
+                self._close_subscriptions()
+                self._close_measurement_events()
                 self.app.Quit()
-                wait(1.0)
-                pythoncom.CoUninitialize()
+                self.invalidate_caches()
+                self._loaded_configuration = None
+                if not self._wait_for_application_release(timeout):
+                    self.logger.warning("CANoe application still answering %ss after Quit", timeout)
+                self._uninitialize_backend()
                 self.app = None
                 self.logger.info("CANoe Application Closed")
         except Exception as e:
             self.logger.error(f"Failed to quit CANoe application: {str(e)}")
             raise MyCANoeException(f"Failed to quit CANoe application: {str(e)}")
     
+    def _create_measurement_events(self) -> Optional[MeasurementEventSource]:
+        """Subscribe to the measurement events, or return None to fall back to polling"""
+        factory = self._measurement_events_factory or self.backend.measurement_events
+        try:
+            events = factory(self.measurement)
+            events.init_callbacks.append(self._on_measurement_init)
+            return events
+        except Exception as e:
+            self.logger.warning(f"Measurement events unavailable, falling back to polling: {str(e)}")
+            return None
+    
+    def _close_measurement_events(self) -> None:
+        """Release the measurement event subscription"""
+        if self.measurement_events is not None:
+            try:
+                self.measurement_events.close()
+            finally:
+                self.measurement_events = None
+    
+    def _on_measurement_init(self) -> None:
+        """Resolve the user CAPL functions while CANoe allows GetFunction
+        
+        Called from the measurement's OnInit event; every call starts a new
+        measurement generation, which makes previously resolved functions stale.
+        """
+        self._measurement_generation += 1
+        self._capl_functions = {}
+        for name in self.user_capl_functions:
+            try:
+                self._resolve_capl_function(name)
+            except Exception as e:
+                self.logger.warning("Failed to resolve CAPL function '%s': %s", name, e)
+    
+    def _ensure_measurement_initialized(self, generation: int) -> None:
+        """Run the init handling after a start if no OnInit event did it since generation"""
+        if self._measurement_generation == generation:
+            self._on_measurement_init()
+    
+    def _arm_measurement_events(self) -> None:
+        """Clear pending measurement notifications before a transition"""
+        if self.measurement_events is not None:
+            self.measurement_events.arm()
+    
+    def _wait_for_measurement(self, running: bool, deadline: Deadline) -> bool:
+        """Wait until the measurement reaches the requested state
+        
+        Returns as soon as the OnStart/OnExit event fires. Without an event source
+        the Running property is polled with exponential backoff instead.
+        
+        Args:
+            running: True to wait for the start, False to wait for the stop
+            deadline: Deadline bounding the wait
+            
+        Returns:
+            True if the measurement reached the requested state
+        """
+        probe = lambda: self.measurement.Running == running
+        if self.measurement_events is not None:
+            if running:
+                return self.measurement_events.wait_started(deadline.remaining(), probe)
+            return self.measurement_events.wait_stopped(deadline.remaining(), probe)
+        
+        result = wait_until(probe, None, interval=0.005, max_interval=0.1, backoff=2.0, deadline=deadline)
+        self.logger.debug("Polled measurement state %d times in %.3fs", result.polls, result.elapsed)
+        return result.met
+    
+    @_timed("start_measurement")
     def start_measurement(self, timeout=None) -> bool:
         """Start the measurement
         
@@ -195,19 +605,21 @@ class MyCANoe:
             True if measurement started successfully
         """
         timeout = timeout or self.measurement_timeout
+        deadline = Deadline(timeout)
         
         try:
             if not self.measurement.Running:
                 self.logger.info("Starting measurement")
+                generation = self._measurement_generation
+                self._arm_measurement_events()
                 self.measurement.Start()
+                self._invalidate_measurement_caches()
                 
                 # Wait for measurement to start
-                start_time = time.time()
-                while not self.measurement.Running:
-                    if time.time() - start_time > timeout:
-                        self.logger.error(f"Timeout waiting for measurement to start (timeout={timeout}s)")
-                        return False
-                    wait(0.1)
+                if not self._wait_for_measurement(True, deadline):
+                    self.logger.error(f"Timeout waiting for measurement to start (timeout={timeout}s)")
+                    return False
+                self._ensure_measurement_initialized(generation)
                 
                 self.logger.info("Measurement started successfully")
                 return True
@@ -218,6 +630,7 @@ class MyCANoe:
             self.logger.error(f"Failed to start measurement: {str(e)}")
             raise MeasurementError(f"Failed to start measurement: {str(e)}")
     
+    @_timed("stop_measurement")
     def stop_measurement(self, timeout=None) -> bool:
         """Stop the measurement
         
@@ -228,19 +641,19 @@ class MyCANoe:
             True if measurement stopped successfully
         """
         timeout = timeout or self.measurement_timeout
+        deadline = Deadline(timeout)
         
         try:
             if self.measurement.Running:
                 self.logger.info("Stopping measurement")
+                self._arm_measurement_events()
                 self.measurement.Stop()
+                self._invalidate_measurement_caches()
                 
                 # Wait for measurement to stop
-                start_time = time.time()
-                while self.measurement.Running:
-                    if time.time() - start_time > timeout:
-                        self.logger.error(f"Timeout waiting for measurement to stop (timeout={timeout}s)")
-                        return False
-                    wait(0.1)
+                if not self._wait_for_measurement(False, deadline):
+                    self.logger.error(f"Timeout waiting for measurement to stop (timeout={timeout}s)")
+                    return False
                 
                 self.logger.info("Measurement stopped successfully")
                 return True
@@ -251,25 +664,48 @@ class MyCANoe:
             self.logger.error(f"Failed to stop measurement: {str(e)}")
             raise MeasurementError(f"Failed to stop measurement: {str(e)}")
     
-    def reset_measurement(self) -> bool:
+    @_timed("reset_measurement")
+    def reset_measurement(self, timeout=None) -> bool:
         """Reset the measurement
         
+        Args:
+            timeout: Timeout in seconds shared by the stop and the start of the measurement
+            
         Returns:
             True if measurement reset successfully
         """
+        timeout = timeout or self.measurement_timeout
+        deadline = Deadline(timeout)
+        
         try:
             if self.measurement.Running:
                 self.logger.info("Resetting measurement")
+                self._arm_measurement_events()
                 self.measurement.Stop()
-                wait(0.5)
+                self._invalidate_measurement_caches()
+                if not self._wait_for_measurement(False, deadline):
+                    self.logger.error(f"Timeout waiting for measurement to stop (timeout={timeout}s)")
+                    return False
+                generation = self._measurement_generation
+                self._arm_measurement_events()
                 self.measurement.Start()
-                wait(0.5)
+                self._invalidate_measurement_caches()
+                if not self._wait_for_measurement(True, deadline):
+                    self.logger.error(f"Timeout waiting for measurement to start (timeout={timeout}s)")
+                    return False
+                self._ensure_measurement_initialized(generation)
                 self.logger.info("Measurement reset successfully")
                 return True
             else:
                 self.logger.info("Measurement not running, starting measurement")
+                generation = self._measurement_generation
+                self._arm_measurement_events()
                 self.measurement.Start()
-                wait(0.5)
+                self._invalidate_measurement_caches()
+                if not self._wait_for_measurement(True, deadline):
+                    self.logger.error(f"Timeout waiting for measurement to start (timeout={timeout}s)")
+                    return False
+                self._ensure_measurement_initialized(generation)
                 self.logger.info("Measurement started successfully")
                 return True
         except Exception as e:
@@ -300,15 +736,16 @@ class MyCANoe:
             The signal value
         """
         try:
-            signal_obj = self.app.GetBus(bus).GetSignal(channel, message, signal)
+            signal_obj = self._get_signal_object(bus, channel, message, signal)
             if raw_value:
                 value = signal_obj.RawValue
             else:
                 value = signal_obj.Value
             
-            self.logger.debug(f"Got signal value: {bus}{channel}.{message}.{signal} = {value}")
+            self.logger.debug("Got signal value: %s%s.%s.%s = %s", bus, channel, message, signal, value)
             return value
         except Exception as e:
+            self._signal_cache.discard((bus, channel, message, signal))
             self.logger.error(f"Failed to get signal value: {str(e)}")
             raise SignalError(f"Failed to get signal value: {str(e)}")
 
@@ -324,14 +761,15 @@ class MyCANoe:
             raw_value: Whether to set the raw value (True) or physical value (False)
         """
         try:
-            signal_obj = self.app.GetBus(bus).GetSignal(channel, message, signal)
+            signal_obj = self._get_signal_object(bus, channel, message, signal)
             if raw_value:
                 signal_obj.RawValue = value
             else:
                 signal_obj.Value = value
             
-            self.logger.debug(f"Set signal value: {bus}{channel}.{message}.{signal} = {value}")
+            self.logger.debug("Set signal value: %s%s.%s.%s = %s", bus, channel, message, signal, value)
         except Exception as e:
+            self._signal_cache.discard((bus, channel, message, signal))
             self.logger.error(f"Failed to set signal value: {str(e)}")
             raise SignalError(f"Failed to set signal value: {str(e)}")
     
@@ -348,11 +786,12 @@ class MyCANoe:
             The full name of the signal
         """
         try:
-            signal_obj = self.app.GetBus(bus).GetSignal(channel, message, signal)
+            signal_obj = self._get_signal_object(bus, channel, message, signal)
             full_name = signal_obj.FullName
-            self.logger.debug(f"Got signal full name: {bus}{channel}.{message}.{signal} = {full_name}")
+            self.logger.debug("Got signal full name: %s%s.%s.%s = %s", bus, channel, message, signal, full_name)
             return full_name
         except Exception as e:
+            self._signal_cache.discard((bus, channel, message, signal))
             self.logger.error(f"Failed to get signal full name: {str(e)}")
             raise SignalError(f"Failed to get signal full name: {str(e)}")
     
@@ -369,14 +808,113 @@ class MyCANoe:
             True if the signal is online
         """
         try:
-            signal_obj = self.app.GetBus(bus).GetSignal(channel, message, signal)
+            signal_obj = self._get_signal_object(bus, channel, message, signal)
             is_online = signal_obj.IsOnline
-            self.logger.debug(f"Signal online status: {bus}{channel}.{message}.{signal} = {is_online}")
+            self.logger.debug("Signal online status: %s%s.%s.%s = %s", bus, channel, message, signal, is_online)
             return is_online
         except Exception as e:
+            self._signal_cache.discard((bus, channel, message, signal))
             self.logger.error(f"Failed to check signal online status: {str(e)}")
             raise SignalError(f"Failed to check signal online status: {str(e)}")
     
+    def get_signal_values(self, specs: List[Tuple[str, int, str, str]], raw_value=False, as_array=False) -> Dict[str, Any]:
+        """Get the values of several signals in one call
+        
+        Signals are grouped by bus so each bus object is fetched only once, and
+        all values are read back-to-back under a single snapshot timestamp.
+        
+        Args:
+            specs: List of (bus, channel, message, signal) tuples
+            raw_value: Whether to get the raw values (True) or physical values (False)
+            as_array: Whether to return the values as a NumPy array in the order of specs
+            
+        Returns:
+            Dictionary with the snapshot "timestamp", the read "duration" in seconds and
+            the "values", either a dict keyed by spec tuple or a NumPy array
+        """
+        specs = [tuple(spec) for spec in specs]
+        attribute = "RawValue" if raw_value else "Value"
+        
+        try:
+            signal_objs = self._get_signal_objects(specs)
+        except Exception as e:
+            self.logger.error(f"Failed to get signal values: {str(e)}")
+            raise SignalError(f"Failed to get signal values: {str(e)}")
+        
+        values = {}
+        timestamp = time.time()
+        start_time = time.perf_counter()
+        try:
+            for spec in specs:
+                values[spec] = getattr(signal_objs[spec], attribute)
+        except Exception as e:
+            self._signal_cache.discard(spec)
+            self.logger.error(f"Failed to get signal values: {spec}: {str(e)}")
+            raise SignalError(f"Failed to get signal values: {spec}: {str(e)}")
+        duration = time.perf_counter() - start_time
+        
+        self.logger.debug("Got %d signal values in %.3f ms", len(values), duration * 1000)
+        if as_array:
+            np = import_numpy()
+            values = np.array([values[spec] for spec in specs], dtype=float)
+        return {"timestamp": timestamp, "duration": duration, "values": values}
+    
+    def set_signal_values(self, mapping: Dict[Tuple[str, int, str, str], Any], raw_value=False, rollback=False) -> Dict[str, Any]:
+        """Set the values of several signals in one call
+        
+        All handles are resolved before the first write so the writes run in a tight
+        loop. A failing signal does not abort the batch; it is reported in the result.
+        
+        Args:
+            mapping: Dictionary mapping (bus, channel, message, signal) tuples to values
+            raw_value: Whether to set the raw values (True) or physical values (False)
+            rollback: Whether to restore the previous values of all written signals if any signal fails
+            
+        Returns:
+            Dictionary with "result" (True if every signal was set), "failed" mapping each
+            failing spec to its error message, and "rolled_back"
+        """
+        mapping = {tuple(spec): value for spec, value in mapping.items()}
+        attribute = "RawValue" if raw_value else "Value"
+        failed = {}
+        
+        signal_objs = self._get_signal_objects(list(mapping), errors=failed)
+        
+        previous = {}
+        if rollback:
+            for spec, signal_obj in signal_objs.items():
+                try:
+                    previous[spec] = getattr(signal_obj, attribute)
+                except Exception as e:
+                    failed[spec] = str(e)
+        
+        written = []
+        for spec, value in mapping.items():
+            signal_obj = signal_objs.get(spec)
+            if signal_obj is None or spec in failed:
+                continue
+            try:
+                setattr(signal_obj, attribute, value)
+                written.append(spec)
+            except Exception as e:
+                self._signal_cache.discard(spec)
+                failed[spec] = str(e)
+        
+        rolled_back = False
+        if failed and rollback:
+            for spec in written:
+                try:
+                    setattr(signal_objs[spec], attribute, previous[spec])
+                except Exception as e:
+                    self.logger.error(f"Failed to restore signal value: {spec}: {str(e)}")
+            rolled_back = True
+        
+        if failed:
+            self.logger.error(f"Failed to set {len(failed)} of {len(mapping)} signal values: {failed}")
+        else:
+            self.logger.debug("Set %d signal values", len(mapping))
+        return {"result": not failed, "failed": failed, "rolled_back": rolled_back}
+    
     # Environment Variable Methods
     def get_environment_variable_value(self, var_name: str) -> Any:
         """Get the value of an environment variable
@@ -388,11 +926,12 @@ class MyCANoe:
             The value of the environment variable
         """
         try:
-            var = self.environment.GetVariable(var_name)
+            var = self._get_environment_variable_object(var_name)
             value = var.Value
-            self.logger.debug(f"Got environment variable value: {var_name} = {value}")
+            self.logger.debug("Got environment variable value: %s = %s", var_name, value)
             return value
         except Exception as e:
+            self._envvar_cache.discard(var_name)
             self.logger.error(f"Failed to get environment variable value: {str(e)}")
             raise MyCANoeException(f"Failed to get environment variable value: {str(e)}")
 
@@ -404,13 +943,104 @@ class MyCANoe:
             value: Value to set
         """
         try:
-            var = self.environment.GetVariable(var_name)
+            var = self._get_environment_variable_object(var_name)
             var.Value = value
-            self.logger.debug(f"Set environment variable value: {var_name} = {value}")
+            self.logger.debug("Set environment variable value: %s = %s", var_name, value)
         except Exception as e:
+            self._envvar_cache.discard(var_name)
             self.logger.error(f"Failed to set environment variable value: {str(e)}")
             raise MyCANoeException(f"Failed to set environment variable value: {str(e)}")
     
+    def get_environment_variable_values(self, names: List[str]) -> Dict[str, Any]:
+        """Get the values of several environment variables in one call
+        
+        All handles are resolved first and the values are then read back-to-back
+        under a single snapshot timestamp.
+        
+        Args:
+            names: List of environment variable names
+            
+        Returns:
+            Dictionary with the snapshot "timestamp", the read "duration" in seconds and
+            the "values" keyed by name
+        """
+        name = None
+        try:
+            variables = []
+            for name in names:
+                variables.append((name, self._get_environment_variable_object(name)))
+            
+            values = {}
+            timestamp = time.time()
+            start_time = time.perf_counter()
+            for name, var in variables:
+                values[name] = var.Value
+            duration = time.perf_counter() - start_time
+        except Exception as e:
+            self._envvar_cache.discard(name)
+            self.logger.error(f"Failed to get environment variable values: {name}: {str(e)}")
+            raise MyCANoeException(f"Failed to get environment variable values: {name}: {str(e)}")
+        
+        self.logger.debug("Got %d environment variable values in %.3f ms", len(values), duration * 1000)
+        return {"timestamp": timestamp, "duration": duration, "values": values}
+    
+    def set_environment_variable_values(self, mapping: Dict[str, Any], rollback=False) -> Dict[str, Any]:
+        """Set the values of several environment variables in one call
+        
+        All handles are resolved before the first write. A failing variable does not
+        abort the batch; it is reported in the result.
+        
+        Args:
+            mapping: Dictionary mapping environment variable names to values
+            rollback: Whether to restore the previous values of all written variables if any variable fails
+            
+        Returns:
+            Dictionary with "result" (True if every variable was set), "failed" mapping each
+            failing name to its error message, and "rolled_back"
+        """
+        failed = {}
+        variables = {}
+        for name in mapping:
+            try:
+                variables[name] = self._get_environment_variable_object(name)
+            except Exception as e:
+                failed[name] = str(e)
+        
+        previous = {}
+        if rollback:
+            for name, var in variables.items():
+                try:
+                    previous[name] = var.Value
+                except Exception as e:
+                    failed[name] = str(e)
+        
+        written = []
+        for name, value in mapping.items():
+            var = variables.get(name)
+            if var is None or name in failed:
+                continue
+            try:
+                var.Value = value
+                written.append(name)
+            except Exception as e:
+                self._envvar_cache.discard(name)
+                failed[name] = str(e)
+        
+        rolled_back = False
+        if failed and rollback:
+            for name in written:
+                try:
+                    variables[name].Value = previous[name]
+                except Exception as e:
+                    self.logger.error(f"Failed to restore environment variable value: {name}: {str(e)}")
+            rolled_back = True
+        
+        if failed:
+            self.logger.error(f"Failed to set {len(failed)} of {len(mapping)} environment variable values: {failed}")
+        else:
+            self.logger.debug("Set %d environment variable values", len(mapping))
+        return {"result": not failed, "failed": failed, "rolled_back": rolled_back}
+    
     # System Variable Methods
     def get_system_variable_value(self, sys_var_name: str) -> Any:
         """Get the value of a system variable
@@ -422,19 +1052,13 @@ class MyCANoe:
             The value of the system variable
         """
         try:
-            # Split the namespace and variable name
-            parts = sys_var_name.split('::')
-            namespace = '::'.join(parts[:-1])
-            variable_name = parts[-1]
-            
-            # Get the namespace and variable
-            namespace_obj = self.system.Namespaces(namespace)
-            variable_obj = namespace_obj.Variables(variable_name)
+            variable_obj = self._get_system_variable_object(sys_var_name)
             
             value = variable_obj.Value
-            self.logger.debug(f"Got system variable value: {sys_var_name} = {value}")
+            self.logger.debug("Got system variable value: %s = %s", sys_var_name, value)
             return value
         except Exception as e:
+            self._sysvar_cache.discard(sys_var_name)
             self.logger.error(f"Failed to get system variable value: {str(e)}")
             raise MyCANoeException(f"Failed to get system variable value: {str(e)}")
 
@@ -446,97 +1070,444 @@ class MyCANoe:
             value: Value to set
         """
         try:
-            # Split the namespace and variable name
-            parts = sys_var_name.split('::')
-            namespace = '::'.join(parts[:-1])
-            variable_name = parts[-1]
-            
-            # Get the namespace and variable
-            namespace_obj = self.system.Namespaces(namespace)
-            variable_obj = namespace_obj.Variables(variable_name)
-            
-            # Get the current value to determine its type
-            current_value = variable_obj.Value
-            
-            # Set the value based on the current value's type
-            if isinstance(current_value, int):
-                # Convert to int if the current value is an integer
-                if isinstance(value, str) and value.startswith("0x"):
-                    # Handle hex strings
-                    variable_obj.Value = int(value, 16)
-                else:
-                    variable_obj.Value = int(value)
-            elif isinstance(current_value, float):
-                # Convert to float if the current value is a float
-                variable_obj.Value = float(value)
-            elif isinstance(current_value, str):
-                # Keep as string if the current value is a string
-                variable_obj.Value = str(value)
-            else:
-                # For other types, try direct assignment
-                variable_obj.Value = value
+            variable_obj = self._get_system_variable_object(sys_var_name)
+            
+            # Coerce to the variable's type, learned once per variable
+            schema = self._sysvar_schema.get(sys_var_name, variable_obj)
+            variable_obj.Value = schema.coerce(value)
                 
-            self.logger.debug(f"Set system variable value: {sys_var_name} = {value}")
+            self.logger.debug("Set system variable value: %s = %s", sys_var_name, value)
         except Exception as e:
+            self._sysvar_cache.discard(sys_var_name)
             self.logger.error(f"Failed to set system variable value: {str(e)}")
             raise MyCANoeException(f"Failed to set system variable value: {str(e)}")
     
-    def set_system_variable_array_values(self, sys_var_name: str, values: Tuple) -> None:
+    def set_system_variable_array_values(self, sys_var_name: str, values: Any, offset: int = 0) -> None:
         """Set the values of a system variable array
         
+        Once the array length is known, a write covering the whole array is sent
+        without reading the current value first. Partial updates read the array
+        once and patch the slice starting at offset.
+        
         Args:
             sys_var_name: Full name of the system variable array including namespace
-            values: Tuple of values to set
+            values: Values to set as tuple, list, NumPy array, bytes, bytearray,
+                memoryview or array.array; elements beyond the array end are ignored
+            offset: Index of the first array element to update
         """
         try:
-            # Split the namespace and variable name
-            parts = sys_var_name.split('::')
-            namespace = '::'.join(parts[:-1])
-            variable_name = parts[-1]
-            
-            # Get the namespace and variable
-            namespace_obj = self.system.Namespaces(namespace)
-            variable_obj = namespace_obj.Variables(variable_name)
+            variable_obj = self._get_system_variable_object(sys_var_name)
+            schema = self._sysvar_schema.get(sys_var_name, variable_obj)
+            new_values = as_sequence(values)
             
-            # Get the current array values
-            current_values = list(variable_obj.Value)
-            
-            # Update the array values
-            for i, value in enumerate(values):
-                if i < len(current_values):
-                    current_values[i] = value
+            if offset == 0 and schema.length is not None and len(new_values) >= schema.length:
+                # Whole array is overwritten, no need to read it
+                array = new_values[:schema.length]
+            else:
+                # Patch the slice into the current array values
+                array = list(variable_obj.Value)
+                schema.length = len(array)
+                if not 0 <= offset <= schema.length:
+                    raise IndexError(f"Offset {offset} out of range for array of length {schema.length}")
+                end = min(offset + len(new_values), schema.length)
+                array[offset:end] = new_values[:end - offset]
             
             # Set the updated array
-            variable_obj.Value = tuple(current_values)
-                
-            self.logger.debug(f"Set system variable array values: {sys_var_name} = {values}")
+            variable_obj.Value = schema.pack(array)
+            
+            self.logger.debug("Set system variable array values: %s[%d:] (%d values)", sys_var_name, offset, len(new_values))
         except Exception as e:
+            self._sysvar_cache.discard(sys_var_name)
             self.logger.error(f"Failed to set system variable array values: {str(e)}")
             raise MyCANoeException(f"Failed to set system variable array values: {str(e)}")
     
+    def get_system_variable_array(self, sys_var_name: str, dtype=None) -> Any:
+        """Get the values of a system variable array as a NumPy array
+        
+        Data (byte array) variables are returned as a read-only uint8 view of the
+        bytes received from COM, without copying.
+        
+        Args:
+            sys_var_name: Full name of the system variable array including namespace
+            dtype: NumPy dtype of the result; defaults to float64, int32 or uint8 by variable type
+            
+        Returns:
+            NumPy array with the array values
+        """
+        np = import_numpy()
+        try:
+            variable_obj = self._get_system_variable_object(sys_var_name)
+            schema = self._sysvar_schema.get(sys_var_name, variable_obj)
+            value = variable_obj.Value
+            schema.length = len(value)
+            
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                array = np.frombuffer(value, dtype=np.uint8)
+                if dtype is not None:
+                    array = array.astype(dtype, copy=False)
+            else:
+                array = np.array(value, dtype=dtype or ARRAY_DTYPES.get(schema.type_code))
+            
+            self.logger.debug("Got system variable array: %s (%d values)", sys_var_name, len(array))
+            return array
+        except Exception as e:
+            self._sysvar_cache.discard(sys_var_name)
+            self.logger.error(f"Failed to get system variable array: {str(e)}")
+            raise MyCANoeException(f"Failed to get system variable array: {str(e)}")
+    
+    # Subscription Methods
+    def _get_subscription_manager(self):
+        if self.subscriptions is None:
+            from .subscriptions import SubscriptionManager
+            self.subscriptions = SubscriptionManager(self, self.subscription_poll_interval)
+        return self.subscriptions
+    
+    def _close_subscriptions(self) -> None:
+        if self.subscriptions is not None:
+            self.subscriptions.close()
+            self.subscriptions = None
+    
+    def subscribe_signal(self, bus: str, channel: int, message: str, signal: str, callback, min_interval: float = 0.0,
+                         raw_value=False):
+        """Call a function whenever the value of a signal changes
+        
+        Signals are polled in one batched pass every subscription_poll_interval seconds
+        on a background thread. The callback runs on a worker thread; changes arriving
+        while it is still running are coalesced into the latest value.
+        
+        Args:
+            bus: The bus (CAN, LIN, FlexRay, etc.)
+            channel: The channel number
+            message: The message name
+            signal: The signal name
+            callback: Function called with (name, value, timestamp) on every change
+            min_interval: Minimum time in seconds between two calls of the callback
+            raw_value: Whether to watch the raw value (True) or physical value (False)
+            
+        Returns:
+            Subscription whose cancel() method stops the callbacks
+        """
+        try:
+            # Fail here rather than on the watcher thread if the signal does not exist
+            self._get_signal_object(bus, channel, message, signal)
+            
+            subscription = self._get_subscription_manager().subscribe(
+                "signal", (bus, channel, message, signal), f"{bus}{channel}::{message}::{signal}",
+                callback, min_interval, "RawValue" if raw_value else "Value"
+            )
+            self.logger.debug("Subscribed to signal: %s%s.%s.%s", bus, channel, message, signal)
+            return subscription
+        except Exception as e:
+            self._signal_cache.discard((bus, channel, message, signal))
+            self.logger.error(f"Failed to subscribe to signal: {str(e)}")
+            raise SignalError(f"Failed to subscribe to signal: {str(e)}")
+    
+    def subscribe_system_variable(self, sys_var_name: str, callback, min_interval: float = 0.0):
+        """Call a function whenever the value of a system variable changes
+        
+        Changes are taken from the variable's change events when the backend
+        supports them and polled like signals otherwise.
+        
+        Args:
+            sys_var_name: Full name of the system variable including namespace
+            callback: Function called with (name, value, timestamp) on every change
+            min_interval: Minimum time in seconds between two calls of the callback
+            
+        Returns:
+            Subscription whose cancel() method stops the callbacks
+        """
+        try:
+            self._get_system_variable_object(sys_var_name)
+            
+            subscription = self._get_subscription_manager().subscribe(
+                "system_variable", sys_var_name, sys_var_name, callback, min_interval
+            )
+            self.logger.debug("Subscribed to system variable: %s", sys_var_name)
+            return subscription
+        except Exception as e:
+            self._sysvar_cache.discard(sys_var_name)
+            self.logger.error(f"Failed to subscribe to system variable: {str(e)}")
+            raise MyCANoeException(f"Failed to subscribe to system variable: {str(e)}")
+    
+    # Condition Methods
+    def wait_for_signal(self, spec: Tuple[str, int, str, str], predicate: Any, timeout: Optional[float] = 5.0,
+                        raw_value=False, interval: float = 0.001) -> ConditionResult:
+        """Wait until the value of a signal satisfies a condition
+        
+        Args:
+            spec: (bus, channel, message, signal) tuple
+            predicate: Function called with the value that returns True when the
+                condition is met, or a value the signal has to equal
+            timeout: Maximum time to wait in seconds
+            raw_value: Whether to check the raw value (True) or physical value (False)
+            interval: Time between two reads of the signal in seconds
+            
+        Returns:
+            ConditionResult that is truthy if the condition was met, with the value
+            and the time it was first observed
+        """
+        spec = tuple(spec)
+        predicate = _as_predicate(predicate)
+        return self.wait_for_values(lambda values: predicate(values[spec]), signals=[spec], timeout=timeout,
+                                    raw_value=raw_value, interval=interval)
+    
+    def wait_for_system_variable(self, sys_var_name: str, predicate: Any, timeout: Optional[float] = 5.0,
+                                 interval: float = 0.001) -> ConditionResult:
+        """Wait until the value of a system variable satisfies a condition
+        
+        Args:
+            sys_var_name: Full name of the system variable including namespace
+            predicate: Function called with the value that returns True when the
+                condition is met, or a value the variable has to equal
+            timeout: Maximum time to wait in seconds
+            interval: Time between two checks in seconds
+            
+        Returns:
+            ConditionResult that is truthy if the condition was met, with the value
+            and the time it was first observed
+        """
+        predicate = _as_predicate(predicate)
+        return self.wait_for_values(lambda values: predicate(values[sys_var_name]),
+                                    system_variables=[sys_var_name], timeout=timeout, interval=interval)
+    
+    def wait_for_values(self, predicate: Callable[[Dict[Any, Any]], bool],
+                        signals: Sequence[Tuple[str, int, str, str]] = (), system_variables: Sequence[str] = (),
+                        timeout: Optional[float] = 5.0, raw_value=False, interval: float = 0.001) -> ConditionResult:
+        """Wait until a condition over several signals and system variables is met
+        
+        Handles are resolved once. If only system variables are involved and the
+        backend supports their change events, the condition is evaluated for every
+        change as it is delivered; otherwise all values are read in one pass every
+        interval seconds and the condition is evaluated on each pass.
+        
+        Args:
+            predicate: Function called with a dictionary mapping each signal spec and
+                system variable name to its value; returns True when the condition is met
+            signals: List of (bus, channel, message, signal) tuples
+            system_variables: List of full system variable names
+            timeout: Maximum time to wait in seconds
+            raw_value: Whether to read raw signal values (True) or physical values (False)
+            interval: Time between two reads in seconds
+            
+        Returns:
+            ConditionResult that is truthy if the condition was met; values holds the
+            values it was met with and timestamp the time.time() of the change or read
+            that first satisfied it
+        """
+        signals = [tuple(spec) for spec in signals]
+        try:
+            readers = self._get_value_readers(signals, system_variables, raw_value)
+            
+            deadline = Deadline(timeout)
+            result = None
+            if not signals:
+                result = self._wait_for_variable_events(readers, predicate, deadline, interval)
+            if result is None:
+                result = self._poll_for_values(readers, predicate, deadline, interval)
+            
+            self.logger.debug("Condition %s after %.6f s and %d checks",
+                              "met" if result.met else "not met", result.elapsed, result.polls)
+            return result
+        except Exception as e:
+            raise self._condition_error(signals, system_variables, e)
+    
+    def _get_value_readers(self, signals: Sequence[Tuple[str, int, str, str]], system_variables: Sequence[str],
+                           raw_value=False) -> List[Tuple[Any, Any, str]]:
+        """Resolve the handles of a condition into (key, object, attribute) readers"""
+        attribute = "RawValue" if raw_value else "Value"
+        readers = [(spec, signal_obj, attribute) for spec, signal_obj in self._get_signal_objects(signals).items()]
+        readers += [(name, self._get_system_variable_object(name), "Value") for name in system_variables]
+        return readers
+    
+    @staticmethod
+    def _read_values(readers: List[Tuple[Any, Any, str]]) -> Dict[Any, Any]:
+        """Read every value of a condition in one pass"""
+        return {key: getattr(obj, attribute) for key, obj, attribute in readers}
+    
+    def _condition_error(self, signals: Sequence[Tuple[str, int, str, str]], system_variables: Sequence[str],
+                         error: Exception) -> MyCANoeException:
+        """Drop the handles of a failed condition and build the exception to raise"""
+        for spec in signals:
+            self._signal_cache.discard(spec)
+        for name in system_variables:
+            self._sysvar_cache.discard(name)
+        self.logger.error(f"Failed to wait for condition: {str(error)}")
+        return (SignalError if signals else MyCANoeException)(f"Failed to wait for condition: {str(error)}")
+    
+    def _poll_for_values(self, readers: List[Tuple[Any, Any, str]], predicate: Callable, deadline: Deadline,
+                         interval: float) -> ConditionResult:
+        last = {}
+        
+        def check():
+            values = self._read_values(readers)
+            last["timestamp"] = time.time()
+            last["values"] = values
+            return predicate(values)
+        
+        result = wait_until(check, None, interval=interval, deadline=deadline)
+        return ConditionResult(result.met, result.polls, result.elapsed, last["values"],
+                               last["timestamp"] if result.met else None)
+    
+    def _wait_for_variable_events(self, readers: List[Tuple[Any, Any, str]], predicate: Callable,
+                                  deadline: Deadline, interval: float) -> Optional[ConditionResult]:
+        """Evaluate the condition on every change event; None if the backend has no variable events"""
+        changes = deque()
+        changed = threading.Event()
+        subscriptions = []
+        
+        def on_change(key, value):
+            changes.append((key, value, time.time()))
+            changed.set()
+        
+        try:
+            # Subscribe before the first read so no change falls in between
+            try:
+                for key, obj, _ in readers:
+                    subscriptions.append(self.backend.variable_events(obj, lambda value, key=key: on_change(key, value)))
+            except NotImplementedError:
+                return None
+            
+            values = self._read_values(readers)
+            polls = 1
+            if predicate(values):
+                return ConditionResult(True, polls, deadline.elapsed(), values, time.time())
+            
+            while True:
+                changed.clear()
+                self.backend.pump()
+                while changes:
+                    key, value, timestamp = changes.popleft()
+                    if values[key] == value:
+                        continue
+                    values[key] = value
+                    polls += 1
+                    if predicate(values):
+                        return ConditionResult(True, polls, deadline.elapsed(), dict(values), timestamp)
+                remaining = deadline.remaining()
+                if remaining <= 0:
+                    return ConditionResult(False, polls, deadline.elapsed(), values, None)
+                changed.wait(min(remaining, interval))
+        finally:
+            for subscription in subscriptions:
+                subscription.close()
+    
     # CAPL Methods
-    def compile_all_capl_nodes(self) -> Dict:
+    def _get_capl_sources(self, config_path: str) -> List[str]:
+        """Get every CAPL file compiled with the configuration and the files they include
+        
+        Covers the simulation nodes, the test modules of all test environments and
+        any other CAPL program the configuration file references. Raises if any of
+        them cannot be enumerated, so the caller compiles unconditionally.
+        """
+        files = []
+        nodes = self.configuration.SimulationSetup.Nodes
+        files += [nodes.Item(i).FullName for i in range(1, nodes.Count + 1)]
+        
+        environments = self.configuration.TestSetup.TestEnvironments
+        pending = [environments.Item(i) for i in range(1, environments.Count + 1)]
+        while pending:
+            container = pending.pop()
+            modules = container.TestModules
+            files += [modules.Item(i).FullName for i in range(1, modules.Count + 1)]
+            folders = container.Folders
+            pending += [folders.Item(i) for i in range(1, folders.Count + 1)]
+        
+        files += find_configuration_capl_files(config_path)
+        return find_capl_sources(files)
+    
+    @_timed("compile")
+    def compile_all_capl_nodes(self, force=False) -> Dict:
         """Compile all CAPL, XML and .NET nodes
         
+        The compilation is skipped if none of the .can/.cin sources of the
+        configuration (simulation nodes, test modules and every CAPL program the
+        configuration file references) changed since the last successful compile of
+        the same configuration, as recorded in a content-hash manifest in the cache
+        directory. If the sources cannot be enumerated, it always compiles.
+        
+        CAPL.Compile() is synchronous: it returns once the compilation has
+        finished, so the result is read right after it.
+        
+        Args:
+            force: Whether to compile even if the sources are unchanged
+            
         Returns:
-            Dictionary with compilation result
+            Dictionary with result, errors, warnings, node, source, line, message
+            and whether the compilation was skipped
         """
         try:
+            # Track the sources of the configuration, if it has been saved and lists them
+            manifest = None
+            sources = None
+            config_path = self.configuration.FullName
+            if config_path:
+                try:
+                    sources = self._get_capl_sources(config_path)
+                    manifest = CompileManifest(manifest_path(self.cache_dir or cache_dir(), config_path))
+                except Exception as e:
+                    self.logger.debug("CAPL sources unavailable, compiling unconditionally: %s", e)
+            
+            if not force and manifest is not None and manifest.is_current(config_path, sources):
+                self.logger.info("CAPL sources unchanged since the last successful compile, skipping compilation")
+                return {"result": True, "errors": 0, "warnings": 0, "node": None, "source": None, "line": None,
+                        "message": "", "skipped": True}
+            
             self.capl.Compile()
-            wait(1.0)
             
             # Get compilation result
-            result = {"result": True, "errors": 0, "warnings": 0}
+            result = parse_compile_result(self.capl.CompileResult)
+            result["skipped"] = False
             
-            self.logger.info(f"Compiled all CAPL nodes successfully")
+            if result["result"]:
+                if manifest is not None:
+                    manifest.update(config_path, sources)
+                self.logger.info("Compiled all CAPL nodes successfully")
+            else:
+                if manifest is not None:
+                    manifest.clear()
+                self.logger.error("CAPL compilation failed in %s (%s, line %s): %s",
+                                  result["node"], result["source"], result["line"], result["message"])
             return result
         except Exception as e:
             self.logger.error(f"Failed to compile all CAPL nodes: {str(e)}")
-            return {"result": False, "errors": 1, "warnings": 0}
+            return {"result": False, "errors": 1, "warnings": 0, "node": None, "source": None, "line": None,
+                    "message": str(e), "skipped": False}
+    
+    def _resolve_capl_function(self, name: str) -> Tuple[Any, int, int]:
+        """Look up a CAPL function and its parameter count and store them in the registry"""
+        capl_function = self.capl.GetFunction(name)
+        entry = (capl_function, capl_function.ParameterCount, self._measurement_generation)
+        self._capl_functions[name] = entry
+        return entry
+    
+    def _get_capl_function(self, name: str) -> Tuple[Any, int]:
+        """Get a CAPL function and its parameter count, resolving it if missing or stale"""
+        entry = self._capl_functions.get(name)
+        if entry is None or entry[2] != self._measurement_generation:
+            if name not in self.user_capl_functions:
+                self.logger.warning("CAPL function '%s' not in user_capl_functions list", name)
+            entry = self._resolve_capl_function(name)
+        return entry[0], entry[1]
+    
+    def _prepare_capl_call(self, name: str, arguments: Sequence) -> Tuple[Any, tuple]:
+        """Get a CAPL function and check that the arguments match its parameter count
+        
+        Raises:
+            ValueError: If the number of arguments does not match
+        """
+        capl_function, param_count = self._get_capl_function(name)
+        arguments = tuple(arguments)
+        if len(arguments) != param_count:
+            raise ValueError(f"Function arguments not matching with CAPL user function args. Expected {param_count}, got {len(arguments)}")
+        return capl_function, arguments
     
     def call_capl_function(self, name: str, *arguments) -> bool:
         """Call a CAPL function
         
+        Functions listed in user_capl_functions are resolved once when the
+        measurement initializes; others are resolved on first call. Resolved
+        functions are reused until the measurement is restarted.
+        
         Args:
             name: The name of the CAPL function
             arguments: Function parameters
@@ -545,28 +1516,117 @@ class MyCANoe:
             True if the function was called successfully
         """
         try:
-            if name not in self.user_capl_functions:
-                self.logger.warning(f"CAPL function '{name}' not in user_capl_functions list")
-            
-            capl_function = self.capl.GetFunction(name)
-            param_count = capl_function.ParameterCount
-            
-            if len(arguments) != param_count:
-                self.logger.error(f"Function arguments not matching with CAPL user function args. Expected {param_count}, got {len(arguments)}")
+            try:
+                capl_function, arguments = self._prepare_capl_call(name, arguments)
+            except ValueError as e:
+                self.logger.error(str(e))
                 return False
             
-            if param_count > 0:
-                capl_function.Call(*arguments)
-            else:
-                capl_function.Call()
+            capl_function.Call(*arguments)
                 
-            self.logger.debug(f"Called CAPL function: {name}")
+            self.logger.debug("Called CAPL function: %s", name)
             return True
         except Exception as e:
             self.logger.error(f"Failed to call CAPL function: {str(e)}")
             raise MyCANoeException(f"Failed to call CAPL function: {str(e)}")
     
+    def call_capl_function_result(self, name: str, *arguments) -> Any:
+        """Call a CAPL function and return its return value
+        
+        Args:
+            name: The name of the CAPL function
+            arguments: Function parameters
+            
+        Returns:
+            The value returned by the CAPL function
+        """
+        try:
+            capl_function, arguments = self._prepare_capl_call(name, arguments)
+            value = capl_function.Call(*arguments)
+            self.logger.debug("Called CAPL function: %s = %s", name, value)
+            return value
+        except Exception as e:
+            self.logger.error(f"Failed to call CAPL function: {str(e)}")
+            raise MyCANoeException(f"Failed to call CAPL function: {str(e)}")
+    
+    def call_capl_functions(self, calls: Sequence[Tuple[str, Sequence]]) -> List[Any]:
+        """Call several CAPL functions back-to-back and return their return values
+        
+        All functions are resolved and their arguments checked before the first
+        call, so a typo in a later step does not leave the sequence half executed.
+        Through SharedCANoe or AsyncCANoe the whole sequence is one dispatch to the
+        COM thread.
+        
+        Args:
+            calls: List of (function name, arguments) tuples
+            
+        Returns:
+            List of the values returned by the functions, in order
+        """
+        name = None
+        try:
+            prepared = []
+            for name, arguments in calls:
+                prepared.append((name, *self._prepare_capl_call(name, arguments)))
+            
+            results = []
+            for name, capl_function, arguments in prepared:
+                results.append(capl_function.Call(*arguments))
+            
+            self.logger.debug("Called %d CAPL functions", len(results))
+            return results
+        except Exception as e:
+            self.logger.error(f"Failed to call CAPL function {name}: {str(e)}")
+            raise MyCANoeException(f"Failed to call CAPL function {name}: {str(e)}")
+    
     # Database Methods
+    def _get_database_index(self) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """Get the database index, reading the configuration's databases once if needed"""
+        if self._database_index is None:
+            databases = self.configuration.GeneralSetup.DatabaseSetup.Databases
+            index = {}
+            for i in range(1, databases.Count + 1):
+                db = databases.Item(i)
+                full_name = db.FullName
+                channel = db.Channel
+                index[(normalize_path(full_name), channel)] = {"path": full_name, "channel": channel, "bus": None}
+            self._database_index = index
+            self.logger.debug("Indexed %d databases", len(index))
+        return self._database_index
+    
+    def list_databases(self) -> List[Dict[str, Any]]:
+        """List the databases of the configuration
+        
+        Returns:
+            List of dictionaries with "path", "channel", "bus" (None unless added
+            through this instance) and the 1-based "index" in the database setup
+        """
+        try:
+            return [dict(entry, index=i) for i, entry in enumerate(self._get_database_index().values(), 1)]
+        except Exception as e:
+            self.logger.error(f"Failed to list databases: {str(e)}")
+            raise MyCANoeException(f"Failed to list databases: {str(e)}")
+    
+    def find_database(self, db_path: str, channel: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Find a database of the configuration without going through COM
+        
+        Args:
+            db_path: Path to the database file; any spelling of the same file matches
+            channel: The channel number, or None for the first database with this path
+            
+        Returns:
+            Dictionary like the entries of list_databases(), or None if not found
+        """
+        try:
+            path = normalize_path(db_path)
+            for i, (key, entry) in enumerate(self._get_database_index().items(), 1):
+                if key[0] == path and (channel is None or key[1] == channel):
+                    return dict(entry, index=i)
+            return None
+        except Exception as e:
+            self.logger.error(f"Failed to find database: {str(e)}")
+            raise MyCANoeException(f"Failed to find database: {str(e)}")
+    
     def add_database(self, db_path: str, bus: str, channel: int) -> bool:
         """Add a database to the configuration
         
@@ -584,16 +1644,23 @@ class MyCANoe:
             
             # Add the database
             db_setup.Databases.Add(db_path, bus, channel)
+            if self._database_index is not None:
+                self._database_index[(normalize_path(db_path), channel)] = {"path": db_path, "channel": channel, "bus": bus}
+            self._index_signal_database(db_path, bus, channel)
             
             self.logger.info(f"Added database: {db_path} to {bus}{channel}")
             return True
         except Exception as e:
+            self._database_index = None
             self.logger.error(f"Failed to add database: {str(e)}")
             raise MyCANoeException(f"Failed to add database: {str(e)}")
     
     def remove_database(self, db_path: str, channel: int) -> bool:
         """Remove a database from the configuration
         
+        The position of the database is taken from the index; only that entry is
+        read through COM to confirm it before removing it.
+        
         Args:
             db_path: Path to the database file
             channel: The channel number
@@ -604,25 +1671,105 @@ class MyCANoe:
         try:
             # Get the database setup
             db_setup = self.configuration.GeneralSetup.DatabaseSetup
+            key = (normalize_path(db_path), channel)
             
-            # Find and remove the database
-            for i in range(1, db_setup.Databases.Count + 1):
-                db = db_setup.Databases.Item(i)
-                if db.FullName == db_path and db.Channel == channel:
-                    db_setup.Databases.Remove(i)
-                    self.logger.info(f"Removed database: {db_path} from channel {channel}")
-                    return True
+            # Find the database, reading the setup again once if the index is out of date
+            position = None
+            for _ in range(2):
+                fresh = self._database_index is None
+                keys = list(self._get_database_index())
+                if key in keys:
+                    candidate = keys.index(key) + 1
+                    try:
+                        db = db_setup.Databases.Item(candidate)
+                        found = (normalize_path(db.FullName), db.Channel) == key
+                    except Exception:
+                        found = False
+                    if found:
+                        position = candidate
+                        break
+                if fresh:
+                    break
+                self._database_index = None
             
-            self.logger.warning(f"Database not found: {db_path} on channel {channel}")
-            return False
+            if position is None:
+                self.logger.warning(f"Database not found: {db_path} on channel {channel}")
+                return False
+            
+            db_setup.Databases.Remove(position)
+            del self._database_index[key]
+            self.signal_index.remove(db_path, channel)
+            self.logger.info(f"Removed database: {db_path} from channel {channel}")
+            return True
         except Exception as e:
+            self._database_index = None
             self.logger.error(f"Failed to remove database: {str(e)}")
             raise MyCANoeException(f"Failed to remove database: {str(e)}")
     
+    def _index_signal_database(self, db_path: str, bus: str, channel: int) -> bool:
+        """Add a database to the signal index, logging instead of raising if it cannot be parsed"""
+        self.signal_index.cache_directory = self.cache_dir
+        # A database left out of the index keeps its channel from being validated offline
+        if not validate_file_path(db_path):
+            self.logger.debug("Database %s not found, not indexing it", db_path)
+            return False
+        try:
+            return self.signal_index.add(db_path, bus, channel)
+        except Exception as e:
+            self.logger.warning(f"Failed to index database {db_path}: {str(e)}")
+            return False
+    
+    def load_signal_database(self, db_path: str, bus: str, channel: int) -> bool:
+        """Add a database that is already part of the configuration to the signal index
+        
+        Databases added through add_database() are indexed automatically. Once every
+        database the configuration assigns to a channel is indexed, signal specs of
+        that channel are validated locally before any COM call.
+        
+        Args:
+            db_path: Path to the database file
+            bus: The bus (CAN, LIN, FlexRay, etc.)
+            channel: The channel number
+            
+        Returns:
+            True if the database was parsed into the index
+        """
+        return self._index_signal_database(db_path, bus, channel)
+    
+    def get_signal_info(self, bus: str, channel: int, message: str, signal: str) -> Optional[SignalInfo]:
+        """Get the database definition of a signal without going through COM
+        
+        Args:
+            bus: The bus (CAN, LIN, FlexRay, etc.)
+            channel: The channel number
+            message: The message name
+            signal: The signal name
+            
+        Returns:
+            SignalInfo with bit layout, scaling, range and value table, or None if no
+            indexed database defines the signal
+        """
+        return self.signal_index.get_signal(bus, channel, message, signal)
+    
+    def validate_signal(self, bus: str, channel: int, message: str, signal: str) -> bool:
+        """Check a signal spec against the indexed databases without going through COM
+        
+        Args:
+            bus: The bus (CAN, LIN, FlexRay, etc.)
+            channel: The channel number
+            message: The message name
+            signal: The signal name
+            
+        Returns:
+            True if an indexed database of the channel defines the signal
+        """
+        return self.signal_index.get_signal(bus, channel, message, signal) is not None
+    
     def close(self):
         """Clean up resources"""
         try:
-            pythoncom.CoUninitialize()
+            self._close_subscriptions()
+            self._uninitialize_backend()
         except:
             pass
     
@@ -0,0 +1,298 @@
+"""
+Offline DBC parsing and signal metadata index for the MyCANoe library
+"""
+
+import marshal
+import os
+import re
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from .utils import normalize_path, file_fingerprint, cache_dir
+
+# Bumped whenever the layout of the cached tuples changes
+CACHE_FORMAT = 1
+
+_MESSAGE_PATTERN = re.compile(r"^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)\s+(\w+)")
+_SIGNAL_PATTERN = re.compile(
+    r"^SG_\s+(\w+)\s*(M|m\d+M?)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*"
+    r"\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)\s*\[\s*([^|\s]+)\s*\|\s*([^\]\s]+)\s*\]\s*\"([^\"]*)\""
+)
+_VALUE_TABLE_PATTERN = re.compile(r"^VAL_\s+(\d+)\s+(\w+)\s+(.*);\s*$", re.DOTALL)
+_VALUE_PATTERN = re.compile(r"(-?\d+)\s+\"([^\"]*)\"")
+
+class SignalInfo:
+    """Layout and scaling of a signal as defined in the database"""
+
+    __slots__ = ("name", "start_bit", "length", "little_endian", "signed", "factor", "offset",
+                 "minimum", "maximum", "unit", "multiplexer", "value_table")
+
+    def __init__(self, name: str, start_bit: int, length: int, little_endian: bool, signed: bool,
+                 factor: float, offset: float, minimum: float, maximum: float, unit: str = "",
+                 multiplexer: Optional[str] = None, value_table: Optional[Dict[int, str]] = None):
+        self.name = name
+        self.start_bit = start_bit
+        self.length = length
+        self.little_endian = little_endian
+        self.signed = signed
+        self.factor = factor
+        self.offset = offset
+        self.minimum = minimum
+        self.maximum = maximum
+        self.unit = unit
+        self.multiplexer = multiplexer
+        self.value_table = value_table or {}
+
+    def to_physical(self, raw: int) -> float:
+        """Convert a raw value to the physical value"""
+        return raw * self.factor + self.offset
+
+    def to_raw(self, physical: float) -> int:
+        """Convert a physical value to the nearest raw value"""
+        return int(round((physical - self.offset) / self.factor))
+
+    def raw_range(self) -> Tuple[int, int]:
+        """Get the smallest and largest raw value that fits the signal's bits"""
+        if self.signed:
+            return -(1 << (self.length - 1)), (1 << (self.length - 1)) - 1
+        return 0, (1 << self.length) - 1
+
+    def _pack(self) -> tuple:
+        return (self.name, self.start_bit, self.length, self.little_endian, self.signed, self.factor,
+                self.offset, self.minimum, self.maximum, self.unit, self.multiplexer,
+                tuple(self.value_table.items()))
+
+    @classmethod
+    def _unpack(cls, values: tuple) -> "SignalInfo":
+        *fields, value_table = values
+        return cls(*fields, value_table=dict(value_table))
+
+    def __repr__(self) -> str:
+        return (f"SignalInfo({self.name!r}, start_bit={self.start_bit}, length={self.length}, "
+                f"factor={self.factor}, offset={self.offset})")
+
+class MessageInfo:
+    """A message of the database with its signals keyed by name"""
+
+    __slots__ = ("frame_id", "extended", "name", "dlc", "sender", "signals")
+
+    def __init__(self, frame_id: int, extended: bool, name: str, dlc: int, sender: str,
+                 signals: Optional[Dict[str, SignalInfo]] = None):
+        self.frame_id = frame_id
+        self.extended = extended
+        self.name = name
+        self.dlc = dlc
+        self.sender = sender
+        self.signals = signals or {}
+
+    def _pack(self) -> tuple:
+        return (self.frame_id, self.extended, self.name, self.dlc, self.sender,
+                tuple(signal._pack() for signal in self.signals.values()))
+
+    @classmethod
+    def _unpack(cls, values: tuple) -> "MessageInfo":
+        *fields, signals = values
+        unpacked = (SignalInfo._unpack(signal) for signal in signals)
+        return cls(*fields, signals={signal.name: signal for signal in unpacked})
+
+    def __repr__(self) -> str:
+        return f"MessageInfo({self.name!r}, frame_id=0x{self.frame_id:X}, signals={len(self.signals)})"
+
+def _statements(lines: Iterator[str]) -> Iterator[str]:
+    """Yield stripped lines, joining VAL_ statements that span several lines"""
+    pending = None
+    for line in lines:
+        line = line.strip()
+        if pending is not None:
+            pending += " " + line
+            if pending.endswith(";"):
+                yield pending
+                pending = None
+        elif line.startswith("VAL_ ") and not line.endswith(";"):
+            pending = line
+        elif line:
+            yield line
+
+def parse_dbc(file_path: str) -> Dict[str, MessageInfo]:
+    """Parse the messages and signals of a DBC file
+
+    The file is read line by line, so memory use does not depend on its size.
+    Only the sections needed for validation and scaling are parsed (BO_, SG_
+    and VAL_); everything else is skipped.
+
+    Args:
+        file_path: Path to the DBC file
+
+    Returns:
+        Dictionary mapping message names to MessageInfo
+    """
+    messages = {}
+    by_id = {}
+    message = None
+    with open(file_path, "r", encoding="cp1252", errors="replace") as f:
+        for line in _statements(f):
+            if line.startswith("BO_ "):
+                match = _MESSAGE_PATTERN.match(line)
+                if match is None:
+                    message = None
+                    continue
+                raw_id = int(match.group(1))
+                message = MessageInfo(raw_id & 0x1FFFFFFF, bool(raw_id & 0x80000000), match.group(2),
+                                      int(match.group(3)), match.group(4))
+                messages[message.name] = message
+                by_id[raw_id] = message
+            elif line.startswith("SG_ "):
+                match = _SIGNAL_PATTERN.match(line)
+                if match is None or message is None:
+                    continue
+                (name, multiplexer, start_bit, length, byte_order, sign, factor, offset,
+                 minimum, maximum, unit) = match.groups()
+                message.signals[name] = SignalInfo(
+                    name, int(start_bit), int(length), byte_order == "1", sign == "-",
+                    float(factor), float(offset), float(minimum), float(maximum), unit, multiplexer
+                )
+            elif line.startswith("VAL_ "):
+                match = _VALUE_TABLE_PATTERN.match(line)
+                if match is None:
+                    continue
+                target = by_id.get(int(match.group(1)))
+                signal = target.signals.get(match.group(2)) if target is not None else None
+                if signal is not None:
+                    signal.value_table = {int(value): text for value, text in _VALUE_PATTERN.findall(match.group(3))}
+            else:
+                # Any other statement ends the signal list of a message
+                message = None
+    return messages
+
+class SignalIndex:
+    """Signal metadata of the databases assigned to each bus and channel
+
+    Parsed databases are cached in the cache directory as marshalled tuples,
+    keyed by path and invalidated when the file's modification time or size
+    changes, so a database is only parsed again after it was edited.
+    """
+
+    def __init__(self, cache_directory: Optional[str] = None):
+        """Initialize an empty index
+
+        Args:
+            cache_directory: Directory for the parsed databases; defaults to utils.cache_dir()
+        """
+        self.cache_directory = cache_directory
+        self._channels = {}
+
+        # Counters
+        self.parsed = 0
+        self.cache_hits = 0
+
+    def _cache_path(self, path: str) -> str:
+        import hashlib
+
+        key = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_directory or cache_dir(), f"dbc_{key}.bin")
+
+    def _read(self, file_path: str) -> Dict[str, MessageInfo]:
+        """Load a database from the cache, parsing and caching it on a miss"""
+        path, mtime, size = file_fingerprint(file_path)
+        header = (CACHE_FORMAT, sys.version_info[:2], path, mtime, size)
+        cache_path = self._cache_path(path)
+        try:
+            with open(cache_path, "rb") as f:
+                cached_header, messages = marshal.load(f)
+            if cached_header == header:
+                self.cache_hits += 1
+                unpacked = (MessageInfo._unpack(message) for message in messages)
+                return {message.name: message for message in unpacked}
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        messages = parse_dbc(file_path)
+        self.parsed += 1
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temporary_path = cache_path + ".tmp"
+            with open(temporary_path, "wb") as f:
+                marshal.dump((header, tuple(message._pack() for message in messages.values())), f)
+            os.replace(temporary_path, cache_path)
+        except OSError:
+            pass
+        return messages
+
+    def add(self, file_path: str, bus: str, channel: int) -> bool:
+        """Add a database assigned to a bus and channel
+
+        Databases other than DBC files cannot be parsed and are not added.
+
+        Args:
+            file_path: Path to the database file
+            bus: The bus (CAN, LIN, FlexRay, etc.)
+            channel: The channel number
+
+        Returns:
+            True if the database was parsed into the index
+        """
+        if not file_path.lower().endswith(".dbc"):
+            return False
+        messages = self._read(file_path)
+        self._channels.setdefault((bus, channel), {})[normalize_path(file_path)] = messages
+        return True
+
+    def remove(self, file_path: str, channel: int) -> None:
+        """Remove a database from every bus of a channel
+
+        Args:
+            file_path: Path to the database file
+            channel: The channel number
+        """
+        path = normalize_path(file_path)
+        for key in [key for key in self._channels if key[1] == channel]:
+            databases = self._channels[key]
+            databases.pop(path, None)
+            if not databases:
+                del self._channels[key]
+
+    def indexed(self, bus: str, channel: int) -> bool:
+        """Whether any database of a channel is in the index"""
+        return (bus, channel) in self._channels
+
+    def covers(self, bus: str, channel: int, paths: Iterable[str]) -> bool:
+        """Whether the databases of a channel are all in the index
+
+        Args:
+            bus: The bus (CAN, LIN, FlexRay, etc.)
+            channel: The channel number
+            paths: Normalized paths of every database the configuration assigns to the channel
+
+        Returns:
+            True if at least one database is indexed and none of the paths is missing
+        """
+        databases = self._channels.get((bus, channel))
+        return bool(databases) and all(path in databases for path in paths)
+
+    def get_message(self, bus: str, channel: int, message: str) -> Optional[MessageInfo]:
+        """Get a message of a channel, or None if no indexed database defines it"""
+        for databases in self._channels.get((bus, channel), {}).values():
+            found = databases.get(message)
+            if found is not None:
+                return found
+        return None
+
+    def get_signal(self, bus: str, channel: int, message: str, signal: str) -> Optional[SignalInfo]:
+        """Get a signal of a channel, or None if no indexed database defines it"""
+        found = self.get_message(bus, channel, message)
+        return found.signals.get(signal) if found is not None else None
+
+    def clear(self) -> None:
+        """Forget all databases"""
+        self._channels.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of indexed channels, messages and signals and how they were loaded"""
+        messages = [m for databases in self._channels.values() for d in databases.values() for m in d.values()]
+        return {
+            "channels": len(self._channels),
+            "messages": len(messages),
+            "signals": sum(len(m.signals) for m in messages),
+            "parsed": self.parsed,
+            "cache_hits": self.cache_hits
+        }
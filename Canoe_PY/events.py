@@ -0,0 +1,95 @@
+"""
+Measurement event sources for the MyCANoe library
+"""
+
+import threading
+from typing import Callable, Optional
+
+from .utils import Deadline
+
+class MeasurementEventSource:
+    """Source of measurement start/stop notifications
+
+    The base class is driven through notify_started/notify_stopped, which makes it
+    usable as a fake event source in tests. Backends subclass it to feed it from
+    the CANoe Measurement events.
+    """
+
+    # Seconds between pump() calls while waiting for an event
+    pump_interval = 0.05
+
+    # Seconds between state probes while waiting, in case an event was missed
+    probe_interval = 0.25
+
+    def __init__(self):
+        self._started = threading.Event()
+        self._stopped = threading.Event()
+        
+        # Functions called when the measurement initializes, before it starts
+        self.init_callbacks = []
+
+    def arm(self) -> None:
+        """Clear pending notifications before triggering a measurement transition"""
+        self._started.clear()
+        self._stopped.clear()
+
+    def notify_init(self) -> None:
+        """Signal that the measurement is initializing and run the init callbacks"""
+        for callback in list(self.init_callbacks):
+            callback()
+    
+    def notify_started(self) -> None:
+        """Signal that the measurement has started"""
+        self._started.set()
+
+    def notify_stopped(self) -> None:
+        """Signal that the measurement has stopped"""
+        self._stopped.set()
+
+    def pump(self) -> None:
+        """Deliver pending notifications; nothing to do unless events need a message loop"""
+        pass
+
+    def wait_started(self, timeout: float, probe: Optional[Callable[[], bool]] = None) -> bool:
+        """Wait until the measurement has started
+
+        Args:
+            timeout: Maximum time to wait in seconds
+            probe: Optional function returning True once the measurement is running
+
+        Returns:
+            True if the measurement started, False on timeout
+        """
+        return self._wait(self._started, timeout, probe)
+
+    def wait_stopped(self, timeout: float, probe: Optional[Callable[[], bool]] = None) -> bool:
+        """Wait until the measurement has stopped
+
+        Args:
+            timeout: Maximum time to wait in seconds
+            probe: Optional function returning True once the measurement is stopped
+
+        Returns:
+            True if the measurement stopped, False on timeout
+        """
+        return self._wait(self._stopped, timeout, probe)
+
+    def _wait(self, event: threading.Event, timeout: float, probe: Optional[Callable[[], bool]]) -> bool:
+        deadline = Deadline(timeout)
+        next_probe = self.probe_interval
+        while True:
+            self.pump()
+            if event.is_set():
+                return True
+            if probe is not None and deadline.elapsed() >= next_probe:
+                if probe():
+                    return True
+                next_probe = deadline.elapsed() + self.probe_interval
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                return False
+            event.wait(min(remaining, self.pump_interval))
+
+    def close(self) -> None:
+        """Release the event subscription"""
+        pass
@@ -0,0 +1,306 @@
+"""
+COM apartment executor for the MyCANoe library
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .backends import CANoeBackend, get_backend
+from .core import MyCANoe, _as_predicate
+from .utils import ConditionResult, Deadline, wait_until
+
+# Queued item telling the executor thread to stop
+_STOP = object()
+
+class ComExecutor:
+    """Single apartment thread that owns COM objects and executes submitted calls
+
+    Calls are queued from any thread and executed in submission order. Whenever
+    the thread wakes up it takes everything that is queued (up to max_batch calls)
+    and runs it back-to-back before pumping COM messages, so bursts of calls from
+    several threads are served without a context switch per call. While idle the
+    thread pumps COM messages so events keep flowing.
+    """
+
+    def __init__(self, backend: Optional[CANoeBackend] = None, name: str = "ComExecutor",
+                 max_batch: int = 64, idle_interval: float = 0.05):
+        """Start the executor thread
+
+        Args:
+            backend: Backend whose messages are pumped while idle
+            name: Name of the executor thread
+            max_batch: Maximum number of calls executed between two message pumps
+            idle_interval: Seconds between message pumps while no calls are queued
+        """
+        self.backend = backend
+        self.max_batch = max_batch
+        self.idle_interval = idle_interval
+
+        # Counters
+        self.calls = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.queue_wait = 0.0
+
+        self._queue = queue.Queue()
+        self._shutdown = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "ComExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
+    def in_executor_thread(self) -> bool:
+        """Whether the caller is running on the executor thread"""
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue a call for the executor thread
+
+        Args:
+            fn: Function to call
+            args: Positional arguments of the function
+            kwargs: Keyword arguments of the function
+
+        Returns:
+            Future resolved with the result of the call
+        """
+        if self._shutdown:
+            raise RuntimeError("ComExecutor has been shut down")
+        future = Future()
+        self._queue.put((future, fn, args, kwargs, time.perf_counter()))
+        return future
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Call a function on the executor thread and wait for its result
+
+        Calls made from the executor thread itself run inline.
+
+        Returns:
+            The return value of the function
+        """
+        if self.in_executor_thread():
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    def submit_batch(self, calls: Sequence[Tuple[Callable, tuple]]) -> Future:
+        """Queue a sequence of calls that run back-to-back as one item
+
+        Args:
+            calls: List of (function, arguments) tuples
+
+        Returns:
+            Future resolved with the list of return values, in order
+        """
+        return self.submit(lambda: [fn(*args) for fn, args in calls])
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.idle_interval)]
+            except queue.Empty:
+                self._pump()
+                continue
+
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not self._execute(batch):
+                break
+            self._pump()
+
+        # Cancel whatever was queued after shutdown
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[0].cancel()
+
+    def _execute(self, batch: List) -> bool:
+        """Run a batch of queued calls; returns False once the stop item is reached"""
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for position, item in enumerate(batch):
+            if item is _STOP:
+                # Calls that raced with shutdown() into the same batch
+                for late in batch[position + 1:]:
+                    if late is not _STOP:
+                        late[0].cancel()
+                return False
+            future, fn, args, kwargs, queued_at = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            self.calls += 1
+            self.queue_wait += time.perf_counter() - queued_at
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        return True
+
+    def _pump(self) -> None:
+        if self.backend is not None:
+            try:
+                self.backend.pump()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the executor counters
+
+        Returns:
+            Dictionary with executed calls, batches, the largest batch, queued
+            calls and the average time calls waited in the queue in seconds
+        """
+        return {
+            "calls": self.calls,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize(),
+            "average_queue_wait": self.queue_wait / self.calls if self.calls else 0.0
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the executor after the calls queued so far have run
+
+        Args:
+            wait: Whether to wait for the thread to finish
+        """
+        if not self._shutdown:
+            self._shutdown = True
+            self._queue.put(_STOP)
+        if wait and not self.in_executor_thread():
+            self._thread.join()
+
+class SharedCANoe:
+    """Thread-safe proxy to a MyCANoe instance owned by a ComExecutor
+
+    The MyCANoe instance is created on the executor thread, and every method
+    called through the proxy is marshalled to that thread, so any number of
+    Python threads can share one connection to CANoe.
+    """
+
+    def __init__(self, executor: Optional[ComExecutor] = None, **kwargs):
+        """Initialize the proxy
+
+        Args:
+            executor: Executor owning the instance; a new one is started if None
+            kwargs: Arguments passed to the MyCANoe constructor
+        """
+        kwargs["backend"] = get_backend(kwargs.get("backend"))
+        self._owns_executor = executor is None
+        self.executor = executor or ComExecutor(kwargs["backend"], name="SharedCANoe")
+        try:
+            self.canoe = self.executor.call(MyCANoe, **kwargs)
+        except Exception:
+            if self._owns_executor:
+                self.executor.shutdown()
+            raise
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("canoe", "executor"):
+            raise AttributeError(name)
+        attribute = getattr(self.canoe, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            return self.executor.call(attribute, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = attribute.__doc__
+        return call
+
+    def __enter__(self) -> "SharedCANoe":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def submit(self, name: str, *args, **kwargs) -> Future:
+        """Queue a MyCANoe method call without waiting for it
+
+        Args:
+            name: Name of the MyCANoe method
+            args: Positional arguments of the method
+            kwargs: Keyword arguments of the method
+
+        Returns:
+            Future resolved with the return value of the method
+        """
+        return self.executor.submit(getattr(self.canoe, name), *args, **kwargs)
+
+    def batch(self, calls: Sequence[Tuple[str, tuple]]) -> List[Any]:
+        """Run several MyCANoe method calls back-to-back on the executor thread
+
+        Args:
+            calls: List of (method name, arguments) tuples
+
+        Returns:
+            List of return values, in order
+        """
+        resolved = [(getattr(self.canoe, name), tuple(args)) for name, args in calls]
+        return self.executor.submit_batch(resolved).result()
+
+    def wait_for_values(self, predicate: Callable[[Dict[Any, Any]], bool],
+                        signals: Sequence[Tuple[str, int, str, str]] = (), system_variables: Sequence[str] = (),
+                        timeout: Optional[float] = 5.0, raw_value=False, interval: float = 0.001) -> ConditionResult:
+        """Wait until a condition over several signals and system variables is met
+
+        The wait runs on the calling thread: handles are resolved once and every
+        check marshals a single read of all values, so calls from other threads run
+        between two checks instead of queuing behind the whole wait.
+
+        Returns:
+            ConditionResult like MyCANoe.wait_for_values()
+        """
+        signals = [tuple(spec) for spec in signals]
+        try:
+            readers = self.executor.call(self.canoe._get_value_readers, signals, system_variables, raw_value)
+            last = {}
+
+            def check():
+                values = self.executor.call(MyCANoe._read_values, readers)
+                last["timestamp"] = time.time()
+                last["values"] = values
+                return predicate(values)
+
+            result = wait_until(check, None, interval=interval, deadline=Deadline(timeout))
+            return ConditionResult(result.met, result.polls, result.elapsed, last["values"],
+                                   last["timestamp"] if result.met else None)
+        except Exception as e:
+            raise self.executor.call(self.canoe._condition_error, signals, system_variables, e)
+
+    def wait_for_signal(self, spec: Tuple[str, int, str, str], predicate: Any, timeout: Optional[float] = 5.0,
+                        raw_value=False, interval: float = 0.001) -> ConditionResult:
+        """Wait until the value of a signal satisfies a condition, see wait_for_values()"""
+        spec = tuple(spec)
+        predicate = _as_predicate(predicate)
+        return self.wait_for_values(lambda values: predicate(values[spec]), signals=[spec], timeout=timeout,
+                                    raw_value=raw_value, interval=interval)
+
+    def wait_for_system_variable(self, sys_var_name: str, predicate: Any, timeout: Optional[float] = 5.0,
+                                 interval: float = 0.001) -> ConditionResult:
+        """Wait until the value of a system variable satisfies a condition, see wait_for_values()"""
+        predicate = _as_predicate(predicate)
+        return self.wait_for_values(lambda values: predicate(values[sys_var_name]),
+                                    system_variables=[sys_var_name], timeout=timeout, interval=interval)
+
+    def close(self) -> None:
+        """Clean up the MyCANoe instance and stop the executor if this proxy started it"""
+        self.executor.call(self.canoe.close)
+        if self._owns_executor:
+            self.executor.shutdown()
@@ -0,0 +1,527 @@
+"""
+Pool of warm MyCANoe sessions shared between test workers
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing.managers import BaseManager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .backends import CANoeBackend
+from .exceptions import MyCANoeException, ConnectionError
+from .executor import SharedCANoe
+from .utils import setup_logger, Deadline
+
+# Placeholder for a pool slot whose session is being created
+_CREATING = object()
+
+class PooledSession:
+    """A connected MyCANoe session owned by a SessionPool
+
+    MyCANoe methods can be called directly on the session; they are marshalled
+    to the session's COM thread.
+    """
+
+    def __init__(self, session_id: int, canoe: SharedCANoe, slot: int = 0):
+        self.id = session_id
+        self.canoe = canoe
+        self.slot = slot
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.checked_out_at = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "canoe":
+            raise AttributeError(name)
+        return getattr(self.canoe, name)
+
+    def __repr__(self) -> str:
+        return f"PooledSession(id={self.id}, uses={self.uses})"
+
+class SessionPool:
+    """Keeps connected, configuration-loaded MyCANoe sessions ready for reuse
+
+    Every session runs on its own ComExecutor thread and occupies one of size
+    slots. Sessions are health-checked with one COM round-trip when they are
+    checked out and are replaced, in the same slot, when the check fails or after
+    max_uses checkouts.
+
+    Plain COM dispatch attaches to the one running CANoe, so sessions created with
+    the default backend would share a single measurement and configuration; only
+    size=1 is allowed then. For larger pools pass a launcher that binds each slot
+    to its own CANoe instance, e.g. ``lambda slot: ComBackend(machine=HOSTS[slot])``.
+    """
+
+    # Seconds between attempts to create the session of an empty slot while checking out
+    retry_interval = 1.0
+
+    def __init__(self, size: int = 1, config_path: Optional[str] = None,
+                 backend_factory: Optional[Callable[[], CANoeBackend]] = None, max_uses: Optional[int] = None,
+                 lease_timeout: Optional[float] = None, health_check_timeout: float = 5.0,
+                 stop_measurement_on_checkin=True, launcher: Optional[Callable[[int], CANoeBackend]] = None,
+                 **canoe_kwargs):
+        """Create the pool and connect its sessions
+
+        Args:
+            size: Number of sessions kept in the pool
+            config_path: Configuration opened in every session, or None to keep the loaded one
+            backend_factory: Function returning the backend of a new session; every backend it
+                returns must reach a separate CANoe instance
+            max_uses: Number of checkouts after which a session is replaced, or None for no limit
+            lease_timeout: Seconds after which a session that was not checked in is reclaimed
+            health_check_timeout: Maximum time a session may take to answer the health check
+            stop_measurement_on_checkin: Whether a running measurement is stopped on checkin
+            launcher: Function called with the slot number (0 to size - 1) that starts or
+                attaches to the CANoe instance of that slot and returns its backend; also
+                called when the session of the slot is replaced
+            canoe_kwargs: Arguments passed to the MyCANoe constructor
+        """
+        if size <= 0:
+            raise MyCANoeException("Pool size must be positive")
+        if size > 1 and launcher is None and backend_factory is None:
+            raise MyCANoeException("COM dispatch attaches every session to the same CANoe instance; "
+                                   "pass a launcher to pool more than one session")
+
+        self.logger = setup_logger("SessionPool", canoe_kwargs.get("log_level", logging.INFO))
+        self.size = size
+        self.config_path = config_path
+        self.backend_factory = backend_factory
+        self.launcher = launcher
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self.health_check_timeout = health_check_timeout
+        self.stop_measurement_on_checkin = stop_measurement_on_checkin
+        self.canoe_kwargs = canoe_kwargs
+
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+        self._idle = deque()
+        self._in_use = {}
+        # Session of every slot, _CREATING while it is created, None when its creation failed
+        self._slots = [None] * size
+        self._closed = False
+        self._started_at = time.monotonic()
+
+        # Counters
+        self.created = 0
+        self.recycled = 0
+        self.health_check_failures = 0
+        self.reclaimed = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checkout_wait = 0.0
+        self.max_checkout_wait = 0.0
+        self.busy_time = 0.0
+
+        try:
+            for slot in range(size):
+                session = self._slots[slot] = self._create(slot)
+                self._idle.append(session)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _create(self, slot: int) -> PooledSession:
+        """Connect a new session for a slot and load the configuration; never called with the condition held"""
+        kwargs = dict(self.canoe_kwargs)
+        try:
+            if self.launcher is not None:
+                kwargs["backend"] = self.launcher(slot)
+            elif self.backend_factory is not None:
+                kwargs["backend"] = self.backend_factory()
+            canoe = SharedCANoe(**kwargs)
+        except Exception as e:
+            self.logger.error(f"Failed to create CANoe session: {str(e)}")
+            raise ConnectionError(f"Failed to create CANoe session: {str(e)}")
+
+        try:
+            canoe.connect()
+            if self.config_path:
+                canoe.open(self.config_path)
+            else:
+                canoe._initialize_objects()
+        except Exception as e:
+            self._discard(canoe)
+            self.logger.error(f"Failed to create CANoe session: {str(e)}")
+            raise ConnectionError(f"Failed to create CANoe session: {str(e)}")
+
+        self.created += 1
+        session = PooledSession(next(self._ids), canoe, slot)
+        self.logger.debug("Created session %d in slot %d", session.id, slot)
+        return session
+
+    def _discard(self, canoe: SharedCANoe) -> None:
+        """Close a session without waiting on a COM thread that may be hung"""
+        try:
+            canoe.executor.submit(canoe.canoe.close)
+            canoe.executor.shutdown(wait=False)
+        except Exception:
+            pass
+
+    def _recycle(self, session: PooledSession) -> None:
+        """Replace a session by a new one in the same slot"""
+        self._discard(session.canoe)
+        self.recycled += 1
+        self.logger.debug("Recycled session %d after %d uses", session.id, session.uses)
+        try:
+            replacement = self._create(session.slot)
+        except Exception:
+            replacement = None
+        self._fill(session.slot, replacement)
+
+    def _fill(self, slot: int, session: Optional[PooledSession]) -> None:
+        """Put a new session into its slot, or mark the slot empty if it could not be created"""
+        with self._condition:
+            if self._closed and session is not None:
+                self._discard(session.canoe)
+                return
+            # An empty slot is created again by a later checkout
+            self._slots[slot] = session
+            if session is not None:
+                self._idle.append(session)
+            self._condition.notify()
+
+    def _healthy(self, session: PooledSession) -> bool:
+        try:
+            canoe = session.canoe.canoe
+            session.canoe.executor.submit(lambda: canoe.app.Version).result(self.health_check_timeout)
+            return True
+        except Exception as e:
+            self.health_check_failures += 1
+            self.logger.warning("Session %d failed the health check: %s", session.id, e)
+            return False
+
+    def _reclaim_expired(self) -> None:
+        """Recycle sessions whose lease ran out; called with the condition held"""
+        if self.lease_timeout is None:
+            return
+        now = time.monotonic()
+        expired = [s for s in self._in_use.values() if now - s.checked_out_at > self.lease_timeout]
+        for session in expired:
+            del self._in_use[session.id]
+            self.reclaimed += 1
+            threading.Thread(target=self._recycle, args=(session,), daemon=True).start()
+
+    def _refill(self) -> bool:
+        """Create the sessions of empty slots; called without the condition held
+
+        Returns:
+            True if at least one session was created
+        """
+        with self._condition:
+            slots = [slot for slot, session in enumerate(self._slots) if session is None]
+            for slot in slots:
+                self._slots[slot] = _CREATING
+        created = False
+        for slot in slots:
+            try:
+                session = self._create(slot)
+                created = True
+            except Exception:
+                session = None
+            self._fill(slot, session)
+        return created
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledSession:
+        """Take a healthy session out of the pool
+
+        Args:
+            timeout: Maximum time to wait for a free session in seconds, or None to wait forever
+
+        Returns:
+            The session; give it back with checkin()
+        """
+        start_time = time.monotonic()
+        deadline = Deadline(timeout)
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise MyCANoeException("Session pool is closed")
+                self._reclaim_expired()
+                session = None
+                if self._idle:
+                    session = self._idle.popleft()
+                    session.checked_out_at = time.monotonic()
+                    self._in_use[session.id] = session
+                else:
+                    remaining = deadline.remaining()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise MyCANoeException(f"No CANoe session available within {timeout} seconds")
+                    if None not in self._slots:
+                        self._condition.wait(None if timeout is None else remaining)
+                        continue
+
+            if session is None:
+                # Connecting and loading the configuration can take long, so it runs unlocked
+                if not self._refill():
+                    with self._condition:
+                        self._condition.wait(min(self.retry_interval, deadline.remaining()))
+                continue
+
+            if self._healthy(session):
+                break
+            with self._condition:
+                self._in_use.pop(session.id, None)
+            self._recycle(session)
+
+        waited = time.monotonic() - start_time
+        with self._condition:
+            self.checkouts += 1
+            self.checkout_wait += waited
+            self.max_checkout_wait = max(self.max_checkout_wait, waited)
+        self.logger.debug("Checked out session %d after %.3f s", session.id, waited)
+        return session
+
+    def checkin(self, session: PooledSession) -> None:
+        """Return a session to the pool
+
+        Args:
+            session: Session returned by checkout()
+        """
+        with self._condition:
+            if self._in_use.pop(session.id, None) is None:
+                return
+            self.busy_time += time.monotonic() - session.checked_out_at
+            session.uses += 1
+            session.checked_out_at = None
+
+        recycle = self._closed or (self.max_uses is not None and session.uses >= self.max_uses)
+        if not recycle and self.stop_measurement_on_checkin:
+            try:
+                if session.is_measurement_running():
+                    session.stop_measurement()
+            except Exception:
+                recycle = True
+
+        if self._closed:
+            self._discard(session.canoe)
+        elif recycle:
+            self._recycle(session)
+        else:
+            with self._condition:
+                self._idle.append(session)
+                self._condition.notify()
+        self.logger.debug("Checked in session %d", session.id)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Check out a session for the duration of a with block
+
+        Args:
+            timeout: Maximum time to wait for a free session in seconds
+        """
+        session = self.checkout(timeout)
+        try:
+            yield session
+        finally:
+            self.checkin(session)
+
+    def get(self, session_id: int) -> PooledSession:
+        """Get a checked-out session by its id"""
+        with self._condition:
+            try:
+                return self._in_use[session_id]
+            except KeyError:
+                raise MyCANoeException(f"Session {session_id} is not checked out")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get utilization and checkout latency counters
+
+        Returns:
+            Dictionary with session counts, checkouts, timeouts, created, recycled
+            and reclaimed sessions, health check failures, average and maximum
+            checkout wait in seconds and the share of session time spent checked out
+        """
+        with self._condition:
+            age = time.monotonic() - self._started_at
+            busy = self.busy_time + sum(time.monotonic() - s.checked_out_at for s in self._in_use.values())
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "created": self.created,
+                "recycled": self.recycled,
+                "reclaimed": self.reclaimed,
+                "health_check_failures": self.health_check_failures,
+                "average_checkout_wait": self.checkout_wait / self.checkouts if self.checkouts else 0.0,
+                "max_checkout_wait": self.max_checkout_wait,
+                "utilization": busy / (age * self.size) if age > 0 else 0.0
+            }
+
+    def close(self) -> None:
+        """Close all sessions; sessions still checked out are closed on checkin"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._condition.notify_all()
+        for session in idle:
+            self._discard(session.canoe)
+
+class _BrokerService:
+    """Pool operations exposed to broker clients; sessions are referred to by id"""
+
+    def __init__(self, pool: SessionPool):
+        self.pool = pool
+
+    def checkout(self, timeout: Optional[float] = None) -> int:
+        return self.pool.checkout(timeout).id
+
+    def checkin(self, session_id: int) -> None:
+        self.pool.checkin(self.pool.get(session_id))
+
+    def call(self, session_id: int, name: str, args: tuple, kwargs: dict) -> Any:
+        if name.startswith("__"):
+            raise MyCANoeException(f"Method not available: {name}")
+        return getattr(self.pool.get(session_id), name)(*args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.pool.stats()
+
+class _BrokerClientManager(BaseManager):
+    pass
+
+_BrokerClientManager.register("broker")
+
+class SessionBroker:
+    """Serves a SessionPool to other processes over a local multiprocessing connection
+
+    Workers connect with BrokerClient, check sessions out and call MyCANoe methods
+    on them; the calls run in this process on the session's COM thread.
+    """
+
+    def __init__(self, pool: SessionPool, address: Tuple[str, int] = ("127.0.0.1", 0),
+                 authkey: Optional[bytes] = None):
+        """Initialize the broker
+
+        Args:
+            pool: Pool whose sessions are handed out
+            address: Address to listen on; port 0 picks a free port
+            authkey: Key clients must present; defaults to the process authkey,
+                which child processes inherit
+        """
+        self.pool = pool
+        self.address = address
+        self.authkey = authkey
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "SessionBroker":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def start(self) -> Tuple[str, int]:
+        """Start serving on a background thread
+
+        Returns:
+            The address clients connect to
+        """
+        service = _BrokerService(self.pool)
+
+        class _BrokerServerManager(BaseManager):
+            pass
+
+        _BrokerServerManager.register("broker", callable=lambda: service)
+        self._server = _BrokerServerManager(address=self.address, authkey=self.authkey).get_server()
+        self.address = self._server.address
+        self._thread = threading.Thread(target=self._serve, args=(self._server,), name="SessionBroker", daemon=True)
+        self._thread.start()
+        return self.address
+
+    @staticmethod
+    def _serve(server: Any) -> None:
+        try:
+            server.serve_forever()
+        except SystemExit:
+            # serve_forever() ends with sys.exit(), which only ends this thread
+            pass
+
+    def close(self) -> None:
+        """Stop accepting clients"""
+        if self._server is not None:
+            self._server.stop_event.set()
+            self._server.listener.close()
+            self._server = None
+
+class RemoteSession:
+    """Session checked out from a SessionBroker
+
+    MyCANoe methods called on it are executed by the broker process.
+    """
+
+    def __init__(self, client: "BrokerClient", session_id: int):
+        self.client = client
+        self.id = session_id
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("client", "id") or name.startswith("__"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self.client._service.call(self.id, name, args, kwargs)
+
+        call.__name__ = name
+        return call
+
+    def __repr__(self) -> str:
+        return f"RemoteSession(id={self.id})"
+
+class BrokerClient:
+    """Connection of a worker process to a SessionBroker"""
+
+    def __init__(self, address: Tuple[str, int], authkey: Optional[bytes] = None):
+        """Connect to the broker
+
+        Args:
+            address: Address returned by SessionBroker.start()
+            authkey: Key of the broker; defaults to the process authkey
+        """
+        try:
+            manager = _BrokerClientManager(address=tuple(address), authkey=authkey)
+            manager.connect()
+            self._service = manager.broker()
+        except Exception as e:
+            raise ConnectionError(f"Failed to connect to session broker: {str(e)}")
+
+    def checkout(self, timeout: Optional[float] = None) -> RemoteSession:
+        """Take a session out of the broker's pool
+
+        Args:
+            timeout: Maximum time to wait for a free session in seconds
+
+        Returns:
+            The session; give it back with checkin()
+        """
+        return RemoteSession(self, self._service.checkout(timeout))
+
+    def checkin(self, session: RemoteSession) -> None:
+        """Return a session to the broker's pool"""
+        self._service.checkin(session.id)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Check out a session for the duration of a with block"""
+        session = self.checkout(timeout)
+        try:
+            yield session
+        finally:
+            self.checkin(session)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the counters of the broker's pool"""
+        return self._service.stats()
@@ -0,0 +1,229 @@
+"""
+Background signal sampling for the MyCANoe library
+"""
+
+import time
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .core import MyCANoe, _split_system_variable_name
+from .exceptions import MyCANoeException
+from .utils import import_numpy
+
+class SignalSampler:
+    """Samples signals and system variables at a fixed rate into a ring buffer
+
+    Sampling runs on a dedicated thread that initializes its own COM apartment
+    and resolves its own handles, so it does not contend with the thread using
+    the MyCANoe instance. Every sample is one row of a preallocated NumPy array
+    holding the timestamp followed by one column per sampled value.
+    """
+
+    def __init__(self, canoe: MyCANoe, signals: Sequence[Tuple[str, int, str, str]] = (),
+                 system_variables: Sequence[str] = (), rate: float = 100.0, capacity: int = 10000,
+                 raw_value=False):
+        """Initialize the sampler
+
+        Args:
+            canoe: Connected MyCANoe instance whose backend is used for sampling
+            signals: List of (bus, channel, message, signal) tuples to sample
+            system_variables: List of full system variable names to sample
+            rate: Sampling rate in Hz
+            capacity: Number of samples kept in the ring buffer
+            raw_value: Whether to sample raw signal values (True) or physical values (False)
+        """
+        np = import_numpy()
+        if rate <= 0 or capacity <= 0:
+            raise MyCANoeException("Sampling rate and capacity must be positive")
+
+        self.canoe = canoe
+        self.logger = canoe.logger
+        self.signals = [tuple(spec) for spec in signals]
+        self.system_variables = list(system_variables)
+        self.rate = rate
+        self.capacity = capacity
+        self.raw_value = raw_value
+
+        # Column names: timestamp followed by the sampled values
+        self.columns = ["timestamp"] + [
+            f"{bus}{channel}::{message}::{signal}" for bus, channel, message, signal in self.signals
+        ] + self.system_variables
+
+        self._np = np
+        self._buffer = np.full((capacity, len(self.columns)), np.nan)
+        self._lock = threading.Lock()
+        self._write_index = 0
+        self._read_index = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # Counters
+        self.overruns = 0
+        self.missed_ticks = 0
+        self.errors = 0
+        self.error = None
+
+    def __enter__(self) -> "SignalSampler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampling thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling on the background thread"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="SignalSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop sampling and wait for the thread to finish
+
+        Args:
+            timeout: Maximum time to wait for the thread in seconds
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _resolve(self, app: Any) -> List[Tuple[Any, str]]:
+        """Resolve the sampled objects through this thread's application object"""
+        attribute = "RawValue" if self.raw_value else "Value"
+        readers = []
+        buses = {}
+        for bus, channel, message, signal in self.signals:
+            bus_obj = buses.get(bus)
+            if bus_obj is None:
+                bus_obj = buses[bus] = app.GetBus(bus)
+            readers.append((bus_obj.GetSignal(channel, message, signal), attribute))
+
+        system = app.System
+        for name in self.system_variables:
+            namespace, variable_name = _split_system_variable_name(name)
+            readers.append((system.Namespaces(namespace).Variables(variable_name), "Value"))
+        return readers
+
+    def _run(self) -> None:
+        backend = self.canoe.backend
+        backend.initialize()
+        try:
+            app = backend.dispatch()
+            readers = self._resolve(app)
+            generation = self.canoe._handle_generation
+            failing = False
+            period = 1.0 / self.rate
+            next_tick = time.perf_counter()
+            while not self._stop_event.is_set():
+                # Signal handles do not survive a measurement start or stop
+                if self.canoe._handle_generation != generation:
+                    generation = self.canoe._handle_generation
+                    readers = self._resolve(app)
+
+                timestamp = time.time()
+                try:
+                    values = [getattr(obj, attribute) for obj, attribute in readers]
+                except Exception as e:
+                    self.errors += 1
+                    try:
+                        # Handles invalidated outside the library, e.g. a restart from the CANoe GUI
+                        readers = self._resolve(app)
+                        values = [getattr(obj, attribute) for obj, attribute in readers]
+                    except Exception:
+                        values = None
+                        if not failing:
+                            self.logger.warning(f"Sampling failed, retrying every tick: {str(e)}")
+                        failing = True
+                if values is not None:
+                    try:
+                        self._store(timestamp, values)
+                    except (TypeError, ValueError) as e:
+                        # Values that do not fit a float column, e.g. strings or arrays
+                        values = None
+                        self.errors += 1
+                        if not failing:
+                            self.logger.warning(f"Sampled values are not numeric, retrying every tick: {str(e)}")
+                        failing = True
+                if values is not None and failing:
+                    self.logger.warning("Sampling works again")
+                    failing = False
+
+                next_tick += period
+                delay = next_tick - time.perf_counter()
+                if delay < 0:
+                    # Skip the ticks we are too late for instead of bursting to catch up
+                    missed = int(-delay / period) + 1
+                    self.missed_ticks += missed
+                    next_tick += missed * period
+                    delay = next_tick - time.perf_counter()
+                self._stop_event.wait(delay)
+        except Exception as e:
+            self.error = e
+            self.logger.error(f"Signal sampler stopped: {str(e)}")
+        finally:
+            backend.uninitialize()
+
+    def _store(self, timestamp: float, values: List[Any]) -> None:
+        with self._lock:
+            row = self._buffer[self._write_index % self.capacity]
+            row[0] = timestamp
+            row[1:] = values
+            self._write_index += 1
+            if self._write_index - self._read_index > self.capacity:
+                self.overruns += 1
+                self._read_index = self._write_index - self.capacity
+
+    def _rows(self, start: int, stop: int) -> Any:
+        indices = self._np.arange(start, stop) % self.capacity
+        return self._buffer[indices]
+
+    def snapshot(self, count: Optional[int] = None) -> Any:
+        """Get a copy of the most recent samples without consuming them
+
+        Args:
+            count: Number of samples, or None for all samples in the buffer
+
+        Returns:
+            NumPy array with one row per sample, oldest first
+        """
+        with self._lock:
+            available = min(self._write_index, self.capacity)
+            count = available if count is None else min(count, available)
+            return self._rows(self._write_index - count, self._write_index)
+
+    def drain(self) -> Any:
+        """Get the samples recorded since the previous drain and consume them
+
+        Returns:
+            NumPy array with one row per sample, oldest first
+        """
+        with self._lock:
+            rows = self._rows(self._read_index, self._write_index)
+            self._read_index = self._write_index
+            return rows
+
+    def stats(self) -> Dict[str, Union[int, bool]]:
+        """Get the sampler counters
+
+        Returns:
+            Dictionary with the number of samples taken, buffered and pending,
+            overruns, missed ticks and sampling errors
+        """
+        with self._lock:
+            return {
+                "running": self.running,
+                "samples": self._write_index,
+                "buffered": min(self._write_index, self.capacity),
+                "pending": self._write_index - self._read_index,
+                "overruns": self.overruns,
+                "missed_ticks": self.missed_ticks,
+                "errors": self.errors
+            }
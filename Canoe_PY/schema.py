@@ -0,0 +1,167 @@
+"""
+System variable type schema for the MyCANoe library
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+# CANoe system variable types as reported by Variable.Type
+TYPE_INT = 0
+TYPE_FLOAT = 1
+TYPE_STRING = 2
+TYPE_FLOAT_ARRAY = 4
+TYPE_INT_ARRAY = 5
+TYPE_LONGLONG = 6
+TYPE_DATA = 7
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, str) and value.startswith("0x"):
+        # Handle hex strings
+        return int(value, 16)
+    return int(value)
+
+def _unchanged(value: Any) -> Any:
+    return value
+
+# Coercion applied to values written to a variable of each type
+COERCIONS = {
+    TYPE_INT: _to_int,
+    TYPE_LONGLONG: _to_int,
+    TYPE_FLOAT: float,
+    TYPE_STRING: str,
+    TYPE_FLOAT_ARRAY: _unchanged,
+    TYPE_INT_ARRAY: _unchanged,
+    TYPE_DATA: _unchanged,
+}
+
+# NumPy dtype used when reading each array type
+ARRAY_DTYPES = {
+    TYPE_FLOAT_ARRAY: "float64",
+    TYPE_INT_ARRAY: "int32",
+    TYPE_DATA: "uint8",
+}
+
+def as_sequence(values: Any) -> Sequence:
+    """Convert array-like input to a flat sequence without a Python-level loop
+
+    NumPy arrays, array.array and memoryview objects are converted with their
+    C-implemented tolist(); bytes and bytearray are used as they are.
+
+    Args:
+        values: Tuple, list, NumPy array, bytes, bytearray, memoryview or array.array
+
+    Returns:
+        A sequence supporting len() and slicing
+    """
+    if isinstance(values, (bytes, bytearray, tuple, list)):
+        return values
+    ravel = getattr(values, "ravel", None)
+    if ravel is not None:
+        values = ravel()
+    tolist = getattr(values, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    return tuple(values)
+
+def infer_type(value: Any) -> Optional[int]:
+    """Infer the CANoe variable type from a value read through COM
+
+    Args:
+        value: Current value of the variable
+
+    Returns:
+        The type code, or None if the type is not recognized
+    """
+    if isinstance(value, int):
+        return TYPE_INT
+    if isinstance(value, float):
+        return TYPE_FLOAT
+    if isinstance(value, str):
+        return TYPE_STRING
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return TYPE_DATA
+    if isinstance(value, (tuple, list)):
+        if any(isinstance(item, float) for item in value):
+            return TYPE_FLOAT_ARRAY
+        return TYPE_INT_ARRAY
+    return None
+
+class VariableSchema:
+    """Learned type of a system variable with its precompiled coercion"""
+
+    __slots__ = ("type_code", "coerce", "length")
+
+    def __init__(self, type_code: Optional[int], length: Optional[int] = None):
+        self.type_code = type_code
+        self.coerce = COERCIONS.get(type_code, _unchanged)
+        self.length = length
+
+    def pack(self, values: Sequence) -> Any:
+        """Convert array values to the form written through COM
+
+        Args:
+            values: Sequence of array elements
+
+        Returns:
+            bytes for data variables, a tuple otherwise
+        """
+        if self.type_code == TYPE_DATA:
+            return bytes(values)
+        return tuple(values)
+
+    def __repr__(self) -> str:
+        return f"VariableSchema(type_code={self.type_code}, length={self.length})"
+
+class SchemaCache:
+    """Types of system variables, learned once per variable"""
+
+    def __init__(self):
+        self._entries = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def get(self, name: str, variable_obj: Any) -> VariableSchema:
+        """Get the schema of a variable, learning it on first access
+
+        The type is taken from the variable's Type property; if that is not
+        available or not recognized, the current value is read once instead.
+
+        Args:
+            name: Full name of the system variable
+            variable_obj: The COM variable object
+
+        Returns:
+            The variable schema
+        """
+        schema = self._entries.get(name)
+        if schema is None:
+            schema = self._entries[name] = self._learn(variable_obj)
+        return schema
+
+    def _learn(self, variable_obj: Any) -> VariableSchema:
+        try:
+            type_code = variable_obj.Type
+        except Exception:
+            type_code = None
+        length = None
+        if type_code not in COERCIONS:
+            value = variable_obj.Value
+            type_code = infer_type(value)
+            if type_code in ARRAY_DTYPES:
+                length = len(value)
+        return VariableSchema(type_code, length)
+
+    def refresh(self, name: Optional[str] = None) -> None:
+        """Forget learned types so they are learned again on next access
+
+        Args:
+            name: Full name of a single system variable, or None for all
+        """
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def entries(self) -> Dict[str, VariableSchema]:
+        """Get a copy of all learned schemas keyed by variable name"""
+        return dict(self._entries)
@@ -0,0 +1,346 @@
+"""
+Value change subscriptions for the MyCANoe library
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .core import _split_system_variable_name
+
+class Subscription:
+    """A callback registered for the value changes of one signal or system variable
+
+    At most one call of the callback is in flight at a time. Changes that arrive
+    while it runs, or sooner than min_interval after the previous call, are
+    coalesced: only the latest value is delivered once the callback is free again.
+    """
+
+    def __init__(self, manager: "SubscriptionManager", kind: str, key: Any, name: str,
+                 callback: Callable[[str, Any, float], None], min_interval: float, attribute: str):
+        self.manager = manager
+        self.kind = kind
+        self.key = key
+        self.name = name
+        self.callback = callback
+        self.min_interval = min_interval
+        self.attribute = attribute
+        self.active = True
+
+        # Counters
+        self.changes = 0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.errors = 0
+
+        self._lock = threading.Lock()
+        self._in_flight = False
+        self._pending = None
+        self._last_dispatch = float("-inf")
+
+    def cancel(self) -> None:
+        """Stop delivering changes to the callback"""
+        self.manager.unsubscribe(self)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the counters of this subscription
+
+        Returns:
+            Dictionary with detected changes, delivered callbacks, coalesced
+            changes and callback errors
+        """
+        return {
+            "changes": self.changes,
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "errors": self.errors
+        }
+
+    def __repr__(self) -> str:
+        return f"Subscription({self.name!r}, active={self.active})"
+
+class SubscriptionManager:
+    """Detects value changes and dispatches them to subscription callbacks
+
+    Detection runs on a watcher thread with its own COM apartment and handles.
+    System variables are watched through the backend's change events when it
+    supports them; everything else is read in one pass per poll interval. Polled
+    handles are resolved again after a measurement start or stop made through the
+    MyCANoe instance, and whenever reading them fails. Callbacks run on a small
+    worker pool so a slow callback never delays detection.
+    """
+
+    def __init__(self, canoe: Any, poll_interval: float = 0.01, max_workers: int = 4):
+        """Initialize the manager
+
+        Args:
+            canoe: MyCANoe instance whose backend is used for watching
+            poll_interval: Seconds between two reads of the polled values
+            max_workers: Number of threads running callbacks
+        """
+        self.canoe = canoe
+        self.logger = canoe.logger
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._subscriptions = []
+        self._added = []
+        self._removed = []
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._workers = None
+
+        # Counters
+        self.polls = 0
+        self.poll_errors = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the watcher thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, kind: str, key: Any, name: str, callback: Callable[[str, Any, float], None],
+                  min_interval: float = 0.0, attribute: str = "Value") -> Subscription:
+        """Register a callback and start the watcher thread if needed
+
+        Args:
+            kind: "signal" for a (bus, channel, message, signal) key or "system_variable"
+                for a full system variable name
+            key: Signal spec or system variable name
+            name: Name passed to the callback
+            callback: Function called with (name, value, timestamp) on every change
+            min_interval: Minimum seconds between two calls of the callback
+            attribute: Property of the COM object that is watched
+
+        Returns:
+            The subscription
+        """
+        subscription = Subscription(self, kind, key, name, callback, min_interval, attribute)
+        with self._lock:
+            self._added.append(subscription)
+            if self._workers is None:
+                self._workers = ThreadPoolExecutor(self.max_workers, thread_name_prefix="CANoeCallback")
+            if not self.running:
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name="SubscriptionWatcher", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering changes to a subscription
+
+        Args:
+            subscription: Subscription returned by subscribe()
+        """
+        with self._lock:
+            subscription.active = False
+            self._removed.append(subscription)
+
+    def subscriptions(self) -> List[Subscription]:
+        """Get the active subscriptions"""
+        with self._lock:
+            return [s for s in self._subscriptions + self._added if s.active]
+
+    def _resolve(self, app: Any, subscription: Subscription) -> Any:
+        if subscription.kind == "signal":
+            bus, channel, message, signal = subscription.key
+            return app.GetBus(bus).GetSignal(channel, message, signal)
+        namespace, variable_name = _split_system_variable_name(subscription.key)
+        return app.System.Namespaces(namespace).Variables(variable_name)
+
+    def _attach(self, app: Any, watches: Dict[Tuple, List], subscription: Subscription) -> None:
+        """Start watching a new subscription, sharing the watch of the same value"""
+        watch_key = (subscription.kind, subscription.key, subscription.attribute)
+        watch = watches.get(watch_key)
+        if watch is None:
+            obj = self._resolve(app, subscription)
+            value = getattr(obj, subscription.attribute)
+            # [handle, last value, subscriptions, change events, failing]
+            watch = watches[watch_key] = [obj, value, [], None, False]
+            if subscription.kind == "system_variable":
+                try:
+                    watch[3] = self.canoe.backend.variable_events(
+                        obj, lambda new_value, watch=watch: self._update(watch, new_value, time.time())
+                    )
+                except NotImplementedError:
+                    pass
+        watch[2].append(subscription)
+        self._subscriptions.append(subscription)
+
+    def _detach(self, watches: Dict[Tuple, List], subscription: Subscription) -> None:
+        watch_key = (subscription.kind, subscription.key, subscription.attribute)
+        watch = watches.get(watch_key)
+        if watch is not None and subscription in watch[2]:
+            watch[2].remove(subscription)
+            if not watch[2]:
+                if watch[3] is not None:
+                    watch[3].close()
+                del watches[watch_key]
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def _update(self, watch: List, value: Any, timestamp: float) -> None:
+        """Record a new value of a watch and notify its subscriptions if it changed"""
+        if value == watch[1]:
+            return
+        watch[1] = value
+        for subscription in list(watch[2]):
+            self._changed(subscription, value, timestamp)
+
+    def _poll(self, app: Any, watch: List, timestamp: float) -> None:
+        """Read a polled value, resolving its handle again once if the read fails"""
+        subscription = watch[2][0]
+        try:
+            value = getattr(watch[0], subscription.attribute)
+        except Exception as e:
+            self.poll_errors += 1
+            try:
+                watch[0] = self._resolve(app, subscription)
+                value = getattr(watch[0], subscription.attribute)
+            except Exception:
+                if not watch[4]:
+                    self.logger.warning(f"Failed to read {subscription.name}, retrying every poll: {str(e)}")
+                watch[4] = True
+                return
+        if watch[4]:
+            self.logger.warning(f"Reading {subscription.name} works again")
+            watch[4] = False
+        self._update(watch, value, timestamp)
+
+    def _run(self) -> None:
+        backend = self.canoe.backend
+        backend.initialize()
+        watches = {}
+        try:
+            app = backend.dispatch()
+            generation = self.canoe._handle_generation
+            next_tick = time.perf_counter()
+            while not self._stop_event.is_set():
+                with self._lock:
+                    added, self._added = self._added, []
+                    removed, self._removed = self._removed, []
+                for subscription in removed:
+                    self._detach(watches, subscription)
+                for subscription in added:
+                    if not subscription.active:
+                        continue
+                    try:
+                        self._attach(app, watches, subscription)
+                    except Exception as e:
+                        subscription.active = False
+                        subscription.errors += 1
+                        self.logger.error(f"Failed to watch {subscription.name}: {str(e)}")
+
+                # Signal handles do not survive a measurement start or stop
+                if self.canoe._handle_generation != generation:
+                    generation = self.canoe._handle_generation
+                    for watch in watches.values():
+                        if watch[2][0].kind == "signal":
+                            try:
+                                watch[0] = self._resolve(app, watch[2][0])
+                            except Exception as e:
+                                self.logger.warning(f"Failed to resolve {watch[2][0].name} again: {str(e)}")
+
+                backend.pump()
+                timestamp = time.time()
+                # One pass over every polled value
+                for watch in list(watches.values()):
+                    if watch[3] is None:
+                        self._poll(app, watch, timestamp)
+                self.polls += 1
+
+                self._flush()
+                next_tick = max(next_tick + self.poll_interval, time.perf_counter())
+                self._stop_event.wait(next_tick - time.perf_counter())
+        except Exception as e:
+            self.logger.error(f"Subscription watcher stopped: {str(e)}")
+        finally:
+            for watch in watches.values():
+                if watch[3] is not None:
+                    watch[3].close()
+            backend.uninitialize()
+
+    def _changed(self, subscription: Subscription, value: Any, timestamp: float) -> None:
+        if not subscription.active:
+            return
+        with subscription._lock:
+            subscription.changes += 1
+            if subscription._pending is not None:
+                subscription.coalesced += 1
+            subscription._pending = (value, timestamp)
+        self._dispatch(subscription)
+
+    def _dispatch(self, subscription: Subscription) -> None:
+        """Hand the pending change of a subscription to a worker if it is due"""
+        with subscription._lock:
+            if subscription._in_flight or subscription._pending is None:
+                return
+            now = time.perf_counter()
+            if now - subscription._last_dispatch < subscription.min_interval:
+                # Delivered by a later _flush()
+                return
+            value, timestamp = subscription._pending
+            subscription._pending = None
+            subscription._in_flight = True
+            subscription._last_dispatch = now
+        try:
+            self._workers.submit(self._invoke, subscription, value, timestamp)
+        except RuntimeError:
+            # Worker pool already shut down
+            subscription._in_flight = False
+
+    def _invoke(self, subscription: Subscription, value: Any, timestamp: float) -> None:
+        try:
+            if subscription.active:
+                subscription.dispatched += 1
+                subscription.callback(subscription.name, value, timestamp)
+        except Exception as e:
+            subscription.errors += 1
+            self.logger.error(f"Subscription callback for {subscription.name} failed: {str(e)}")
+        finally:
+            with subscription._lock:
+                subscription._in_flight = False
+            self._dispatch(subscription)
+
+    def _flush(self) -> None:
+        """Deliver changes held back by min_interval"""
+        for subscription in self._subscriptions:
+            if subscription._pending is not None:
+                self._dispatch(subscription)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the manager counters
+
+        Returns:
+            Dictionary with active subscriptions, polls, poll errors and the summed
+            counters of all subscriptions
+        """
+        subscriptions = self.subscriptions()
+        totals = {"subscriptions": len(subscriptions), "polls": self.polls, "poll_errors": self.poll_errors,
+                  "changes": 0, "dispatched": 0, "coalesced": 0, "errors": 0}
+        for subscription in subscriptions:
+            for counter, value in subscription.stats().items():
+                totals[counter] += value
+        return totals
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the watcher thread and the callback workers
+
+        Args:
+            timeout: Maximum time to wait for the watcher thread in seconds
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            for subscription in self._subscriptions + self._added:
+                subscription.active = False
+            self._subscriptions = []
+            self._added = []
+            self._removed = []
+        if self._workers is not None:
+            self._workers.shutdown(wait=False)
+            self._workers = None
@@ -4,15 +4,26 @@ Utility functions for the MyCANoe library
 
 import os
 import time
+import atexit
 import logging
-from typing import Callable, Any
+from typing import Callable, Any, Dict, Optional, Tuple
 
-def setup_logger(name: str, level=logging.INFO) -> logging.Logger:
+from .exceptions import MyCANoeException
+
+# Background listeners of loggers set up with async_logging, keyed by logger name
+_log_listeners = {}
+
+def setup_logger(name: str, level=logging.INFO, async_logging: bool = False) -> logging.Logger:
     """Set up a logger with the given name and level
     
+    With async_logging the logger only puts records on a queue and a
+    QueueListener thread formats and writes them to the console, so logging
+    never blocks the calling (measurement) thread on console I/O.
+    
     Args:
         name: Logger name
         level: Logging level
+        async_logging: Whether to write log records from a background thread
         
     Returns:
         Configured logger
@@ -29,28 +40,167 @@ def setup_logger(name: str, level=logging.INFO) -> logging.Logger:
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
         
+        if async_logging:
+            import queue
+            from logging.handlers import QueueHandler, QueueListener
+            
+            # Hand records to a background listener through an unbounded queue
+            log_queue = queue.Queue()
+            listener = QueueListener(log_queue, handler, respect_handler_level=True)
+            listener.start()
+            _log_listeners[name] = listener
+            handler = QueueHandler(log_queue)
+            handler.setLevel(level)
+        
         # Add handler to logger
         logger.addHandler(handler)
     
     return logger
 
-def wait_until(condition: Callable[[], bool], timeout: float = 5.0, interval: float = 0.1) -> bool:
+def stop_async_logging() -> None:
+    """Flush and stop the background listeners started by setup_logger"""
+    while _log_listeners:
+        _, listener = _log_listeners.popitem()
+        listener.stop()
+
+atexit.register(stop_async_logging)
+
+class Deadline:
+    """Time budget on the monotonic clock that nested waits can share"""
+    
+    def __init__(self, timeout: Optional[float] = None):
+        """Start a new deadline
+        
+        Args:
+            timeout: Budget in seconds, or None for no limit
+        """
+        self.start_time = time.monotonic()
+        self.expires_at = None if timeout is None else self.start_time + timeout
+    
+    def remaining(self) -> float:
+        """Seconds left in the budget (never negative, infinite without limit)"""
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        """Whether the budget is used up"""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+    
+    def elapsed(self) -> float:
+        """Seconds since the deadline was started"""
+        return time.monotonic() - self.start_time
+    
+    def limit(self, timeout: Optional[float]) -> "Deadline":
+        """Get a deadline that expires after timeout seconds, but never later than this one
+        
+        Args:
+            timeout: Budget of the nested wait in seconds, or None to share this budget
+            
+        Returns:
+            The nested deadline
+        """
+        deadline = Deadline(timeout)
+        if self.expires_at is not None and (deadline.expires_at is None or self.expires_at < deadline.expires_at):
+            deadline.expires_at = self.expires_at
+        return deadline
+
+class WaitResult:
+    """Outcome of wait_until; truthy if the condition was met"""
+    
+    __slots__ = ("met", "polls", "elapsed")
+    
+    def __init__(self, met: bool, polls: int, elapsed: float):
+        self.met = met
+        self.polls = polls
+        self.elapsed = elapsed
+    
+    def __bool__(self) -> bool:
+        return self.met
+    
+    def __repr__(self) -> str:
+        return f"WaitResult(met={self.met}, polls={self.polls}, elapsed={self.elapsed:.6f})"
+
+class ConditionResult(WaitResult):
+    """Outcome of a wait for a condition over CANoe values; truthy if the condition was met"""
+    
+    __slots__ = ("values", "timestamp")
+    
+    def __init__(self, met: bool, polls: int, elapsed: float, values: Dict[Any, Any], timestamp: Optional[float]):
+        super().__init__(met, polls, elapsed)
+        self.values = values
+        self.timestamp = timestamp
+    
+    def __repr__(self) -> str:
+        return (f"ConditionResult(met={self.met}, polls={self.polls}, elapsed={self.elapsed:.6f}, "
+                f"timestamp={self.timestamp})")
+
+class TimingStats:
+    """Count, total, last and maximum duration of named operations"""
+    
+    def __init__(self):
+        self._entries = {}
+    
+    def record(self, name: str, seconds: float) -> None:
+        """Record one run of an operation
+        
+        Args:
+            name: Name of the operation
+            seconds: Time the operation took
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = {"count": 0, "total": 0.0, "last": 0.0, "max": 0.0}
+        entry["count"] += 1
+        entry["total"] += seconds
+        entry["last"] = seconds
+        entry["max"] = max(entry["max"], seconds)
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get a copy of the timings with the average added, keyed by operation name"""
+        return {
+            name: dict(entry, average=entry["total"] / entry["count"])
+            for name, entry in self._entries.items()
+        }
+    
+    def reset(self) -> None:
+        """Forget all recorded timings"""
+        self._entries.clear()
+
+def wait_until(condition: Callable[[], bool], timeout: Optional[float] = 5.0, interval: float = 0.1,
+               max_interval: Optional[float] = None, backoff: float = 1.0,
+               deadline: Optional[Deadline] = None) -> WaitResult:
     """Wait until a condition is true or timeout
     
+    The interval between checks starts at interval and is multiplied by backoff
+    after every unsuccessful check, up to max_interval. Timing uses the monotonic
+    clock, so wall-clock adjustments do not affect the timeout.
+    
     Args:
         condition: Function that returns True when condition is met
-        timeout: Maximum time to wait in seconds
-        interval: Time between checks in seconds
+        timeout: Maximum time to wait in seconds, or None to rely on deadline alone
+        interval: Initial time between checks in seconds
+        max_interval: Upper bound for the time between checks (defaults to interval when backoff is 1)
+        backoff: Factor applied to the interval after each unsuccessful check
+        deadline: Optional shared Deadline that also bounds this wait
         
     Returns:
-        True if condition was met, False if timeout
+        WaitResult that is truthy if the condition was met and records the number
+        of polls made and the time spent
     """
-    start_time = time.time()
-    while not condition():
-        if time.time() - start_time > timeout:
-            return False
-        time.sleep(interval)
-    return True
+    deadline = deadline.limit(timeout) if deadline is not None else Deadline(timeout)
+    max_interval = max_interval if max_interval is not None else float("inf")
+    
+    polls = 0
+    while True:
+        polls += 1
+        if condition():
+            return WaitResult(True, polls, deadline.elapsed())
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            return WaitResult(False, polls, deadline.elapsed())
+        time.sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
 
 def validate_file_path(file_path: str, extension: str = None) -> bool:
     """Validate that a file path exists and has the correct extension
@@ -70,6 +220,114 @@ def validate_file_path(file_path: str, extension: str = None) -> bool:
     
     return True
 
+def normalize_path(file_path: str) -> str:
+    """Normalize a file path so that different spellings of the same file compare equal
+    
+    Args:
+        file_path: Path to normalize
+        
+    Returns:
+        Absolute path with the case and separators normalized for the platform
+    """
+    return os.path.normcase(os.path.abspath(file_path))
+
+def file_fingerprint(file_path: str) -> Tuple[str, int, int]:
+    """Get a cheap fingerprint of a file that changes when the file is modified
+    
+    Args:
+        file_path: Path of the file
+        
+    Returns:
+        Tuple of the normalized path, the modification time in nanoseconds and the size in bytes
+    """
+    stat = os.stat(file_path)
+    return normalize_path(file_path), stat.st_mtime_ns, stat.st_size
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Get the SHA-1 digest of the content of a file
+    
+    Args:
+        file_path: Path of the file
+        chunk_size: Number of bytes read at a time
+        
+    Returns:
+        Hex digest of the file content
+    """
+    import hashlib
+    
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_dir() -> str:
+    """Get the directory for files the library keeps between runs
+    
+    Set the CANOE_PY_CACHE_DIR environment variable to choose it; defaults to
+    Canoe_PY in the temporary directory.
+    
+    Returns:
+        Path of the cache directory (it may not exist yet)
+    """
+    path = os.environ.get("CANOE_PY_CACHE_DIR")
+    if not path:
+        import tempfile
+        path = os.path.join(tempfile.gettempdir(), "Canoe_PY")
+    return path
+
+class ConfigurationRecord:
+    """Fingerprint and content digest of a configuration loaded into CANoe, stored as JSON
+
+    Kept in the cache directory so that another process recognizes that CANoe
+    already has the unchanged configuration loaded.
+    """
+    
+    def __init__(self, directory: str, configuration: str):
+        """Initialize the record
+        
+        Args:
+            directory: Cache directory
+            configuration: Path of the configuration
+        """
+        import hashlib
+        
+        key = hashlib.sha1(normalize_path(configuration).encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(directory, f"config_{key}.json")
+    
+    def load(self) -> Optional[Tuple[Tuple[str, int, int], str]]:
+        """Get the recorded (fingerprint, digest), or None if nothing is recorded"""
+        import json
+        
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return tuple(data["fingerprint"]), data["digest"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def save(self, fingerprint: Tuple[str, int, int], digest: str) -> None:
+        """Record the fingerprint and digest of the loaded configuration
+        
+        Args:
+            fingerprint: Result of file_fingerprint()
+            digest: Result of file_digest()
+        """
+        import json
+        
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": list(fingerprint), "digest": digest}, f)
+        os.replace(temporary_path, self.path)
+    
+    def clear(self) -> None:
+        """Forget the recorded configuration"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
 def wait(seconds: float) -> None:
     """Wait for the specified number of seconds
     
@@ -78,3 +336,17 @@ def wait(seconds: float) -> None:
     """
     time.sleep(seconds)
 
+def import_numpy():
+    """Import NumPy, which is an optional dependency of the library
+    
+    Returns:
+        The numpy module
+        
+    Raises:
+        MyCANoeException: If NumPy is not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise MyCANoeException("NumPy is required for this feature. Install it with 'pip install Canoe_PY[numpy]'")
+    return numpy
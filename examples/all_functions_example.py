@@ -26,7 +26,7 @@ def main():
         print("\n--- Basic Connection and Configuration ---")
         
         # Connect to CANoe
-        canoe._connect_to_canoe()
+        canoe.connect()
         print("✓ Connected to CANoe")
         
         # Get version
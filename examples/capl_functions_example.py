@@ -21,7 +21,7 @@ def main():
         )
         
         # Connect to CANoe
-        canoe._connect_to_canoe()
+        canoe.connect()
         print("Connected to CANoe")
         
         # Example configuration path - update with a valid path for your system
@@ -18,7 +18,7 @@ def main():
         canoe = MyCANoe(log_level=logging.INFO)
         
         # Connect to CANoe
-        canoe._connect_to_canoe()
+        canoe.connect()
         print("Connected to CANoe")
         
         # Create new configuration
@@ -18,7 +18,7 @@ def main():
         canoe = MyCANoe(log_level=logging.INFO)
         
         # Connect to CANoe
-        canoe._connect_to_canoe()
+        canoe.connect()
         print("Connected to CANoe")
         
         # Example configuration path - update with a valid path for your system
@@ -18,7 +18,7 @@ def main():
         canoe = MyCANoe(log_level=logging.INFO)
         
         # Connect to CANoe first
-        canoe._connect_to_canoe()
+        canoe.connect()
         
         # Check if measurement is running
         if not canoe.is_measurement_running():
@@ -27,7 +27,10 @@ setup(
     packages=find_packages(),
     python_requires=">=3.6",
     install_requires=[
-        "pywin32",
+        "pywin32; sys_platform == 'win32'",
     ],
+    extras_require={
+        "numpy": ["numpy"],
+    },
 )
 
@@ -0,0 +1,99 @@
+"""
+Tests for the asyncio interface
+"""
+
+import unittest
+import asyncio
+import logging
+import os
+import sys
+import threading
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY import MyCANoe
+from Canoe_PY.aio import AsyncCANoe
+from Canoe_PY.backends import FakeBackend
+from Canoe_PY.exceptions import SignalError
+
+class TestAsyncCANoe(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.backend = FakeBackend(measurement_delay=0.1)
+        self.backend.add_signal("CAN", 1, "LightState", "FlashLight", 0)
+        self.backend.add_system_variable("sys_var_demo::speed", 10)
+
+    async def connect(self):
+        canoe = AsyncCANoe(log_level=logging.WARNING, backend=self.backend)
+        await canoe.connect()
+        return canoe
+
+    def test_calls_run_on_com_thread(self):
+        """Test that calls execute on the dedicated thread and return their results"""
+        async def scenario():
+            async with await self.connect() as canoe:
+                await canoe.set_signal_value("CAN", 1, "LightState", "FlashLight", 1)
+                value = await canoe.get_signal_value("CAN", 1, "LightState", "FlashLight")
+                thread_name = await canoe.run(lambda: threading.current_thread().name)
+                return value, thread_name
+
+        value, thread_name = asyncio.run(scenario())
+        self.assertEqual(value, 1)
+        self.assertEqual(thread_name, "AsyncCANoe")
+
+    def test_event_loop_not_blocked(self):
+        """Test that other coroutines keep running while the measurement starts"""
+        async def scenario():
+            async with await self.connect() as canoe:
+                ticks = 0
+
+                async def ticker():
+                    nonlocal ticks
+                    while True:
+                        ticks += 1
+                        await asyncio.sleep(0.01)
+
+                task = asyncio.ensure_future(ticker())
+                started = await canoe.start_measurement(timeout=1)
+                task.cancel()
+                return started, ticks
+
+        started, ticks = asyncio.run(scenario())
+        self.assertTrue(started)
+        self.assertGreater(ticks, 3)
+
+    def test_wait_lets_stimulus_run(self):
+        """Test that a stimulus made while waiting is not queued behind the wait"""
+        async def scenario():
+            async with await self.connect() as canoe:
+                async def stimulus():
+                    await asyncio.sleep(0.05)
+                    await canoe.set_signal_value("CAN", 1, "LightState", "FlashLight", 1)
+
+                result, _ = await asyncio.gather(
+                    canoe.wait_for_signal(("CAN", 1, "LightState", "FlashLight"), 1, timeout=2), stimulus())
+                return result
+
+        result = asyncio.run(scenario())
+        self.assertTrue(result)
+        self.assertLess(result.elapsed, 1.0)
+
+    def test_every_method_is_a_coroutine(self):
+        """Test that every public MyCANoe method has a coroutine on AsyncCANoe"""
+        names = [name for name in dir(MyCANoe) if not name.startswith("_") and callable(getattr(MyCANoe, name))]
+        missing = [name for name in names if not asyncio.iscoroutinefunction(getattr(AsyncCANoe, name, None))]
+        self.assertEqual(missing, [])
+
+    def test_exceptions_propagate(self):
+        """Test that errors raised on the COM thread are raised by the coroutine"""
+        async def scenario():
+            async with await self.connect() as canoe:
+                await canoe.get_signal_value("CAN", 1, "LightState", "Missing")
+
+        with self.assertRaises(SignalError):
+            asyncio.run(scenario())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests for CAPL source tracking and compile results
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY.capl import find_capl_sources, parse_compile_result
+from Canoe_PY.utils import normalize_path
+from test_fake_backend import FakeBackendTestCase
+
+class FakeCompileResult:
+    def __init__(self, result, errorMessage="", nodeName="", sourceFile=""):
+        self.result = result
+        self.errorMessage = errorMessage
+        self.nodeName = nodeName
+        self.sourceFile = sourceFile
+
+class CaplSourcesTestCase(FakeBackendTestCase):
+    """Base class with a configuration whose node includes a shared file"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        os.makedirs(os.path.join(self.directory, "include"))
+        self.node = self.write("node.can", 'includes\n{\n  #include "include/common.cin"\n}\n')
+        self.include = self.write("include/common.cin", 'includes\n{\n  #include "../shared.cin"\n}\n')
+        self.shared = self.write("shared.cin", "variables { int x; }\n")
+        self.config_path = self.write("demo.cfg", "configuration")
+
+        self.backend.add_node(self.node)
+        self.canoe.cache_dir = os.path.join(self.directory, "cache")
+        self.canoe.open(self.config_path)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+class TestCaplSources(CaplSourcesTestCase):
+
+    def test_includes_are_followed(self):
+        """Test that nested includes are resolved relative to the including file"""
+        sources = find_capl_sources([self.node])
+        self.assertEqual(sources, sorted(normalize_path(p) for p in (self.node, self.include, self.shared)))
+
+    def test_missing_include_is_listed(self):
+        """Test that an include that does not exist is still tracked"""
+        self.write("shared.cin", '#include "missing.cin"\n')
+        self.assertIn(normalize_path(os.path.join(self.directory, "missing.cin")), find_capl_sources([self.node]))
+
+class TestCompileResult(unittest.TestCase):
+
+    def test_success(self):
+        """Test converting a successful compile result"""
+        result = parse_compile_result(FakeCompileResult(0))
+        self.assertTrue(result["result"])
+        self.assertEqual(result["errors"], 0)
+
+    def test_error(self):
+        """Test converting a failed compile result with a line number"""
+        result = parse_compile_result(FakeCompileResult(1, "node.can (42,7): parse error", "Node1", "C:/node.can"))
+        self.assertFalse(result["result"])
+        self.assertEqual(result["errors"], 1)
+        self.assertEqual(result["line"], 42)
+        self.assertEqual(result["node"], "Node1")
+
+class TestIncrementalCompile(CaplSourcesTestCase):
+
+    def test_unchanged_sources_are_not_compiled(self):
+        """Test that a second compile without changes is skipped"""
+        self.assertFalse(self.canoe.compile_all_capl_nodes()["skipped"])
+        self.assertTrue(self.canoe.compile_all_capl_nodes()["skipped"])
+        self.assertEqual(self.backend.compile_count, 1)
+
+    def test_changed_include_is_compiled(self):
+        """Test that changing an included file triggers a compile"""
+        self.canoe.compile_all_capl_nodes()
+        self.write("shared.cin", "variables { int y; }\n")
+        self.assertFalse(self.canoe.compile_all_capl_nodes()["skipped"])
+        self.assertEqual(self.backend.compile_count, 2)
+
+    def test_changed_test_module_is_compiled(self):
+        """Test that changing the CAPL file of a test module triggers a compile"""
+        test_module = self.write("tests.can", "testcase TC1() { }\n")
+        self.backend.add_test_module(test_module)
+        self.canoe.compile_all_capl_nodes()
+        self.write("tests.can", "testcase TC2() { }\n")
+        self.assertFalse(self.canoe.compile_all_capl_nodes()["skipped"])
+        self.assertEqual(self.backend.compile_count, 2)
+
+    def test_changed_configuration_reference_is_compiled(self):
+        """Test that changing a CAPL program only named in the configuration file triggers a compile"""
+        self.write("analysis.can", "on message * { }\n")
+        self.write("demo.cfg", 'configuration\n<VFileName V9 QL> 1 "analysis.can"\n')
+        self.canoe.compile_all_capl_nodes()
+        self.write("analysis.can", "on message 0x100 { }\n")
+        self.assertFalse(self.canoe.compile_all_capl_nodes()["skipped"])
+        self.assertEqual(self.backend.compile_count, 2)
+
+    def test_force(self):
+        """Test that force=True always compiles"""
+        self.canoe.compile_all_capl_nodes()
+        self.canoe.compile_all_capl_nodes(force=True)
+        self.assertEqual(self.backend.compile_count, 2)
+
+    def test_failed_compile_is_not_recorded(self):
+        """Test that a failed compile reports the error and is repeated next time"""
+        self.backend.compile_error = (1, "node.can (3): unknown symbol", "Node1", self.node)
+        result = self.canoe.compile_all_capl_nodes()
+        self.assertFalse(result["result"])
+        self.assertEqual(result["line"], 3)
+        self.backend.compile_error = ()
+        self.assertFalse(self.canoe.compile_all_capl_nodes()["skipped"])
+        self.assertEqual(self.backend.compile_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests for waiting on signal and system variable conditions
+"""
+
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY.exceptions import SignalError
+from test_fake_backend import FakeBackendTestCase
+
+FLASH_LIGHT = ("CAN", 1, "LightState", "FlashLight")
+HEAD_LIGHT = ("CAN", 1, "LightState", "HeadLight")
+
+class TestConditions(FakeBackendTestCase):
+
+    def later(self, delay, function, *args):
+        timer = threading.Timer(delay, function, args)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        return time.time() + delay
+
+    def test_wait_for_signal(self):
+        """Test waiting for a signal value set by another thread"""
+        changed_at = self.later(0.05, self.backend._signals[FLASH_LIGHT].__setattr__, "Value", 1)
+        result = self.canoe.wait_for_signal(FLASH_LIGHT, 1, timeout=1.0)
+        self.assertTrue(result)
+        self.assertEqual(result.values[FLASH_LIGHT], 1)
+        self.assertAlmostEqual(result.timestamp, changed_at, delta=0.05)
+
+    def test_wait_for_signal_timeout(self):
+        """Test that an unmet condition returns a falsy result after the timeout"""
+        start_time = time.perf_counter()
+        result = self.canoe.wait_for_signal(FLASH_LIGHT, lambda value: value > 5, timeout=0.1)
+        self.assertFalse(result)
+        self.assertIsNone(result.timestamp)
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.1)
+
+    def test_handles_resolved_once(self):
+        """Test that polling reuses the resolved signal object"""
+        self.canoe.wait_for_signal(FLASH_LIGHT, 1, timeout=0.05)
+        self.assertEqual(self.canoe.get_cache_stats()["signals"]["misses"], 1)
+
+    def test_wait_for_system_variable(self):
+        """Test waiting for a system variable changed by the simulation"""
+        self.later(0.05, self.backend.set_value, "sys_var_demo::speed", 50)
+        result = self.canoe.wait_for_system_variable("sys_var_demo::speed", lambda value: value >= 50, timeout=1.0)
+        self.assertTrue(result)
+        self.assertEqual(result.values["sys_var_demo::speed"], 50)
+
+    def test_compound_condition(self):
+        """Test a condition over several signals and a system variable"""
+        def stimulate():
+            self.backend._signals[FLASH_LIGHT].Value = 1
+            self.backend.set_value("sys_var_demo::speed", 20)
+
+        self.later(0.05, stimulate)
+        result = self.canoe.wait_for_values(
+            lambda values: values[FLASH_LIGHT] == 1 and values[HEAD_LIGHT] == 1 and values["sys_var_demo::speed"] == 20,
+            signals=[FLASH_LIGHT, HEAD_LIGHT], system_variables=["sys_var_demo::speed"], timeout=1.0
+        )
+        self.assertTrue(result)
+        self.assertGreater(result.polls, 1)
+
+    def test_condition_already_true(self):
+        """Test that a condition met on the first check returns immediately"""
+        result = self.canoe.wait_for_system_variable("sys_var_demo::speed", 10, timeout=1.0)
+        self.assertTrue(result)
+        self.assertEqual(result.polls, 1)
+
+    def test_short_pulse_seen_through_events(self):
+        """Test that every change event is evaluated, even one that is immediately undone"""
+        def pulse():
+            self.backend.set_value("sys_var_demo::speed", 99)
+            self.backend.set_value("sys_var_demo::speed", 0)
+
+        self.later(0.05, pulse)
+        result = self.canoe.wait_for_system_variable("sys_var_demo::speed", 99, timeout=1.0)
+        self.assertTrue(result)
+
+    def test_unknown_signal(self):
+        """Test that waiting on a missing signal raises"""
+        with self.assertRaises(SignalError):
+            self.canoe.wait_for_signal(("CAN", 1, "LightState", "Missing"), 1, timeout=0.1)
+
+class TestConditionsPolling(TestConditions):
+    """Same scenarios with change events unavailable"""
+
+    backend_options = {"events": False}
+
+    def test_short_pulse_seen_through_events(self):
+        """Polling cannot see a pulse shorter than the interval"""
+        pass
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Tests for the offline DBC parser and signal index
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY.dbc import SignalIndex, parse_dbc
+from Canoe_PY.exceptions import SignalError
+from Canoe_PY.utils import normalize_path
+from test_fake_backend import FakeBackendTestCase
+
+DBC = """VERSION ""
+
+NS_ :
+    CM_
+    VAL_
+
+BS_:
+
+BU_: ECU Gateway
+
+BO_ 100 LightState: 2 ECU
+ SG_ FlashLight : 0|1@1+ (1,0) [0|1] "" Gateway
+ SG_ HeadLight : 1|2@1+ (1,0) [0|3] "" Gateway
+
+BO_ 2147484177 EngineState: 8 ECU
+ SG_ EngineSpeed : 7|16@0+ (0.5,0) [0|8000] "rpm" Gateway
+ SG_ Temperature : 16|8@1- (1,-40) [-40|87] "degC" Gateway
+
+CM_ SG_ 100 FlashLight "Flash light on";
+VAL_ 100 HeadLight 0 "Off" 1 "Low"
+    2 "High" ;
+"""
+
+class DbcTestCase(unittest.TestCase):
+    """Base class with a DBC file and an empty cache directory"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dbc_path = os.path.join(directory.name, "vehicle.dbc")
+        with open(self.dbc_path, "w") as f:
+            f.write(DBC)
+        self.cache_directory = os.path.join(directory.name, "cache")
+
+class TestParseDbc(DbcTestCase):
+
+    def test_messages(self):
+        """Test parsing message IDs, DLC, sender and extended IDs"""
+        messages = parse_dbc(self.dbc_path)
+        self.assertEqual(set(messages), {"LightState", "EngineState"})
+        self.assertEqual(messages["LightState"].frame_id, 100)
+        self.assertFalse(messages["LightState"].extended)
+        self.assertEqual(messages["EngineState"].frame_id, 0x211)
+        self.assertTrue(messages["EngineState"].extended)
+        self.assertEqual(messages["EngineState"].dlc, 8)
+
+    def test_signals(self):
+        """Test parsing bit layout, scaling, range and unit"""
+        signals = parse_dbc(self.dbc_path)["EngineState"].signals
+        speed = signals["EngineSpeed"]
+        self.assertEqual((speed.start_bit, speed.length), (7, 16))
+        self.assertFalse(speed.little_endian)
+        self.assertEqual((speed.factor, speed.unit, speed.maximum), (0.5, "rpm", 8000.0))
+        temperature = signals["Temperature"]
+        self.assertTrue(temperature.signed)
+        self.assertEqual(temperature.raw_range(), (-128, 127))
+        self.assertEqual(temperature.to_physical(60), 20.0)
+        self.assertEqual(temperature.to_raw(20.0), 60)
+
+    def test_value_table(self):
+        """Test parsing a value table that spans several lines"""
+        signal = parse_dbc(self.dbc_path)["LightState"].signals["HeadLight"]
+        self.assertEqual(signal.value_table, {0: "Off", 1: "Low", 2: "High"})
+
+class TestSignalIndex(DbcTestCase):
+
+    def test_cached_index(self):
+        """Test that a second index loads the parsed database from the cache"""
+        SignalIndex(self.cache_directory).add(self.dbc_path, "CAN", 1)
+        index = SignalIndex(self.cache_directory)
+        index.add(self.dbc_path, "CAN", 1)
+        self.assertEqual((index.parsed, index.cache_hits), (0, 1))
+        signal = index.get_signal("CAN", 1, "LightState", "HeadLight")
+        self.assertEqual(signal.value_table[2], "High")
+
+    def test_changed_file_is_parsed_again(self):
+        """Test that editing the database invalidates the cached index"""
+        SignalIndex(self.cache_directory).add(self.dbc_path, "CAN", 1)
+        with open(self.dbc_path, "a") as f:
+            f.write("\nBO_ 200 DoorState: 1 ECU\n SG_ DoorOpen : 0|1@1+ (1,0) [0|1] \"\" Gateway\n")
+        index = SignalIndex(self.cache_directory)
+        index.add(self.dbc_path, "CAN", 1)
+        self.assertEqual(index.parsed, 1)
+        self.assertIsNotNone(index.get_signal("CAN", 1, "DoorState", "DoorOpen"))
+
+    def test_coverage(self):
+        """Test that a channel is covered only when all of its databases are indexed"""
+        index = SignalIndex(self.cache_directory)
+        path = normalize_path(self.dbc_path)
+        self.assertFalse(index.add("C:/db/system.arxml", "CAN", 1))
+        index.add(self.dbc_path, "CAN", 1)
+        self.assertTrue(index.covers("CAN", 1, [path]))
+        self.assertFalse(index.covers("CAN", 1, [path, normalize_path("C:/db/system.arxml")]))
+        self.assertFalse(index.covers("CAN", 2, []))
+
+    def test_remove_last_database(self):
+        """Test that a channel without databases is no longer indexed"""
+        index = SignalIndex(self.cache_directory)
+        index.add(self.dbc_path, "CAN", 1)
+        index.remove(self.dbc_path, 1)
+        self.assertFalse(index.indexed("CAN", 1))
+        self.assertFalse(index.covers("CAN", 1, []))
+
+class TestSignalValidation(DbcTestCase, FakeBackendTestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        DbcTestCase.setUp(self)
+        FakeBackendTestCase.setUp(self)
+        self.canoe.cache_dir = self.cache_directory
+        self.canoe.add_database(self.dbc_path, "CAN", 1)
+
+    def test_unknown_signal_fails_without_com(self):
+        """Test that a signal missing from the databases is rejected without resolving it through COM"""
+        self.canoe.list_databases()
+        calls = self.backend.call_count
+        with self.assertRaises(SignalError):
+            self.canoe.get_signal_value("CAN", 1, "LightState", "FogLight")
+        self.assertEqual(self.backend.call_count, calls)
+        self.assertFalse(self.canoe.validate_signal("CAN", 1, "LightState", "FogLight"))
+
+    def test_known_signal(self):
+        """Test that a signal defined in the databases is read as before"""
+        self.assertTrue(self.canoe.validate_signal("CAN", 1, "LightState", "HeadLight"))
+        self.assertEqual(self.canoe.get_signal_value("CAN", 1, "LightState", "HeadLight"), 1)
+        self.assertEqual(self.canoe.get_signal_info("CAN", 1, "LightState", "HeadLight").length, 2)
+
+    def test_uncovered_channel_is_not_validated(self):
+        """Test that channels without indexed databases still resolve through COM"""
+        self.assertEqual(self.canoe.get_signal_value("CAN", 2, "EngineState", "EngineSpeed"), 1000.0)
+
+    def test_remove_database(self):
+        """Test that removing a database drops its signals from the index"""
+        self.canoe.remove_database(self.dbc_path, 1)
+        self.assertIsNone(self.canoe.get_signal_info("CAN", 1, "LightState", "HeadLight"))
+        self.backend.add_signal("CAN", 1, "Engine", "Temp", 90)
+        self.assertEqual(self.canoe.get_signal_value("CAN", 1, "Engine", "Temp"), 90)
+
+class TestSignalValidationExistingDatabase(DbcTestCase, FakeBackendTestCase):
+
+    def setUp(self):
+        """Set up test fixtures with a database already in the configuration"""
+        DbcTestCase.setUp(self)
+        FakeBackendTestCase.setUp(self)
+        self.canoe.cache_dir = self.cache_directory
+        self.backend.add_signal("CAN", 1, "Engine", "Temp", 90)
+        self.canoe.configuration.GeneralSetup.DatabaseSetup.Databases.Add("C:/db/powertrain.dbc", "CAN", 1)
+        self.canoe.add_database(self.dbc_path, "CAN", 1)
+
+    def test_signal_of_unindexed_database(self):
+        """Test that signals of a database missing from the index still resolve through COM"""
+        self.assertEqual(self.canoe.get_signal_value("CAN", 1, "Engine", "Temp"), 90)
+        self.assertEqual(self.canoe.get_signal_value("CAN", 1, "LightState", "HeadLight"), 1)
+
+if __name__ == "__main__":
+    unittest.main()
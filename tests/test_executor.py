@@ -0,0 +1,151 @@
+"""
+Tests for the COM executor and the shared MyCANoe proxy
+"""
+
+import unittest
+import logging
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY import ComExecutor, SharedCANoe
+from Canoe_PY.backends import FakeBackend
+from Canoe_PY.backends.com import ComBackend
+from Canoe_PY.exceptions import SignalError
+
+class TestComExecutor(unittest.TestCase):
+
+    def test_calls_run_on_executor_thread(self):
+        """Test that submitted calls run on the executor thread in order"""
+        with ComExecutor(name="TestExecutor") as executor:
+            results = [executor.submit(lambda i=i: (i, threading.current_thread().name)) for i in range(10)]
+            values = [future.result() for future in results]
+        self.assertEqual([i for i, _ in values], list(range(10)))
+        self.assertTrue(all(name == "TestExecutor" for _, name in values))
+
+    def test_nested_call_runs_inline(self):
+        """Test that call() from the executor thread does not deadlock"""
+        with ComExecutor() as executor:
+            result = executor.call(lambda: executor.call(lambda: 42))
+        self.assertEqual(result, 42)
+
+    def test_queued_calls_are_batched(self):
+        """Test that calls queued while the thread is busy run as one batch"""
+        with ComExecutor() as executor:
+            blocker = threading.Event()
+            executor.submit(blocker.wait, 1)
+            futures = [executor.submit(lambda: None) for _ in range(20)]
+            blocker.set()
+            for future in futures:
+                future.result()
+            stats = executor.stats()
+        self.assertEqual(stats["calls"], 21)
+        self.assertGreaterEqual(stats["largest_batch"], 20)
+
+    def test_submit_batch(self):
+        """Test running a list of calls as one queued item"""
+        with ComExecutor() as executor:
+            results = executor.submit_batch([(pow, (2, 3)), (max, (1, 5))]).result()
+        self.assertEqual(results, [8, 5])
+
+    def test_submit_after_shutdown(self):
+        """Test that submitting to a stopped executor fails"""
+        executor = ComExecutor()
+        executor.shutdown()
+        with self.assertRaises(RuntimeError):
+            executor.submit(lambda: None)
+
+    def test_calls_queued_behind_shutdown_are_cancelled(self):
+        """Test that calls batched after the stop item do not block their callers"""
+        executor = ComExecutor()
+        blocker = threading.Event()
+        executor.submit(blocker.wait, 1)
+        executor.shutdown(wait=False)
+        # A submit that passed the shutdown check just before shutdown() was called
+        executor._shutdown = False
+        late = executor.submit(lambda: None)
+        blocker.set()
+        executor.shutdown()
+        self.assertTrue(late.cancelled())
+
+    def test_com_backend_not_pumped_before_initialize(self):
+        """Test that an idle executor does not load pywin32 before the backend is initialized"""
+        backend = ComBackend()
+        with mock.patch("Canoe_PY.backends.com._import_pywin32") as import_pywin32:
+            with ComExecutor(backend=backend, idle_interval=0.01):
+                time.sleep(0.05)
+        import_pywin32.assert_not_called()
+
+class TestSharedCANoe(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.backend = FakeBackend()
+        self.backend.add_signal("CAN", 1, "LightState", "FlashLight", 0)
+        self.backend.add_system_variable("sys_var_demo::speed", 10)
+        self.canoe = SharedCANoe(log_level=logging.WARNING, backend=self.backend)
+        self.canoe.connect()
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.canoe.close()
+
+    def test_calls_from_many_threads(self):
+        """Test that several threads can share one instance"""
+        errors = []
+
+        def worker(value):
+            try:
+                for _ in range(20):
+                    self.canoe.set_system_variable_value("sys_var_demo::speed", value)
+                    self.canoe.get_signal_value("CAN", 1, "LightState", "FlashLight")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertIn(self.backend.get_value("sys_var_demo::speed"), range(4))
+        self.assertEqual(self.canoe.executor.stats()["calls"], 162)
+
+    def test_batch(self):
+        """Test running several methods back-to-back"""
+        results = self.canoe.batch([
+            ("set_signal_value", ("CAN", 1, "LightState", "FlashLight", 1)),
+            ("get_signal_value", ("CAN", 1, "LightState", "FlashLight")),
+        ])
+        self.assertEqual(results, [None, 1])
+
+    def test_capl_sequence_is_one_dispatch(self):
+        """Test that a CAPL call sequence costs one executor call"""
+        self.backend.add_capl_function("add", lambda a, b: a + b)
+        self.canoe._initialize_objects()
+        calls = self.canoe.executor.stats()["calls"]
+        results = self.canoe.call_capl_functions([("add", (i, i)) for i in range(20)])
+        self.assertEqual(results, [2 * i for i in range(20)])
+        self.assertEqual(self.canoe.executor.stats()["calls"], calls + 1)
+
+    def test_wait_lets_other_threads_run(self):
+        """Test that calls from other threads run while a thread waits for a condition"""
+        timer = threading.Timer(0.05, self.canoe.set_signal_value, ("CAN", 1, "LightState", "FlashLight", 1))
+        timer.start()
+        result = self.canoe.wait_for_signal(("CAN", 1, "LightState", "FlashLight"), 1, timeout=2)
+        timer.join()
+        self.assertTrue(result)
+        self.assertLess(result.elapsed, 1.0)
+
+    def test_exceptions_propagate(self):
+        """Test that errors raised on the executor thread reach the caller"""
+        with self.assertRaises(SignalError):
+            self.canoe.get_signal_value("CAN", 1, "LightState", "Missing")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,545 @@
+"""
+Tests for the MyCANoe library against the simulated CANoe backend
+"""
+
+import unittest
+import logging
+import os
+import sys
+import tempfile
+import time
+from array import array
+from unittest import mock
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY import MyCANoe, MyCANoeException
+from Canoe_PY.backends import FakeBackend
+from Canoe_PY.exceptions import SignalError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def use_temporary_cache_dir(test_case):
+    """Point the library's default cache directory at a directory removed after the test"""
+    directory = tempfile.TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+    patcher = mock.patch.dict(os.environ, {"CANOE_PY_CACHE_DIR": directory.name})
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return directory.name
+
+class FakeBackendTestCase(unittest.TestCase):
+    """Base class connecting MyCANoe to a populated simulated CANoe"""
+
+    backend_options = {}
+
+    def setUp(self):
+        """Set up test fixtures"""
+        use_temporary_cache_dir(self)
+        self.backend = FakeBackend(**self.backend_options)
+        self.backend.add_signal("CAN", 1, "LightState", "FlashLight", 0)
+        self.backend.add_signal("CAN", 1, "LightState", "HeadLight", 1)
+        self.backend.add_signal("CAN", 2, "EngineState", "EngineSpeed", 1000.0, factor=0.5, offset=0.0)
+        self.backend.add_system_variable("sys_var_demo::speed", 10)
+        self.backend.add_system_variable("sys_var_demo::ratio", 0.5)
+        self.backend.add_system_variable("sys_var_demo::name", "demo")
+        self.backend.add_system_variable("sys_var_demo::buffer", (0, 0, 0, 0))
+        self.backend.add_system_variable("sys_var_demo::data", bytes(8))
+        self.backend.add_environment_variable("EnvSpeed", 0)
+        self.backend.add_capl_function("add", lambda a, b: a + b)
+
+        self.canoe = MyCANoe(log_level=logging.WARNING, backend=self.backend)
+        self.canoe.connect()
+        self.canoe._initialize_objects()
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.canoe.close()
+
+class TestConnection(FakeBackendTestCase):
+
+    def test_get_version(self):
+        """Test getting the simulated CANoe version"""
+        self.assertEqual(self.canoe.get_version(), "15.0.0")
+
+    def test_get_status(self):
+        """Test getting the status of the simulated CANoe"""
+        status = self.canoe.get_status()
+        self.assertEqual(status["version"], "15.0.0")
+        self.assertFalse(status["measurement_running"])
+        self.assertIn("timestamp", status)
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected"""
+        with self.assertRaises(MyCANoeException):
+            MyCANoe(log_level=logging.WARNING, backend="nonexistent")
+
+    def test_latency_is_simulated(self):
+        """Test that every COM round-trip costs the configured latency"""
+        self.backend.latency = 0.01
+        start_time = time.perf_counter()
+        self.canoe.is_measurement_running()
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.01)
+
+class TestSignals(FakeBackendTestCase):
+
+    def test_get_set_signal_value(self):
+        """Test reading and writing physical and raw signal values"""
+        self.canoe.set_signal_value("CAN", 1, "LightState", "FlashLight", 1)
+        self.assertEqual(self.canoe.get_signal_value("CAN", 1, "LightState", "FlashLight"), 1)
+        self.canoe.set_signal_value("CAN", 2, "EngineState", "EngineSpeed", 100, raw_value=True)
+        self.assertEqual(self.canoe.get_signal_value("CAN", 2, "EngineState", "EngineSpeed"), 50.0)
+
+    def test_unknown_signal(self):
+        """Test that an unknown signal raises SignalError"""
+        with self.assertRaises(SignalError):
+            self.canoe.get_signal_value("CAN", 1, "LightState", "Missing")
+
+    def test_signal_cache(self):
+        """Test that repeated access resolves the signal only once"""
+        for _ in range(5):
+            self.canoe.get_signal_value("CAN", 1, "LightState", "FlashLight")
+        stats = self.canoe.get_cache_stats()["signals"]
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 4)
+
+        calls = self.backend.call_count
+        self.canoe.get_signal_value("CAN", 1, "LightState", "FlashLight")
+        self.assertEqual(self.backend.call_count - calls, 1)
+
+    def test_signal_cache_invalidated_on_measurement_start(self):
+        """Test that starting the measurement drops cached signal handles"""
+        self.canoe.get_signal_value("CAN", 1, "LightState", "FlashLight")
+        self.assertTrue(self.canoe.start_measurement())
+        stats = self.canoe.get_cache_stats()["signals"]
+        self.assertEqual(stats["size"], 0)
+        self.assertEqual(stats["evictions"], 1)
+
+    def test_get_signal_values(self):
+        """Test the bulk signal read"""
+        specs = [("CAN", 1, "LightState", "FlashLight"), ("CAN", 2, "EngineState", "EngineSpeed")]
+        snapshot = self.canoe.get_signal_values(specs)
+        self.assertEqual(snapshot["values"], {specs[0]: 0, specs[1]: 1000.0})
+        self.assertIn("timestamp", snapshot)
+
+        raw = self.canoe.get_signal_values(specs, raw_value=True)
+        self.assertEqual(raw["values"][specs[1]], 2000)
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_get_signal_values_as_array(self):
+        """Test the bulk signal read into a NumPy array"""
+        specs = [("CAN", 2, "EngineState", "EngineSpeed"), ("CAN", 1, "LightState", "HeadLight")]
+        snapshot = self.canoe.get_signal_values(specs, as_array=True)
+        self.assertEqual(snapshot["values"].tolist(), [1000.0, 1.0])
+
+    def test_set_signal_values(self):
+        """Test the batched signal write reporting failures without aborting"""
+        result = self.canoe.set_signal_values({
+            ("CAN", 1, "LightState", "FlashLight"): 1,
+            ("CAN", 1, "LightState", "Missing"): 1,
+            ("CAN", 1, "LightState", "HeadLight"): 0,
+        })
+        self.assertFalse(result["result"])
+        self.assertEqual(list(result["failed"]), [("CAN", 1, "LightState", "Missing")])
+        self.assertEqual(self.canoe.get_signal_value("CAN", 1, "LightState", "FlashLight"), 1)
+        self.assertEqual(self.canoe.get_signal_value("CAN", 1, "LightState", "HeadLight"), 0)
+
+    def test_set_signal_values_rollback(self):
+        """Test that a failing batch restores the previous values"""
+        result = self.canoe.set_signal_values({
+            ("CAN", 1, "LightState", "FlashLight"): 1,
+            ("CAN", 1, "LightState", "Missing"): 1,
+        }, rollback=True)
+        self.assertTrue(result["rolled_back"])
+        self.assertEqual(self.canoe.get_signal_value("CAN", 1, "LightState", "FlashLight"), 0)
+
+class TestMeasurement(FakeBackendTestCase):
+
+    backend_options = {"measurement_delay": 0.05}
+
+    def check_transitions(self):
+        """Run the measurement through start, reset and stop"""
+        self.assertTrue(self.canoe.start_measurement(timeout=1))
+        self.assertTrue(self.canoe.is_measurement_running())
+        self.assertTrue(self.canoe.reset_measurement(timeout=1))
+        self.assertTrue(self.canoe.is_measurement_running())
+        self.assertTrue(self.canoe.stop_measurement(timeout=1))
+        self.assertFalse(self.canoe.is_measurement_running())
+
+    def test_start_stop_measurement(self):
+        """Test that measurement transitions return once the event fires"""
+        self.assertIsNotNone(self.canoe.measurement_events)
+        self.check_transitions()
+
+    def test_start_measurement_timeout(self):
+        """Test that a transition slower than the timeout reports failure"""
+        self.backend.measurement_delay = 0.5
+        self.assertFalse(self.canoe.start_measurement(timeout=0.05))
+
+    def test_reset_drops_handles_resolved_while_stopped(self):
+        """Test that handles resolved between the stop and the start of a reset are not reused"""
+        self.canoe.start_measurement(timeout=1)
+        wait_for_measurement = self.canoe._wait_for_measurement
+
+        def resolve_while_stopped(running, deadline):
+            met = wait_for_measurement(running, deadline)
+            if not running:
+                self.canoe.get_signal_value("CAN", 1, "LightState", "FlashLight")
+            return met
+
+        generation = self.canoe._handle_generation
+        with mock.patch.object(self.canoe, "_wait_for_measurement", side_effect=resolve_while_stopped):
+            self.assertTrue(self.canoe.reset_measurement(timeout=1))
+        self.assertEqual(len(self.canoe._signal_cache), 0)
+        self.assertEqual(self.canoe._handle_generation, generation + 2)
+
+class TestMeasurementPolling(TestMeasurement):
+
+    backend_options = {"measurement_delay": 0.05, "events": False}
+
+    def test_start_stop_measurement(self):
+        """Test that measurement transitions fall back to polling without events"""
+        self.assertIsNone(self.canoe.measurement_events)
+        self.check_transitions()
+
+class TestVariables(FakeBackendTestCase):
+
+    def test_system_variables(self):
+        """Test reading and writing system variables"""
+        self.canoe.set_system_variable_value("sys_var_demo::speed", "0x10")
+        self.assertEqual(self.canoe.get_system_variable_value("sys_var_demo::speed"), 16)
+        self.canoe.set_system_variable_array_values("sys_var_demo::buffer", (1, 2))
+        self.assertEqual(self.canoe.get_system_variable_value("sys_var_demo::buffer"), (1, 2, 0, 0))
+
+    def test_system_variable_cache(self):
+        """Test that repeated system variable access costs a single COM property read"""
+        self.canoe.get_system_variable_value("sys_var_demo::speed")
+        calls = self.backend.call_count
+        self.assertEqual(self.canoe.get_system_variable_value("sys_var_demo::speed"), 10)
+        self.assertEqual(self.backend.call_count - calls, 1)
+
+        self.canoe.get_system_variable_value("sys_var_demo::ratio")
+        stats = self.canoe.get_cache_stats()
+        self.assertEqual(stats["namespaces"]["misses"], 1)
+        self.assertEqual(stats["system_variables"]["size"], 2)
+
+        self.assertTrue(self.canoe.start_measurement())
+        self.assertEqual(self.canoe.get_cache_stats()["system_variables"]["size"], 2)
+
+    def test_system_variable_cache_invalidated_on_new(self):
+        """Test that a configuration change drops cached system variables"""
+        self.canoe.get_system_variable_value("sys_var_demo::speed")
+        self.canoe.new()
+        self.assertEqual(self.canoe.get_cache_stats()["system_variables"]["size"], 0)
+
+    def test_system_variable_schema(self):
+        """Test that writes coerce to the learned type without reading the value first"""
+        self.canoe.set_system_variable_value("sys_var_demo::ratio", "1.5")
+        calls = self.backend.call_count
+        self.canoe.set_system_variable_value("sys_var_demo::ratio", 2)
+        self.assertEqual(self.backend.call_count - calls, 1)
+        self.assertEqual(self.backend.get_value("sys_var_demo::ratio"), 2.0)
+        self.assertIsInstance(self.backend.get_value("sys_var_demo::ratio"), float)
+
+        self.canoe.set_system_variable_value("sys_var_demo::name", 42)
+        self.assertEqual(self.backend.get_value("sys_var_demo::name"), "42")
+
+    def test_refresh_schema(self):
+        """Test that refresh_schema relearns the type of a variable"""
+        self.canoe.set_system_variable_value("sys_var_demo::speed", 1)
+        self.backend.set_value("sys_var_demo::speed", 0.0)
+        with self.assertRaises(MyCANoeException):
+            self.canoe.set_system_variable_value("sys_var_demo::speed", "2.5")
+        self.canoe.refresh_schema("sys_var_demo::speed")
+        self.canoe.set_system_variable_value("sys_var_demo::speed", "2.5")
+        self.assertEqual(self.backend.get_value("sys_var_demo::speed"), 2.5)
+
+    def test_system_variable_array_partial_update(self):
+        """Test slice updates of system variable arrays from different buffer types"""
+        self.canoe.set_system_variable_array_values("sys_var_demo::buffer", array("i", [7, 8]), offset=2)
+        self.assertEqual(self.backend.get_value("sys_var_demo::buffer"), (0, 0, 7, 8))
+        self.canoe.set_system_variable_array_values("sys_var_demo::data", memoryview(b"\x01\x02"), offset=6)
+        self.assertEqual(self.backend.get_value("sys_var_demo::data"), b"\x00" * 6 + b"\x01\x02")
+        with self.assertRaises(MyCANoeException):
+            self.canoe.set_system_variable_array_values("sys_var_demo::buffer", (1,), offset=5)
+
+    def test_system_variable_array_full_write_skips_read(self):
+        """Test that a full-length write does not read the array once its length is known"""
+        self.canoe.set_system_variable_array_values("sys_var_demo::data", b"\x00" * 8)
+        calls = self.backend.call_count
+        self.canoe.set_system_variable_array_values("sys_var_demo::data", bytearray(range(8)))
+        self.assertEqual(self.backend.call_count - calls, 1)
+        self.assertEqual(self.backend.get_value("sys_var_demo::data"), bytes(range(8)))
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_system_variable_array_numpy(self):
+        """Test writing and reading system variable arrays as NumPy arrays"""
+        self.canoe.set_system_variable_array_values("sys_var_demo::buffer", numpy.arange(1, 5))
+        values = self.canoe.get_system_variable_array("sys_var_demo::buffer")
+        self.assertEqual(values.dtype, numpy.int32)
+        self.assertEqual(values.tolist(), [1, 2, 3, 4])
+
+        self.canoe.set_system_variable_array_values("sys_var_demo::data", numpy.full(8, 255, dtype=numpy.uint8))
+        data = self.canoe.get_system_variable_array("sys_var_demo::data")
+        self.assertEqual(data.dtype, numpy.uint8)
+        self.assertEqual(data.tolist(), [255] * 8)
+
+    def test_environment_variables(self):
+        """Test reading and writing environment variables"""
+        self.canoe.set_environment_variable_value("EnvSpeed", 5)
+        self.assertEqual(self.canoe.get_environment_variable_value("EnvSpeed"), 5)
+
+    def test_environment_variable_handles_cached(self):
+        """Test that GetVariable runs once per environment variable"""
+        for _ in range(5):
+            self.canoe.get_environment_variable_value("EnvSpeed")
+        stats = self.canoe.get_cache_stats()["environment_variables"]
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 4)
+        self.canoe.invalidate_caches()
+        self.assertEqual(self.canoe.get_cache_stats()["environment_variables"]["size"], 0)
+
+    def test_environment_variable_values(self):
+        """Test reading and writing several environment variables at once"""
+        self.backend.add_environment_variable("EnvLight", 0)
+        result = self.canoe.set_environment_variable_values({"EnvSpeed": 7, "EnvLight": 1})
+        self.assertTrue(result["result"])
+        snapshot = self.canoe.get_environment_variable_values(["EnvSpeed", "EnvLight"])
+        self.assertEqual(snapshot["values"], {"EnvSpeed": 7, "EnvLight": 1})
+        with self.assertRaisesRegex(MyCANoeException, "values: Missing: "):
+            self.canoe.get_environment_variable_values(["EnvSpeed", "Missing"])
+
+    def test_environment_variable_values_rollback(self):
+        """Test that a failing variable restores the ones already written"""
+        result = self.canoe.set_environment_variable_values({"EnvSpeed": 9, "Missing": 1}, rollback=True)
+        self.assertFalse(result["result"])
+        self.assertIn("Missing", result["failed"])
+        self.assertTrue(result["rolled_back"])
+        self.assertEqual(self.backend.get_value("EnvSpeed"), 0)
+
+    def test_call_capl_function(self):
+        """Test calling a CAPL function"""
+        self.assertTrue(self.canoe.call_capl_function("add", 1, 2))
+        self.assertFalse(self.canoe.call_capl_function("add", 1))
+
+class TestCaplFunctions(FakeBackendTestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        super().setUp()
+        self.canoe.user_capl_functions = {"add"}
+
+    def test_resolved_on_measurement_init(self):
+        """Test that user CAPL functions are resolved once when the measurement initializes"""
+        self.canoe.start_measurement(timeout=1)
+        self.assertEqual(self.backend.get_function_count, 1)
+        for _ in range(10):
+            self.assertTrue(self.canoe.call_capl_function("add", 1, 2))
+        self.assertEqual(self.backend.get_function_count, 1)
+
+    def test_stale_after_restart(self):
+        """Test that a measurement restart resolves the functions again"""
+        self.canoe.start_measurement(timeout=1)
+        handle = self.canoe._capl_functions["add"][0]
+        self.canoe.reset_measurement(timeout=1)
+        self.canoe.call_capl_function("add", 1, 2)
+        self.assertEqual(self.backend.get_function_count, 2)
+        self.assertIsNot(self.canoe._capl_functions["add"][0], handle)
+
+    def test_unlisted_function_resolved_on_first_call(self):
+        """Test that functions outside user_capl_functions are resolved lazily and kept"""
+        self.canoe.user_capl_functions = set()
+        self.canoe.start_measurement(timeout=1)
+        self.canoe.call_capl_function("add", 1, 2)
+        self.canoe.call_capl_function("add", 3, 4)
+        self.assertEqual(self.backend.get_function_count, 1)
+
+    def test_failed_call_keeps_resolved_function(self):
+        """Test that a bad call while the measurement runs does not drop the function resolved in OnInit"""
+        if not self.backend.events:
+            self.skipTest("Functions are only resolved in OnInit with measurement events")
+        self.backend.get_function_in_init_only = True
+        self.canoe.start_measurement(timeout=1)
+        with self.assertRaises(MyCANoeException):
+            self.canoe.call_capl_function_result("add", 1)
+        with self.assertRaises(MyCANoeException):
+            self.canoe.call_capl_functions([("add", (1, 2, 3))])
+        self.assertFalse(self.canoe.call_capl_function("add", 1))
+        with self.assertRaises(MyCANoeException):
+            self.canoe.call_capl_function("add", 1, "x")
+        self.assertEqual(self.canoe.call_capl_function_result("add", 2, 3), 5)
+        self.assertEqual(self.backend.get_function_count, 1)
+
+    def test_call_capl_function_result(self):
+        """Test that the single-call variant returns the function's return value"""
+        self.assertEqual(self.canoe.call_capl_function_result("add", 2, 3), 5)
+        with self.assertRaisesRegex(MyCANoeException, "Expected 2, got 1"):
+            self.canoe.call_capl_function_result("add", 2)
+
+    def test_argument_count_checked_alike(self):
+        """Test that every call variant rejects a wrong number of arguments with the same message"""
+        with self.assertLogs(self.canoe.logger, level="ERROR") as logs:
+            self.assertFalse(self.canoe.call_capl_function("add", 1))
+        self.assertIn("Expected 2, got 1", logs.output[0])
+        with self.assertRaisesRegex(MyCANoeException, "add: Function arguments not matching .* Expected 2, got 3"):
+            self.canoe.call_capl_functions([("add", (1, 2, 3))])
+
+    def test_call_capl_functions(self):
+        """Test calling a sequence of functions and collecting the return values"""
+        self.backend.add_capl_function("negate", lambda a: -a)
+        results = self.canoe.call_capl_functions([("add", (1, 2)), ("negate", (4,)), ("add", [10, 20])])
+        self.assertEqual(results, [3, -4, 30])
+
+    def test_call_capl_functions_checks_before_calling(self):
+        """Test that no function is called if a later step is invalid"""
+        calls = []
+        self.backend.add_capl_function("record", lambda a: calls.append(a))
+        with self.assertRaises(MyCANoeException):
+            self.canoe.call_capl_functions([("record", (1,)), ("missing", ())])
+        self.assertEqual(calls, [])
+
+class TestCaplFunctionsPolling(TestCaplFunctions):
+    """Same scenarios without measurement events"""
+
+    backend_options = {"events": False}
+
+class TestDatabases(FakeBackendTestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        super().setUp()
+        for i in range(1, 4):
+            self.canoe.add_database(f"C:/db/bus{i}.dbc", "CAN", i)
+
+    def test_list_databases(self):
+        """Test listing the databases in setup order"""
+        databases = self.canoe.list_databases()
+        self.assertEqual([db["channel"] for db in databases], [1, 2, 3])
+        self.assertEqual([db["index"] for db in databases], [1, 2, 3])
+
+    def test_find_database(self):
+        """Test finding a database by path spelling and channel"""
+        database = self.canoe.find_database("C:/db/../db/bus2.dbc", 2)
+        self.assertEqual(database["index"], 2)
+        self.assertIsNone(self.canoe.find_database("C:/db/bus2.dbc", 3))
+
+    def test_index_built_once(self):
+        """Test that lookups after the first do not scan the databases through COM"""
+        self.canoe.list_databases()
+        calls = self.backend.call_count
+        self.canoe.find_database("C:/db/bus3.dbc")
+        self.canoe.list_databases()
+        self.assertEqual(self.backend.call_count, calls)
+
+    def test_remove_database(self):
+        """Test removing a database keeps the index in step with the setup"""
+        self.canoe.list_databases()
+        self.assertTrue(self.canoe.remove_database("C:/db/bus2.dbc", 2))
+        self.assertFalse(self.canoe.remove_database("C:/db/bus2.dbc", 2))
+        self.assertTrue(self.canoe.remove_database("C:/db/bus3.dbc", 3))
+        self.assertEqual([db.FullName for db in self.backend._databases], ["C:/db/bus1.dbc"])
+        self.assertEqual(len(self.canoe.list_databases()), 1)
+
+    def test_remove_after_external_change(self):
+        """Test that a database setup changed outside the library is read again"""
+        self.canoe.list_databases()
+        del self.backend._databases[0]
+        self.assertTrue(self.canoe.remove_database("C:/db/bus3.dbc", 3))
+        self.assertEqual([db.FullName for db in self.backend._databases], ["C:/db/bus2.dbc"])
+
+class TestConfiguration(FakeBackendTestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        super().setUp()
+        config_file = tempfile.NamedTemporaryFile(suffix=".cfg", delete=False)
+        config_file.write(b"configuration")
+        config_file.close()
+        self.addCleanup(os.remove, config_file.name)
+        self.config_path = config_file.name
+        cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        self.canoe.cache_dir = cache_directory.name
+
+    def test_open_skips_loaded_configuration(self):
+        """Test that opening the loaded, unchanged configuration does not reload it"""
+        self.assertTrue(self.canoe.open(self.config_path))
+        self.assertFalse(self.canoe.open(self.config_path))
+        self.assertEqual(self.backend.open_count, 1)
+
+    def test_open_skips_configuration_loaded_by_other_process(self):
+        """Test that a new instance does not reload a configuration another one opened"""
+        self.canoe.open(self.config_path)
+        other = MyCANoe(log_level=logging.WARNING, backend=self.backend)
+        other.cache_dir = self.canoe.cache_dir
+        self.addCleanup(other.close)
+        self.assertFalse(other.open(self.config_path))
+        self.assertEqual(self.backend.open_count, 1)
+        self.assertTrue(other.compile_all_capl_nodes()["result"])
+        self.assertEqual(other.call_capl_function_result("add", 2, 3), 5)
+        self.assertEqual(other.get_signal_value("CAN", 1, "LightState", "HeadLight"), 1)
+        with open(self.config_path, "ab") as f:
+            f.write(b" changed")
+        self.assertTrue(other.open(self.config_path))
+
+    def test_open_force(self):
+        """Test that force=True always reloads"""
+        self.canoe.open(self.config_path)
+        self.assertTrue(self.canoe.open(self.config_path, force=True))
+        self.assertEqual(self.backend.open_count, 2)
+
+    def test_open_touched_configuration(self):
+        """Test that a newer modification time with the same content does not reload"""
+        self.canoe.open(self.config_path)
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertFalse(self.canoe.open(self.config_path))
+        self.assertEqual(self.backend.open_count, 1)
+
+    def test_open_modified_configuration(self):
+        """Test that a changed file is reloaded"""
+        self.canoe.open(self.config_path)
+        with open(self.config_path, "ab") as f:
+            f.write(b" changed")
+        self.assertTrue(self.canoe.open(self.config_path))
+        self.assertEqual(self.backend.open_count, 2)
+
+    def test_open_after_other_configuration(self):
+        """Test that the configuration is reloaded if CANoe switched to another one"""
+        self.canoe.open(self.config_path)
+        self.backend._config_path = "C:/other.cfg"
+        self.assertTrue(self.canoe.open(self.config_path))
+
+    def test_new_waits_for_configuration(self):
+        """Test that new() returns as soon as the configuration was replaced"""
+        self.canoe.open(self.config_path)
+        start_time = time.perf_counter()
+        self.canoe.new()
+        self.assertLess(time.perf_counter() - start_time, 0.5)
+        self.assertEqual(self.canoe.get_configuration_path(), "")
+
+    def test_quit_waits_for_release(self):
+        """Test that quit() returns as soon as the application stops answering"""
+        start_time = time.perf_counter()
+        self.canoe.quit()
+        self.assertLess(time.perf_counter() - start_time, 0.5)
+        self.assertIsNone(self.canoe.app)
+
+    def test_timing_stats(self):
+        """Test that the duration of each operation is recorded"""
+        self.canoe.open(self.config_path)
+        self.canoe.open(self.config_path)
+        self.canoe.start_measurement(timeout=1)
+        self.canoe.compile_all_capl_nodes()
+        stats = self.canoe.get_timing_stats()
+        self.assertEqual(stats["open"]["count"], 2)
+        self.assertEqual(stats["start_measurement"]["count"], 1)
+        self.assertEqual(stats["compile"]["count"], 1)
+        self.assertGreaterEqual(stats["open"]["max"], stats["open"]["average"])
+
+if __name__ == "__main__":
+    unittest.main()
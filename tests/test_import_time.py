@@ -0,0 +1,52 @@
+"""
+Import-time budget for the MyCANoe library
+"""
+
+import unittest
+import os
+import subprocess
+import sys
+
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Budget for the cumulative import time of the package, in milliseconds
+IMPORT_BUDGET_MS = float(os.environ.get("CANOE_PY_IMPORT_BUDGET_MS", "150"))
+
+# Modules that must only be imported on first use
+LAZY_MODULES = ("pythoncom", "win32com", "numpy", "asyncio")
+
+def measure_import(statement: str = "import Canoe_PY"):
+    """Import the package in a fresh interpreter with -X importtime
+
+    Returns:
+        Tuple of (cumulative import time of Canoe_PY in ms, set of loaded module names)
+    """
+    code = f"{statement}; import sys; print(' '.join(sorted(sys.modules)))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True
+    )
+    cumulative_us = None
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "Canoe_PY":
+            cumulative_us = int(fields[1])
+    return cumulative_us / 1000.0, set(process.stdout.split())
+
+class TestImportTime(unittest.TestCase):
+
+    def test_lazy_modules_not_imported(self):
+        """Test that importing the package does not load pywin32 or other heavy modules"""
+        _, modules = measure_import()
+        for name in LAZY_MODULES:
+            self.assertNotIn(name, modules)
+
+    def test_import_time_budget(self):
+        """Test that importing the package stays within the import-time budget"""
+        # Best of three runs to smooth out bytecode compilation and scheduling noise
+        best_ms = min(measure_import()[0] for _ in range(3))
+        self.assertLess(best_ms, IMPORT_BUDGET_MS, f"import Canoe_PY took {best_ms:.1f} ms")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,7 @@ import sys
 # Add the parent directory to the path so we can import the library
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from my_canoe_lib import MyCANoe, MyCANoeException
+from Canoe_PY import MyCANoe, MyCANoeException
 
 class TestMyCANoe(unittest.TestCase):
     
@@ -17,6 +17,7 @@ class TestMyCANoe(unittest.TestCase):
         """Set up test fixtures"""
         try:
             self.canoe = MyCANoe()
+            self.canoe.connect()
         except MyCANoeException:
             self.skipTest("CANoe not running or accessible")
     
@@ -0,0 +1,188 @@
+"""
+Tests for the session pool and broker
+"""
+
+import unittest
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY import MyCANoeException
+from Canoe_PY.backends import FakeBackend
+from Canoe_PY.exceptions import SignalError
+from Canoe_PY.pool import SessionPool, SessionBroker, BrokerClient
+from test_fake_backend import use_temporary_cache_dir
+
+def make_backend():
+    backend = FakeBackend()
+    backend.add_signal("CAN", 1, "LightState", "FlashLight", 0)
+    backend.add_system_variable("sys_var_demo::speed", 10)
+    return backend
+
+class TestSessionPool(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        use_temporary_cache_dir(self)
+        self.backends = []
+        config_file = tempfile.NamedTemporaryFile(suffix=".cfg", delete=False)
+        config_file.close()
+        self.addCleanup(os.remove, config_file.name)
+        self.config_path = config_file.name
+
+        def factory():
+            backend = make_backend()
+            self.backends.append(backend)
+            return backend
+
+        self.pool = SessionPool(size=2, config_path=self.config_path, backend_factory=factory,
+                                log_level=logging.WARNING)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.pool.close()
+
+    def test_sessions_are_warm(self):
+        """Test that sessions are connected and have the configuration loaded"""
+        self.assertEqual(len(self.backends), 2)
+        with self.pool.session() as session:
+            self.assertEqual(session.get_configuration_path(), self.config_path)
+            self.assertEqual(session.get_version(), "15.0.0")
+
+    def test_sessions_are_reused(self):
+        """Test that checked-in sessions are handed out again without reconnecting"""
+        for _ in range(5):
+            with self.pool.session(timeout=1) as session:
+                session.set_system_variable_value("sys_var_demo::speed", 20)
+        stats = self.pool.stats()
+        self.assertEqual(stats["created"], 2)
+        self.assertEqual(stats["checkouts"], 5)
+        self.assertEqual(stats["idle"], 2)
+
+    def test_checkout_timeout(self):
+        """Test that checkout fails when every session is in use"""
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        with self.assertRaises(MyCANoeException):
+            self.pool.checkout(timeout=0.05)
+        self.pool.checkin(first)
+        self.pool.checkin(second)
+        self.assertEqual(self.pool.stats()["timeouts"], 1)
+
+    def test_waiting_checkout(self):
+        """Test that a waiting checkout gets the next checked-in session"""
+        session = self.pool.checkout()
+        other = self.pool.checkout()
+        threading.Timer(0.05, self.pool.checkin, (session,)).start()
+        self.assertIs(self.pool.checkout(timeout=1), session)
+        self.assertGreaterEqual(self.pool.stats()["max_checkout_wait"], 0.04)
+        self.pool.checkin(session)
+        self.pool.checkin(other)
+
+    def test_unhealthy_session_is_replaced(self):
+        """Test that a session whose CANoe went away is recycled on checkout"""
+        self.backends[0].dispatch().Quit()
+        self.backends[1].dispatch().Quit()
+        with self.pool.session(timeout=1) as session:
+            self.assertEqual(session.get_version(), "15.0.0")
+        stats = self.pool.stats()
+        self.assertGreaterEqual(stats["health_check_failures"], 1)
+        self.assertGreaterEqual(stats["recycled"], 1)
+
+    def test_measurement_stopped_on_checkin(self):
+        """Test that a measurement left running is stopped on checkin"""
+        with self.pool.session() as session:
+            session.start_measurement(timeout=1)
+            backend = session.canoe.backend
+        self.assertFalse(backend._running)
+
+class TestSessionPoolSlots(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        use_temporary_cache_dir(self)
+        self.slots = []
+        self.fail = False
+        self.delay = 0.0
+
+        def launcher(slot):
+            time.sleep(self.delay)
+            if self.fail:
+                raise MyCANoeException("CANoe did not start")
+            self.slots.append(slot)
+            return make_backend()
+
+        self.pool = SessionPool(size=2, launcher=launcher, log_level=logging.WARNING)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.pool.close()
+
+    def test_default_com_is_single_session(self):
+        """Test that sessions sharing the one COM instance are refused"""
+        with self.assertRaises(MyCANoeException):
+            SessionPool(size=2, log_level=logging.WARNING)
+
+    def test_replacement_uses_same_slot(self):
+        """Test that the launcher is called per slot, also when a session is replaced"""
+        self.assertEqual(sorted(self.slots), [0, 1])
+        with self.pool.session() as session:
+            session.canoe.backend.dispatch().Quit()
+            slot = session.slot
+        with self.pool.session(timeout=1), self.pool.session(timeout=1):
+            pass
+        self.assertEqual(self.slots[2:], [slot])
+
+    def test_refill_does_not_block_pool(self):
+        """Test that creating the session of an empty slot runs without holding the pool lock"""
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        self.fail = True
+        self.pool._recycle(first)
+        self.pool.checkin(second)
+        self.pool.checkout()
+        self.fail = False
+        self.delay = 0.3
+        result = []
+        thread = threading.Thread(target=lambda: result.append(self.pool.checkout(timeout=2)))
+        thread.start()
+        time.sleep(0.05)
+        start_time = time.monotonic()
+        self.pool.stats()
+        self.assertLess(time.monotonic() - start_time, 0.2)
+        thread.join()
+        self.assertEqual(result[0].slot, first.slot)
+
+class TestSessionBroker(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        use_temporary_cache_dir(self)
+        self.pool = SessionPool(size=1, backend_factory=make_backend, log_level=logging.WARNING)
+        self.broker = SessionBroker(self.pool, authkey=b"test")
+        self.address = self.broker.start()
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.broker.close()
+        self.pool.close()
+
+    def test_remote_session(self):
+        """Test checking out a session and calling methods through the broker"""
+        client = BrokerClient(self.address, authkey=b"test")
+        with client.session(timeout=1) as session:
+            session.set_signal_value("CAN", 1, "LightState", "FlashLight", 1)
+            self.assertEqual(session.get_signal_value("CAN", 1, "LightState", "FlashLight"), 1)
+            with self.assertRaises(SignalError):
+                session.get_signal_value("CAN", 1, "LightState", "Missing")
+        self.assertEqual(client.stats()["checkouts"], 1)
+        self.assertEqual(client.stats()["idle"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
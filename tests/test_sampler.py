@@ -0,0 +1,84 @@
+"""
+Tests for the background signal sampler
+"""
+
+import unittest
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY import SignalSampler
+from test_fake_backend import FakeBackendTestCase, numpy
+
+@unittest.skipIf(numpy is None, "NumPy not installed")
+class TestSignalSampler(FakeBackendTestCase):
+
+    def test_sampling(self):
+        """Test that samples of signals and system variables land in the ring buffer"""
+        sampler = SignalSampler(self.canoe, signals=[("CAN", 1, "LightState", "FlashLight")],
+                                system_variables=["sys_var_demo::speed"], rate=500.0, capacity=1000)
+        self.assertEqual(sampler.columns, ["timestamp", "CAN1::LightState::FlashLight", "sys_var_demo::speed"])
+        with sampler:
+            time.sleep(0.05)
+            self.backend.set_value("sys_var_demo::speed", 20)
+            time.sleep(0.05)
+
+        samples = sampler.snapshot()
+        self.assertGreater(len(samples), 5)
+        self.assertEqual(samples.shape[1], 3)
+        self.assertEqual(samples[0, 2], 10)
+        self.assertEqual(samples[-1, 2], 20)
+        self.assertTrue(numpy.all(numpy.diff(samples[:, 0]) >= 0))
+
+    def test_drain_and_overruns(self):
+        """Test that drain consumes samples and overruns are counted"""
+        sampler = SignalSampler(self.canoe, signals=[("CAN", 1, "LightState", "HeadLight")],
+                                rate=1000.0, capacity=4)
+        with sampler:
+            time.sleep(0.05)
+        stats = sampler.stats()
+        self.assertGreater(stats["overruns"], 0)
+        self.assertEqual(stats["buffered"], 4)
+
+        self.assertEqual(len(sampler.drain()), 4)
+        self.assertEqual(len(sampler.drain()), 0)
+        self.assertEqual(len(sampler.snapshot()), 4)
+
+    def test_signal_resolved_again_after_failed_read(self):
+        """Test that sampling continues after the signal handles were invalidated"""
+        self.backend.expire_signal_handles = True
+        sampler = SignalSampler(self.canoe, signals=[("CAN", 1, "LightState", "FlashLight")], rate=500.0)
+        with sampler:
+            time.sleep(0.05)
+            self.backend._transition(True)
+            self.backend._signals[("CAN", 1, "LightState", "FlashLight")].Value = 1
+            time.sleep(0.05)
+
+        samples = sampler.snapshot()
+        self.assertEqual(samples[0, 1], 0)
+        self.assertEqual(samples[-1, 1], 1)
+        self.assertGreaterEqual(sampler.errors, 1)
+
+    def test_non_numeric_value_is_counted(self):
+        """Test that a value that does not fit the buffer is counted without stopping the sampler"""
+        sampler = SignalSampler(self.canoe, system_variables=["sys_var_demo::name"], rate=500.0)
+        with self.assertLogs(sampler.logger, level="WARNING"):
+            with sampler:
+                time.sleep(0.05)
+                self.assertTrue(sampler.running)
+        self.assertGreater(sampler.errors, 0)
+        self.assertIsNone(sampler.error)
+        self.assertEqual(len(sampler.snapshot()), 0)
+
+    def test_unknown_signal_stops_sampler(self):
+        """Test that a sampler with an unresolvable signal reports the error"""
+        sampler = SignalSampler(self.canoe, signals=[("CAN", 1, "LightState", "Missing")])
+        sampler.start()
+        sampler.stop()
+        self.assertIsNotNone(sampler.error)
+
+if __name__ == "__main__":
+    unittest.main()
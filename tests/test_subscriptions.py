@@ -0,0 +1,130 @@
+"""
+Tests for value change subscriptions
+"""
+
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY.exceptions import SignalError
+from test_fake_backend import FakeBackendTestCase
+
+class Recorder:
+    """Callback collecting the delivered changes"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.threads = set()
+        self.event = threading.Event()
+
+    def __call__(self, name, value, timestamp):
+        self.threads.add(threading.current_thread().name)
+        if self.delay:
+            time.sleep(self.delay)
+        self.calls.append((name, value, timestamp))
+        self.event.set()
+
+    def wait_for(self, value, timeout=2.0):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self.calls and self.calls[-1][1] == value:
+                return True
+            time.sleep(0.005)
+        return False
+
+class TestSubscriptions(FakeBackendTestCase):
+
+    def test_signal_change_is_delivered(self):
+        """Test that a polled signal change reaches the callback on a worker thread"""
+        recorder = Recorder()
+        subscription = self.canoe.subscribe_signal("CAN", 1, "LightState", "FlashLight", recorder)
+        time.sleep(0.05)
+        self.canoe.set_signal_value("CAN", 1, "LightState", "FlashLight", 1)
+        self.assertTrue(recorder.wait_for(1))
+        self.assertEqual(recorder.calls[0][0], "CAN1::LightState::FlashLight")
+        self.assertTrue(all(name.startswith("CANoeCallback") for name in recorder.threads))
+        self.assertEqual(subscription.stats()["dispatched"], 1)
+
+    def test_system_variable_uses_events(self):
+        """Test that system variable changes are delivered without polling"""
+        recorder = Recorder()
+        self.canoe.subscribe_system_variable("sys_var_demo::speed", recorder)
+        time.sleep(0.05)
+        self.backend.set_value("sys_var_demo::speed", 42)
+        self.assertTrue(recorder.event.wait(1.0))
+        self.assertEqual(recorder.calls[-1][1], 42)
+
+    def test_burst_is_coalesced(self):
+        """Test that changes during a running callback collapse into the latest value"""
+        recorder = Recorder(delay=0.1)
+        subscription = self.canoe.subscribe_system_variable("sys_var_demo::speed", recorder)
+        time.sleep(0.05)
+        for value in range(1, 21):
+            self.backend.set_value("sys_var_demo::speed", value)
+        self.assertTrue(recorder.wait_for(20))
+        stats = subscription.stats()
+        self.assertLess(stats["dispatched"], 20)
+        self.assertLessEqual(stats["dispatched"], stats["changes"])
+
+    def test_min_interval(self):
+        """Test that callbacks are spaced by min_interval and the last value arrives"""
+        recorder = Recorder()
+        self.canoe.subscribe_system_variable("sys_var_demo::speed", recorder, min_interval=0.1)
+        time.sleep(0.05)
+        for value in range(1, 6):
+            self.backend.set_value("sys_var_demo::speed", value)
+            time.sleep(0.01)
+        self.assertTrue(recorder.wait_for(5))
+        self.assertLessEqual(len(recorder.calls), 2)
+
+    def test_signal_resolved_again_after_measurement_start(self):
+        """Test that a polled signal keeps being delivered after its handle expired"""
+        self.backend.expire_signal_handles = True
+        recorder = Recorder()
+        self.canoe.subscribe_signal("CAN", 1, "LightState", "FlashLight", recorder)
+        time.sleep(0.05)
+        self.canoe.start_measurement(timeout=1)
+        self.canoe.set_signal_value("CAN", 1, "LightState", "FlashLight", 1)
+        self.assertTrue(recorder.wait_for(1))
+
+    def test_signal_resolved_again_after_failed_read(self):
+        """Test that a handle invalidated outside the library is resolved again on the next poll"""
+        self.backend.expire_signal_handles = True
+        recorder = Recorder()
+        self.canoe.subscribe_signal("CAN", 1, "LightState", "FlashLight", recorder)
+        time.sleep(0.05)
+        self.backend._transition(True)
+        self.backend._signals[("CAN", 1, "LightState", "FlashLight")].Value = 1
+        self.assertTrue(recorder.wait_for(1))
+        self.assertGreaterEqual(self.canoe.subscriptions.stats()["poll_errors"], 1)
+
+    def test_cancel(self):
+        """Test that a cancelled subscription receives no further changes"""
+        recorder = Recorder()
+        subscription = self.canoe.subscribe_system_variable("sys_var_demo::speed", recorder)
+        time.sleep(0.05)
+        subscription.cancel()
+        time.sleep(0.05)
+        self.backend.set_value("sys_var_demo::speed", 99)
+        time.sleep(0.05)
+        self.assertEqual(recorder.calls, [])
+        self.assertEqual(self.canoe.subscriptions.subscriptions(), [])
+
+    def test_unknown_signal(self):
+        """Test that subscribing to a missing signal fails immediately"""
+        with self.assertRaises(SignalError):
+            self.canoe.subscribe_signal("CAN", 1, "LightState", "Missing", Recorder())
+
+class TestSubscriptionPolling(TestSubscriptions):
+    """Same scenarios with change events unavailable"""
+
+    backend_options = {"events": False}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests for the MyCANoe utility functions and handle cache
+"""
+
+import unittest
+import io
+import logging
+import logging.handlers
+import os
+import sys
+
+# Add the parent directory to the path so we can import the library
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Canoe_PY.cache import HandleCache
+from Canoe_PY.utils import Deadline, wait_until, setup_logger, stop_async_logging
+
+class TestWaitUntil(unittest.TestCase):
+
+    def test_condition_met(self):
+        """Test that the wait reports the number of polls when the condition is met"""
+        values = iter([False, False, True])
+        result = wait_until(lambda: next(values), timeout=1.0, interval=0.001)
+        self.assertTrue(result)
+        self.assertEqual(result.polls, 3)
+
+    def test_timeout(self):
+        """Test that backoff limits the number of polls until the timeout"""
+        result = wait_until(lambda: False, timeout=0.1, interval=0.001, max_interval=0.05, backoff=2.0)
+        self.assertFalse(result)
+        self.assertGreaterEqual(result.elapsed, 0.1)
+        self.assertLess(result.polls, 20)
+
+    def test_shared_deadline(self):
+        """Test that a shared deadline bounds a wait with a longer timeout"""
+        deadline = Deadline(0.05)
+        result = wait_until(lambda: False, timeout=5.0, interval=0.01, deadline=deadline)
+        self.assertFalse(result)
+        self.assertLess(result.elapsed, 1.0)
+        self.assertTrue(deadline.expired())
+
+    def test_deadline_limit(self):
+        """Test that a nested deadline never outlives its parent"""
+        self.assertEqual(Deadline(None).remaining(), float("inf"))
+        self.assertLessEqual(Deadline(1.0).limit(10.0).remaining(), 1.0)
+        self.assertLessEqual(Deadline(10.0).limit(1.0).remaining(), 1.0)
+
+class TestSetupLogger(unittest.TestCase):
+
+    def test_async_logging(self):
+        """Test that async logging queues records for a background listener"""
+        logger = setup_logger("test_async_logging", logging.INFO, async_logging=True)
+        self.assertIsInstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+        stream = io.StringIO()
+        listener = logging.handlers.QueueListener(logger.handlers[0].queue, logging.StreamHandler(stream))
+        stop_async_logging()
+        listener.start()
+        logger.info("queued message")
+        listener.stop()
+        self.assertIn("queued message", stream.getvalue())
+
+class TestHandleCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        """Test that a handle is resolved once and then served from the cache"""
+        cache = HandleCache()
+        resolved = []
+        for _ in range(3):
+            cache.get("key", lambda: resolved.append(1) or "handle")
+        self.assertEqual(len(resolved), 1)
+        self.assertEqual(cache.stats(), {"size": 1, "hits": 2, "misses": 1, "evictions": 0})
+
+    def test_lru_eviction(self):
+        """Test that the least recently used handle is evicted when full"""
+        cache = HandleCache(max_size=2)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        cache.get("a", lambda: 1)
+        cache.get("c", lambda: 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.evictions, 1)
+
+if __name__ == "__main__":
+    unittest.main()